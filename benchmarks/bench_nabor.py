@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Набор замеров горячих путей Zadacha и Magazin: результаты в JSON
+и сравнение с сохранёнными базовыми замерами
+
+Запуск:
+    python benchmarks/bench_nabor.py                     # все замеры на 10, 1k, 100k, 1M
+    python benchmarks/bench_nabor.py -r 10 1000 -k cenu  # выбранные размеры и замеры
+    python benchmarks/bench_nabor.py --json itog.json    # сохранить результаты
+    python benchmarks/bench_nabor.py --zapisat-bazu      # сохранить как базовые
+    python benchmarks/bench_nabor.py --sravnit           # сравнить с базовыми
+
+Каждый замер - несколько выборок (как у pyperf): число повторов
+в выборке подбирается так, чтобы выборка шла не меньше 10 мс,
+сборщик мусора на время выборки выключается. В отчёт идут медиана,
+минимум и разброс времени одной операции. При --sravnit код выхода 1,
+если у какого-то замера и медиана, и лучшая выборка хуже базовых
+больше чем на --porog процентов (одна медиана слишком шумная).
+Обновление списка задач и таблицы товаров на экране меряется только
+при наличии дисплея.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import count, cycle
+
+PAPKA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PAPKA))
+
+from todoshop import Zadacha, SpisokZadach, Magazin, ReestrMagazinov, IndeksTovarov
+
+RAZMERY = [10, 1000, 100000, 1000000]
+BAZOVYE = os.path.join(PAPKA, 'bazovye_zamery.json')
+VERSIIA_FORMATA = 1
+
+MIN_VYBORKA = 0.01      # секунд на одну выборку
+MAX_POVTOROV = 1 << 20
+DOLGO = 1.0             # операция дольше секунды - хватит трёх выборок
+
+# ============================================
+# ЗАМЕРЫ
+# ============================================
+
+# имя -> (подготовка(размер) -> (операция, сброс), меняет ли операция данные)
+ZAMERY = {}
+
+
+def zamer(imia, meniaet=False):
+    """Зарегистрировать подготовку замера
+
+    Подготовка получает размер и возвращает операцию без аргументов
+    и сброс (или None), который после каждой выборки вне замера
+    возвращает данные в исходное состояние. У меняющих данные
+    замеров выборка не длиннее десятой части размера, чтобы данные
+    не успевали заметно вырасти.
+    """
+    def zaregistrirovat(podgotovka):
+        ZAMERY[imia] = (podgotovka, meniaet)
+        return podgotovka
+    return zaregistrirovat
+
+
+@lru_cache(maxsize=1)
+def magazin_s_tovarami(razmer):
+    """Магазин с razmer товарами (один на все замеры этого размера)"""
+    magazin = Magazin("Замер", "ул. Тестовая, 1", "Тестовый")
+    magazin.zagruzit_tovary(((f"Товар {i}", float(i % 5000) + 0.5, i % 50 + 1, "01.01.2026")
+                             for i in range(razmer)), proveriat=False)
+    # Как в программе: магазин в реестре, за ним следит индекс товаров
+    IndeksTovarov(ReestrMagazinov([magazin]))
+    return magazin
+
+
+@zamer('magazin.dobavit_tovar', meniaet=True)
+def podgotovit_dobavlenie(razmer):
+    magazin = magazin_s_tovarami(razmer)
+    dobavleny = []
+    nomera = count()
+
+    def dobavit():
+        tovar = f"Новый товар {next(nomera)}"
+        magazin.dobavit_tovar(tovar, 99.5, 3)
+        dobavleny.append(tovar)
+
+    def sbros():
+        for tovar in dobavleny:
+            magazin.udalit_tovar(tovar)
+        dobavleny.clear()
+
+    return dobavit, sbros
+
+
+@zamer('magazin.uznat_cenu')
+def podgotovit_cenu(razmer):
+    magazin = magazin_s_tovarami(razmer)
+    shag = max(1, razmer // 1000)
+    imena = cycle([f"Товар {i}" for i in range(0, razmer, shag)])
+    return (lambda: magazin.uznat_cenu(next(imena))), None
+
+
+@zamer('magazin.obnovit_cenu')
+def podgotovit_obnovlenie_ceny(razmer):
+    # Отдельный магазин: построенные порядки таблицы замедлили бы другие замеры
+    magazin = magazin_s_tovarami.__wrapped__(razmer)
+    for pole in ('nazvanie', 'kolichestvo', 'summa'):
+        magazin.poriadok(pole)
+    ceny = cycle([10.5, 20.5])
+    return (lambda: magazin.obnovit_cenu("Товар 0", next(ceny))), None
+
+
+@zamer('magazin.primenit_prais')
+def podgotovit_prais(razmer):
+    # Прайс на каждый сотый товар: цены, итоги и индексы одним пакетом
+    magazin = magazin_s_tovarami.__wrapped__(razmer)
+    tovary = [f"Товар {i}" for i in range(0, razmer, 100)]
+    ceny = cycle([10.5, 20.5])
+    return (lambda: magazin.primenit_prais(dict.fromkeys(tovary, next(ceny)))), None
+
+
+@zamer('magazin.obshchaia_stoimost')
+def podgotovit_stoimost(razmer):
+    return magazin_s_tovarami(razmer).obshchaia_stoimost, None
+
+
+@zamer('magazin.info_podrobno')
+def podgotovit_info(razmer):
+    return magazin_s_tovarami(razmer).info_podrobno, None
+
+
+@zamer('zadachi.dobavit', meniaet=True)
+def podgotovit_zadachi(razmer):
+    spisok = sozdat_zadachi(razmer)
+    otkrytyh = spisok.otkryto
+
+    def sbros():
+        del spisok.zadachi[otkrytyh:]
+        spisok.pereschitat_schetchiki()
+
+    return (lambda: spisok.dobavit(Zadacha("Новая задача", "Завтра"))), sbros
+
+
+def zadachi_so_srokami(razmer):
+    """Список, где просрочены первые 10 задач, а у остальных срок впереди"""
+    segodnia = date.today()
+    spisok = SpisokZadach()
+    sdvigi = (i - 10 if i < 10 else 1 + i % 500 for i in range(razmer))
+    spisok.zagruzit(Zadacha(f"Задача {i}", f"{segodnia + timedelta(days=sdvig):%d.%m.%Y}")
+                    for i, sdvig in enumerate(sdvigi))
+    spisok.indeks_srokov()
+    return spisok
+
+
+@zamer('zadachi.prosrocheny')
+def podgotovit_prosrochennye(razmer):
+    # Обход кучи сроков не должен зависеть от размера списка
+    return zadachi_so_srokami(razmer).prosrocheny, None
+
+
+@zamer('zadachi.chislo_prosrochennyh')
+def podgotovit_chislo_prosrochennyh(razmer):
+    # Для статистики окна: счётчик, а не список
+    return zadachi_so_srokami(razmer).chislo_prosrochennyh, None
+
+
+@zamer('zadachi.otmetit_povtor')
+def podgotovit_povtor(razmer):
+    # Ежедневная задача в списке из razmer задач со сроками: отметка
+    # повтора переставляет её срок в куче, а отметки остаются одним отрезком
+    spisok = sozdat_zadachi(razmer)
+    spisok.indeks_srokov()
+    zadacha = spisok.dobavit(Zadacha("Сходить на пары", "Каждый день"))
+    return (lambda: spisok.otmetit(zadacha)), None
+
+
+@zamer('zadachi.obnovit_spisok')
+def podgotovit_obnovlenie(razmer):
+    okno = sozdat_okno()
+    if okno is None:
+        return None
+    app, root = okno
+    spisok_magazinov = ReestrMagazinov()
+    app.podkliuchit_dannye((sozdat_zadachi(razmer), spisok_magazinov,
+                            IndeksTovarov(spisok_magazinov)))
+    root.update()
+
+    def obnovit():
+        app.obnovit_spisok_zadach()
+        root.update_idletasks()
+
+    return obnovit, None
+
+
+@zamer('okno.izmenenie_v_tablice')
+def podgotovit_tablicu(razmer):
+    # От изменения цены до обновлённой таблицы товаров на экране
+    okno = sozdat_okno()
+    if okno is None:
+        return None
+    app, root = okno
+    magazin = magazin_s_tovarami.__wrapped__(razmer)
+    app.spisok_magazinov.dobavit(magazin)
+    app.vkladki.select(1)
+    app.postroit_vkladku(app.vkladki.select())
+    app.vybrannyi_magazin.set(app.spisok_magazinov.metka(magazin))
+    app.vybrat_magazin()
+    root.update()
+    tovar = app.tablica_tovarov.get_children()[0]
+    ceny = cycle([magazin.uznat_cenu(tovar), magazin.uznat_cenu(tovar) + 1])
+
+    def izmenit():
+        magazin.obnovit_cenu(tovar, next(ceny))
+        root.update_idletasks()
+
+    return izmenit, None
+
+
+def sozdat_zadachi(razmer):
+    """Список из razmer задач, каждая третья выполнена"""
+    spisok = SpisokZadach()
+    zadachi = [Zadacha(f"Задача {i}", "Сегодня") for i in range(razmer)]
+    for zadacha in zadachi[::3]:
+        zadacha.otmetit_gotovoi()
+    spisok.zagruzit(zadachi)
+    return spisok
+
+
+@lru_cache(maxsize=1)
+def sozdat_okno():
+    """Скрытое окно программы (None, если нет дисплея)"""
+    import tkinter as tk
+    from todoshop.gui import GlavnoeOkno
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    return GlavnoeOkno(root, demo=False), root
+
+# ============================================
+# ИЗМЕРЕНИЕ
+# ============================================
+
+def vyborka(operacia, povtorov):
+    """Время povtorov вызовов операции в секундах (без сборки мусора)"""
+    vkliuchen = gc.isenabled()
+    gc.disable()
+    try:
+        nachalo = time.perf_counter()
+        for _ in range(povtorov):
+            operacia()
+        return time.perf_counter() - nachalo
+    finally:
+        if vkliuchen:
+            gc.enable()
+
+
+def izmerit(imia, razmer, vyborok):
+    """Результат замера одного размера (None, если замер здесь невозможен)"""
+    podgotovka, meniaet = ZAMERY[imia]
+    podgotovleno = podgotovka(razmer)
+    if podgotovleno is None:
+        return None
+    operacia, sbros = podgotovleno
+    predel = max(1, razmer // 10) if meniaet else MAX_POVTOROV
+
+    # Подбор числа повторов (он же прогрев)
+    povtorov = 1
+    while True:
+        vremia = vyborka(operacia, povtorov)
+        if sbros:
+            sbros()
+        if vremia >= MIN_VYBORKA or povtorov >= predel:
+            break
+        povtorov = min(predel, povtorov * 2)
+    if vremia / povtorov > DOLGO:
+        vyborok = min(vyborok, 3)
+
+    vremena = []
+    for _ in range(vyborok):
+        vremena.append(vyborka(operacia, povtorov) / povtorov)
+        if sbros:
+            sbros()
+    return {
+        'imia': imia,
+        'razmer': razmer,
+        'mediana': statistics.median(vremena),
+        'minimum': min(vremena),
+        'otklonenie': statistics.stdev(vremena) if len(vremena) > 1 else 0.0,
+        'vyborok': vyborok,
+        'povtorov': povtorov,
+    }
+
+
+def formatirovat(sekund):
+    """Время операции в подходящих единицах"""
+    for edinica, mnozhitel in (("с", 1), ("мс", 1e3), ("мкс", 1e6)):
+        if sekund * mnozhitel >= 1:
+            return f"{sekund * mnozhitel:8.3f} {edinica}"
+    return f"{sekund * 1e9:8.1f} нс"
+
+
+def kommit():
+    """Текущий коммит репозитория (None, если git недоступен)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PAPKA,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadannye():
+    """Где и когда сделаны замеры"""
+    return {
+        'python': platform.python_version(),
+        'realizaciia': platform.python_implementation(),
+        'platforma': platform.platform(),
+        'processor': platform.machine(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'kommit': kommit(),
+    }
+
+# ============================================
+# СРАВНЕНИЕ С БАЗОВЫМИ ЗАМЕРАМИ
+# ============================================
+
+def prochitat(put):
+    """Результаты замеров из JSON-файла"""
+    with open(put, encoding='utf-8') as f:
+        dannye = json.load(f)
+    if dannye.get('versiia') != VERSIIA_FORMATA:
+        raise ValueError(f"{put}: неизвестная версия формата {dannye.get('versiia')!r}")
+    return dannye
+
+
+def zapisat(put, dannye):
+    """Сохранить результаты замеров в JSON-файл"""
+    with open(put, 'w', encoding='utf-8') as f:
+        json.dump(dannye, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+
+
+def sravnit(bazovye, tekushchie, porog):
+    """Напечатать сравнение и вернуть список замедлившихся замеров"""
+    baza = {(z['imia'], z['razmer']): z for z in bazovye['zamery']}
+    zamedlenia = []
+    print(f"\nСравнение с базовыми замерами от {bazovye['metadannye']['data']} "
+          f"(коммит {bazovye['metadannye']['kommit']}), порог {porog:g}%")
+    for z in tekushchie['zamery']:
+        b = baza.get((z['imia'], z['razmer']))
+        if b is None:
+            continue
+        otnoshenie = z['mediana'] / b['mediana']
+        zamedlenie = (otnoshenie > 1 + porog / 100
+                      and z['minimum'] / b['minimum'] > 1 + porog / 100)
+        if zamedlenie:
+            zamedlenia.append(z)
+            pometka = "ЗАМЕДЛЕНИЕ"
+        elif otnoshenie < 1 - porog / 100:
+            pometka = "быстрее"
+        else:
+            pometka = ""
+        print(f"{z['imia']:28} {z['razmer']:>9} | {formatirovat(b['mediana'])} -> "
+              f"{formatirovat(z['mediana'])} | ×{otnoshenie:5.2f} {pometka}")
+    return zamedlenia
+
+# ============================================
+# ЗАПУСК
+# ============================================
+
+def sozdat_razbor():
+    """Ключи командной строки"""
+    razbor = argparse.ArgumentParser(description="Замеры горячих путей TodoShop")
+    razbor.add_argument('-r', '--razmery', type=int, nargs='+', default=RAZMERY,
+                        help="размеры данных (по умолчанию 10 1000 100000 1000000)")
+    razbor.add_argument('-k', dest='filtr', default='',
+                        help="только замеры, в имени которых есть эта строка")
+    razbor.add_argument('--vyborok', type=int, default=11, help="выборок на замер")
+    razbor.add_argument('--json', help="сохранить результаты в файл")
+    razbor.add_argument('--baza', default=BAZOVYE, help="файл базовых замеров")
+    razbor.add_argument('--zapisat-bazu', action='store_true',
+                        help="сохранить результаты как базовые")
+    razbor.add_argument('--sravnit', action='store_true',
+                        help="сравнить с базовыми; код 1 при замедлении")
+    razbor.add_argument('--porog', type=float, default=10.0,
+                        help="допустимое замедление медианы, %% (по умолчанию 10)")
+    return razbor
+
+
+def main():
+    argumenty = sozdat_razbor().parse_args()
+    imena = [imia for imia in ZAMERY if argumenty.filtr in imia]
+    itog = {'versiia': VERSIIA_FORMATA, 'metadannye': metadannye(), 'zamery': []}
+
+    print(f"{'замер':28} {'размер':>9} | {'медиана':>11} | {'минимум':>11} | разброс, выборки")
+    for razmer in sorted(argumenty.razmery):
+        for imia in imena:
+            rezultat = izmerit(imia, razmer, argumenty.vyborok)
+            if rezultat is None:
+                print(f"{imia:28} {razmer:>9} | пропущен (нет дисплея)")
+                continue
+            itog['zamery'].append(rezultat)
+            print(f"{imia:28} {razmer:>9} | {formatirovat(rezultat['mediana'])} | "
+                  f"{formatirovat(rezultat['minimum'])} | "
+                  f"±{rezultat['otklonenie'] / rezultat['mediana']:.1%}, "
+                  f"{rezultat['vyborok']} × {rezultat['povtorov']}")
+        # Большой магазин не нужен следующему размеру
+        magazin_s_tovarami.cache_clear()
+
+    if argumenty.json:
+        zapisat(argumenty.json, itog)
+    if argumenty.zapisat_bazu:
+        zapisat(argumenty.baza, itog)
+        print(f"\nБазовые замеры сохранены в {argumenty.baza}")
+    if argumenty.sravnit:
+        try:
+            zamedlenia = sravnit(prochitat(argumenty.baza), itog, argumenty.porog)
+        except (OSError, ValueError) as oshibka:
+            print(f"Не удалось прочитать базовые замеры: {oshibka}", file=sys.stderr)
+            return 2
+        if zamedlenia:
+            print(f"\nЗамедлились замеров: {len(zamedlenia)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Сравнение памяти на товар: словарь словарей против KolonochnyeTovary
+
+Названия товаров создаются заранее и в замер не входят - они
+одинаковы при любом способе хранения.
+
+Запуск:
+    python benchmarks/bench_pamiat_tovarov.py [число товаров]
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todoshop import KolonochnyeTovary
+
+
+def slovar_slovarei(nazvaniia):
+    """Прежний способ: отдельный словарь на каждый товар"""
+    tovary = {}
+    for i, tovar in enumerate(nazvaniia):
+        tovary[tovar] = {
+            'cena': float(i % 1000) + 0.5,
+            'kolichestvo': int(i % 50),
+            'data_dobavlenia': datetime.now().strftime("%d.%m.%Y")
+        }
+    return tovary
+
+
+def kolonki(nazvaniia):
+    """Колонки-массивы"""
+    tovary = KolonochnyeTovary()
+    for i, tovar in enumerate(nazvaniia):
+        tovary[tovar] = {
+            'cena': float(i % 1000) + 0.5,
+            'kolichestvo': int(i % 50),
+            'data_dobavlenia': datetime.now().strftime("%d.%m.%Y")
+        }
+    return tovary
+
+
+def zamerit(postroit, nazvaniia):
+    """Байт на товар после построения хранилища"""
+    tracemalloc.start()
+    tovary = postroit(nazvaniia)
+    zaniato, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tovary
+    return zaniato / len(nazvaniia)
+
+
+def main():
+    chislo = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    nazvaniia = [f"Товар {i}" for i in range(chislo)]
+    
+    slovari = zamerit(slovar_slovarei, nazvaniia)
+    massivy = zamerit(kolonki, nazvaniia)
+    print(f"Товаров: {chislo}")
+    print(f"Словарь словарей: {slovari:8.1f} байт/товар")
+    print(f"Колонки:          {massivy:8.1f} байт/товар")
+    print(f"Выигрыш:          {slovari / massivy:8.1f}×")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
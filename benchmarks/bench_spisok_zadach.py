@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Замер стоимости одной операции со списком задач в зависимости от его размера
+
+Запуск:
+    python benchmarks/bench_spisok_zadach.py
+
+Сначала замеряется сам SpisokZadach (без Tk), затем те же операции
+через окно вместе с отрисовкой. Без дисплея замер окна пропускается.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todoshop import SpisokZadach, Zadacha
+
+RAZMERY = [100, 1000, 10000, 100000]
+POVTORY = 200
+
+
+def zamerit(operacia, posle=None):
+    """Среднее время одной операции в миллисекундах (posle - после каждой, например отрисовка)"""
+    nachalo = time.perf_counter()
+    for _ in range(POVTORY):
+        operacia()
+        if posle is not None:
+            posle()
+    return (time.perf_counter() - nachalo) * 1000 / POVTORY
+
+
+def dopolnit(spisok, razmer):
+    """Добавлять задачи, пока невыполненных не станет razmer"""
+    while len(spisok.zadachi) < razmer:
+        spisok.dobavit(Zadacha(f"Задача {spisok.sleduiushchii_nomer}", "Сегодня"))
+
+
+def zamerit_spisok():
+    """Операции модели: добавить, выполнить и удалить задачу из середины списка"""
+    print("Список задач без окна")
+    print(f"{'задач':>8} | {'добавить':>9} | {'выполнить':>9} | {'удалить':>9}  (мс/операция)")
+    spisok = SpisokZadach()
+    for razmer in RAZMERY:
+        dopolnit(spisok, razmer)
+        dobavit = zamerit(lambda: spisok.dobavit(Zadacha("Новая задача", "Завтра")))
+        # Каждый замер убирает POVTORY невыполненных задач - хватает с запасом
+        dopolnit(spisok, razmer + POVTORY)
+        vypolnit = zamerit(lambda: spisok.otmetit(spisok.zadachi[len(spisok.zadachi) // 2]))
+        dopolnit(spisok, razmer + POVTORY)
+        udalit = zamerit(lambda: spisok.udalit(spisok.zadachi[len(spisok.zadachi) // 2]))
+        print(f"{razmer:>8} | {dobavit:>9.3f} | {vypolnit:>9.3f} | {udalit:>9.3f}")
+
+
+def zamerit_okno():
+    """Те же операции через окно вместе с отрисовкой (нужен дисплей)"""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as oshibka:
+        print(f"\nОкно не замеряется: {oshibka}")
+        return
+    from todoshop.gui import GlavnoeOkno
+    
+    root.withdraw()
+    app = GlavnoeOkno(root)
+    root.update()
+    
+    print("\nЧерез окно (вместе с отрисовкой)")
+    print(f"{'задач':>8} | {'добавить':>9} | {'выполнить':>9} | {'удалить':>9}  (мс/операция)")
+    for razmer in RAZMERY:
+        dopolnit(app.spisok_zadach, razmer)
+        root.update_idletasks()
+        
+        dobavit = zamerit(lambda: app.spisok_zadach.dobavit(Zadacha("Новая задача", "Завтра")),
+                          root.update_idletasks)
+        vypolnit = zamerit(app.otmetit_gotovoi, root.update_idletasks)
+        udalit = zamerit(app.udalit_zadachu, root.update_idletasks)
+        print(f"{razmer:>8} | {dobavit:>9.3f} | {vypolnit:>9.3f} | {udalit:>9.3f}")
+    
+    root.destroy()
+
+
+def main():
+    zamerit_spisok()
+    zamerit_okno()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Память и скорость создания задач: прежняя Zadacha с __dict__ против текущей
+
+Запуск:
+    python benchmarks/bench_zadacha.py [число задач]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todoshop import Zadacha
+
+
+class StarayaZadacha:
+    """Задача в прежнем виде: строки дат сразу и статус строкой"""
+    def __init__(self, opisanie, srok):
+        self.opisanie = opisanie
+        self.srok = srok
+        self.status = "не выполнено"
+        self.data_sozdania = datetime.now().strftime("%d.%m.%Y %H:%M")
+
+
+def zamerit(klass, opisaniia):
+    """(байт на задачу, задач в секунду)"""
+    tracemalloc.start()
+    nachalo = time.perf_counter()
+    zadachi = [klass(opisanie, "Сегодня") for opisanie in opisaniia]
+    vremia = time.perf_counter() - nachalo
+    zaniato, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del zadachi
+    return zaniato / len(opisaniia), len(opisaniia) / vremia
+
+
+def main():
+    chislo = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    opisaniia = [f"Задача {i}" for i in range(chislo)]
+    
+    print(f"Задач: {chislo} (время создания замерено под tracemalloc)")
+    for nazvanie, klass in (("Прежняя", StarayaZadacha), ("Текущая", Zadacha)):
+        pamiat, skorost = zamerit(klass, opisaniia)
+        print(f"{nazvanie}: {pamiat:7.1f} байт/задачу, {skorost:12,.0f} задач/с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Общее для тестов: пакет todoshop берётся из этого дерева
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Архив выполненных задач: порядок, страницы и сохранение
+"""
+
+import random
+
+from todoshop import Hranilishche, ReestrMagazinov, SpisokZadach, Zadacha, ZhurnalIzmenenii
+from todoshop.arhiv import ArhivZadach
+
+
+def zapolnit(arhiv, chislo):
+    for nomer in range(1, chislo + 1):
+        arhiv.dobavit(nomer, f"Задача {nomer}", "Завтра", 1000 + nomer, 2000 + nomer)
+
+
+def nomera(arhiv):
+    return [stroka[0] for stroka in arhiv]
+
+
+def test_vozvrat_na_prezhnee_mesto():
+    arhiv = ArhivZadach()
+    zapolnit(arhiv, 10)
+    for nomer in (3, 7, 4):
+        stroka = arhiv.izvlech(nomer)
+        arhiv.dobavit(*stroka)
+    assert nomera(arhiv) == list(range(1, 11))
+    assert not arhiv.pustye and len(arhiv.opisaniia) == 10
+    
+    # Задача, выполненная раньше последних, встаёт на место по моменту
+    arhiv.izvlech(5)
+    arhiv.dobavit(5, "Задача 5", "Завтра", 1005, 2005)
+    arhiv.dobavit(50, "Поздняя", "", 1050, 2050)
+    arhiv.dobavit(11, "Ранняя", "", 1011, 2000)
+    assert nomera(arhiv) == [11] + list(range(1, 11)) + [50]
+    assert all(arhiv.stroka(arhiv.naiti(nomer))[0] == nomer for nomer in nomera(arhiv))
+
+
+def test_odinakovoe_vremia_vypolneniia():
+    # Загрузка отмечает задачи одним моментом: их порядок - порядок отметок
+    arhiv = ArhivZadach()
+    for nomer in range(1, 20001):
+        arhiv.dobavit(nomer, f"Задача {nomer}", "", 1000, 2000)
+    for nomer in (10, 20000, 15000):
+        arhiv.dobavit(*arhiv.izvlech(nomer))
+    assert nomera(arhiv) == list(range(1, 20001))
+    assert not arhiv.pustye
+
+
+def test_stranicy_propuskaiut_pustye():
+    arhiv = ArhivZadach()
+    zapolnit(arhiv, 20)
+    udaleny = {2, 5, 6, 11, 19}
+    for nomer in udaleny:
+        arhiv.izvlech(nomer)
+    
+    proidennye, nachalo = [], 0
+    while nachalo is not None:
+        stranica, nachalo = arhiv.stranica(nachalo, 4)
+        assert len(stranica) == 4 or nachalo is None
+        proidennye += [stroka[0] for stroka in stranica]
+    assert proidennye == [n for n in range(20, 0, -1) if n not in udaleny]
+
+
+def test_uplotnenie():
+    arhiv = ArhivZadach()
+    zapolnit(arhiv, 100)
+    sluchai = random.Random(3)
+    ostalis = list(range(1, 101))
+    sluchai.shuffle(ostalis)
+    while len(ostalis) > 10:
+        arhiv.izvlech(ostalis.pop())
+        assert len(arhiv.pustye) <= len(arhiv) + 1
+    assert nomera(arhiv) == sorted(ostalis)
+    assert len(arhiv.opisaniia) < 25
+
+
+def test_poriadok_posle_zagruzki(tmp_path):
+    hranilishche = Hranilishche(str(tmp_path), kompaktirovat_posle=7)
+    spisok = SpisokZadach()
+    hranilishche.podkliuchit(spisok, ReestrMagazinov())
+    zadachi = [spisok.dobavit(Zadacha(f"Задача {i}", "")) for i in range(12)]
+    for i, zadacha in enumerate(zadachi):
+        spisok.otmetit(zadacha, zadacha.vremia_sozdania + i)
+    # Удалённую из середины архива задачу отмена возвращает на её место
+    zhurnal = ZhurnalIzmenenii()
+    zhurnal.udalit_zadachu(spisok, spisok.po_nomeru(zadachi[5].nomer))
+    zhurnal.otmenit()
+    spisok.sniat_otmetku(spisok.po_nomeru(zadachi[2].nomer))
+    ozhidaetsia = [(z.nomer, z.status, z.vremia_vypolnenia) for z in spisok]
+    assert [nomer for nomer, _, _ in ozhidaetsia] == [3, 1, 2, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    hranilishche.zakryt()
+    
+    zagruzhennyi, _ = Hranilishche(str(tmp_path)).zagruzit()
+    assert [(z.nomer, z.status, z.vremia_vypolnenia) for z in zagruzhennyi] == ozhidaetsia
+    assert [z.nomer for z in zagruzhennyi.stranica_arhiva(0, 3)[0]] == [12, 11, 10]
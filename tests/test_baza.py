@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Магазины в базе SQLite: сохранение через хранилище и пакетные изменения
+"""
+
+import pytest
+
+from todoshop import Hranilishche, Magazin, ReestrMagazinov, SpisokZadach, SqliteBaza, Zadacha
+from todoshop.obmen import importirovat_tovary
+
+
+def tovary_magazina(magazin):
+    return sorted(magazin.tovary.items())
+
+
+def otkryt(tmp_path):
+    baza = SqliteBaza(str(tmp_path / "magaziny.db"))
+    return baza, Hranilishche(str(tmp_path / "dannye"), baza=baza)
+
+
+def test_sohranenie_cherez_hranilishche(tmp_path):
+    baza, hranilishche = otkryt(tmp_path)
+    spisok, reestr = hranilishche.zagruzit()
+    hranilishche.podkliuchit(spisok, reestr)
+    spisok.dobavit(Zadacha("Купить хлеб", "Сегодня"))
+    ugol = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    lavka = reestr.dobavit(Magazin("Лавка", "ул. Садовая, 3", "Книжный"))
+    for i in range(100):
+        ugol.dobavit_tovar(f"Товар {i}", i * 1.5, i % 4, "05.03.2024")
+        lavka.dobavit_tovar(f"Книга {i}", 100 + i, 1, "06.03.2024")
+    ugol.udalit_tovar("Товар 0")
+    ugol.primenit_prais([(f"Товар {i}", i * 2.0) for i in range(1, 100, 2)])
+    reestr.pereimenovat(ugol, "Уголок")
+    reestr.udalit(lavka)
+    ozhidaetsia = tovary_magazina(ugol)
+    hranilishche.zakryt()
+    baza.zakryt()
+    
+    baza, hranilishche = otkryt(tmp_path)
+    zadachi, zagruzhennyi = hranilishche.zagruzit()
+    assert [z.opisanie for z in zadachi] == ["Купить хлеб"]
+    assert [(m.nomer, m.nazvanie) for m in zagruzhennyi] == [(ugol.nomer, "Уголок")]
+    kopiia = zagruzhennyi.naiti("Уголок")
+    assert tovary_magazina(kopiia) == ozhidaetsia
+    assert kopiia.stoimost == ugol.stoimost
+    # Товары удалённого магазина ушли из базы вместе с ним
+    assert baza.soedinenie.execute('SELECT COUNT(*) FROM tovary').fetchone()[0] == len(ozhidaetsia)
+    baza.zakryt()
+
+
+def test_perenos_iz_snimka(tmp_path):
+    # Магазины, сохранённые без базы, переезжают в неё при первом подключении
+    hranilishche = Hranilishche(str(tmp_path / "dannye"))
+    reestr = ReestrMagazinov()
+    hranilishche.podkliuchit(SpisokZadach(), reestr)
+    magazin = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    magazin.dobavit_tovar("Хлеб", 45.5, 10, "05.03.2024")
+    hranilishche.zakryt()
+    
+    baza, hranilishche = otkryt(tmp_path)
+    spisok, reestr = hranilishche.zagruzit()
+    hranilishche.podkliuchit(spisok, reestr)
+    reestr.naiti("Угол").obnovit_kolichestvo("Хлеб", 7)
+    hranilishche.zakryt()
+    baza.zakryt()
+    
+    baza, hranilishche = otkryt(tmp_path)
+    _, reestr = hranilishche.zagruzit()
+    assert len(reestr) == 1
+    assert reestr.naiti("Угол").tovary["Хлеб"] == {'cena': 45.5, 'kolichestvo': 7,
+                                                    'data_dobavlenia': "05.03.2024"}
+    baza.zakryt()
+
+
+def test_paket_odnoi_tranzakciei(tmp_path):
+    baza = SqliteBaza(str(tmp_path / "magaziny.db"))
+    magazin = baza.sozdat_magazin("Угол", "ул. Мира, 1", "Продукты")
+    assert baza.massovyi_import(magazin, ((f"Товар {i}", i, 1) for i in range(500))) == 500
+    zaprosy = []
+    baza.soedinenie.set_trace_callback(zaprosy.append)
+    assert magazin.primenit_prais([(f"Товар {i}", i + 0.5) for i in range(500)]) == 500
+    baza.soedinenie.set_trace_callback(None)
+    
+    assert zaprosy.count('COMMIT') == 1
+    assert magazin.tovary["Товар 7"]['cena'] == 7.5
+    magazin.proverit_itogi()
+    baza.zakryt()
+
+
+def test_import_iz_faila(tmp_path):
+    baza = SqliteBaza(str(tmp_path / "magaziny.db"))
+    magazin = baza.sozdat_magazin("Угол", "ул. Мира, 1", "Продукты")
+    sobytiia = []
+    magazin.podpisat(lambda sobytie, magazin, tovar: sobytiia.append(sobytie))
+    put = tmp_path / "tovary.csv"
+    put.write_text("tovar,cena,kolichestvo\n" + "".join(f"Товар {i},{i},2\n" for i in range(1000)),
+                   encoding='utf-8')
+    zaprosy = []
+    baza.soedinenie.set_trace_callback(zaprosy.append)
+    assert importirovat_tovary(magazin, str(put)) == 1000
+    baza.soedinenie.set_trace_callback(None)
+    
+    assert zaprosy.count('COMMIT') == 1
+    assert sobytiia == ['zagruzheny']
+    assert len(magazin.tovary) == magazin.chislo_tovarov == 1000
+    magazin.proverit_itogi()
+    
+    # Ошибка в файле: строки до неё остаются в базе, итоги им соответствуют
+    put.write_text("tovar,cena,kolichestvo\nХлеб,45,1\nСыр,-1,2\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="строка 3"):
+        importirovat_tovary(magazin, str(put))
+    assert "Хлеб" in magazin.tovary and "Сыр" not in magazin.tovary
+    magazin.proverit_itogi()
+    baza.zakryt()
+
+
+def test_slovarnyi_interfeis(tmp_path):
+    baza = SqliteBaza(str(tmp_path / "magaziny.db"))
+    magazin = baza.sozdat_magazin("Угол", "ул. Мира, 1", "Продукты")
+    magazin.dobavit_tovar("Хлеб", 45.5, 3, "05.03.2024")
+    magazin.dobavit_tovar("Сыр", 300.0, 1, "05.03.2024")
+    with pytest.raises(TypeError):
+        magazin.tovary["Хлеб"]['cena'] = 1.0
+    stroki = magazin.tovary.items()
+    assert len(stroki) == len(magazin.tovary.values()) == 2
+    assert sorted(stroki) == sorted(stroki) == [
+        ("Сыр", {'cena': 300.0, 'kolichestvo': 1, 'data_dobavlenia': "05.03.2024"}),
+        ("Хлеб", {'cena': 45.5, 'kolichestvo': 3, 'data_dobavlenia': "05.03.2024"})]
+    baza.zakryt()
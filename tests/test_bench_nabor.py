@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Набор замеров: каждый замер работает на малом размере, сравнение с базой ловит замедление
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import bench_nabor
+
+
+def rezultat(imia, mediana, minimum):
+    return {'imia': imia, 'razmer': 10, 'mediana': mediana, 'minimum': minimum}
+
+
+@pytest.mark.parametrize('imia', sorted(bench_nabor.ZAMERY))
+def test_zamer_na_malom_razmere(monkeypatch, imia):
+    # Замеры окна без дисплея пропускаются - здесь окна нет никогда
+    monkeypatch.setattr(bench_nabor, 'sozdat_okno', lambda: None)
+    monkeypatch.setattr(bench_nabor, 'MIN_VYBORKA', 0.001)
+    zamer = bench_nabor.izmerit(imia, 10, vyborok=3)
+    bench_nabor.magazin_s_tovarami.cache_clear()
+    if zamer is None:
+        return
+    assert (zamer['imia'], zamer['razmer'], zamer['vyborok']) == (imia, 10, 3)
+    assert 0 < zamer['minimum'] <= zamer['mediana']
+    assert zamer['povtorov'] >= 1
+
+
+def test_sravnenie_s_bazoi(tmp_path, capsys):
+    put = str(tmp_path / "baza.json")
+    bench_nabor.zapisat(put, {'versiia': bench_nabor.VERSIIA_FORMATA,
+                              'metadannye': {'data': "2026-01-01", 'kommit': None},
+                              'zamery': [rezultat('a', 1.0, 1.0), rezultat('b', 1.0, 1.0),
+                                         rezultat('v', 1.0, 1.0)]})
+    bazovye = bench_nabor.prochitat(put)
+    tekushchie = {'zamery': [rezultat('a', 1.5, 1.5),      # хуже и медиана, и минимум
+                             rezultat('b', 1.5, 1.0),      # одна медиана - шум
+                             rezultat('v', 0.5, 0.5),
+                             rezultat('novyi', 9.0, 9.0)]}
+    zamedlenia = bench_nabor.sravnit(bazovye, tekushchie, porog=10)
+    assert [z['imia'] for z in zamedlenia] == ['a']
+    assert "быстрее" in capsys.readouterr().out
+    assert bench_nabor.sravnit(bazovye, tekushchie, porog=60) == []
+
+
+def test_chuzhaia_versiia_formata(tmp_path):
+    put = str(tmp_path / "baza.json")
+    bench_nabor.zapisat(put, {'versiia': bench_nabor.VERSIIA_FORMATA + 1, 'zamery': []})
+    with pytest.raises(ValueError, match="версия"):
+        bench_nabor.prochitat(put)
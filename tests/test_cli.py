@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Командная строка: команды над папкой с данными и коды завершения
+"""
+
+import json
+
+import pytest
+
+from todoshop import metriki
+from todoshop.cli import main
+
+
+def zapustit(capsys, papka, *argumenty):
+    """Код завершения и вывод команды (stdout, stderr)"""
+    kod = main(['--papka', str(papka), *argumenty])
+    vyvod = capsys.readouterr()
+    return kod, vyvod.out, vyvod.err
+
+
+@pytest.fixture
+def faily(tmp_path):
+    (tmp_path / "tovary.csv").write_text("tovar,cena,kolichestvo\nХлеб,45.5,10\nСыр,300,2\nЧай,120,1\n",
+                                         encoding='utf-8')
+    (tmp_path / "prais.csv").write_text("tovar,cena\nСыр,320\n", encoding='utf-8')
+    (tmp_path / "zadachi.csv").write_text("opisanie,srok\nКупить хлеб,Сегодня\nПозвонить,\n",
+                                          encoding='utf-8')
+    return tmp_path
+
+
+def test_komandy_magazina(capsys, faily):
+    papka = faily / "dannye"
+    kod, _, oshibka = zapustit(capsys, papka, 'import', "Угол", str(faily / "tovary.csv"))
+    assert kod == 1 and "Нет магазина 'Угол'" in oshibka
+    
+    assert zapustit(capsys, papka, 'import', "Угол", str(faily / "tovary.csv"), '--sozdat') == \
+        (0, "Загружено товаров: 3\n", "")
+    assert zapustit(capsys, papka, 'prais', "Угол", str(faily / "prais.csv"))[1] == "Изменено цен: 1\n"
+    # Магазин находится и по номеру
+    assert zapustit(capsys, papka, 'nacenka', "1", "10")[1] == "Изменено цен: 3\n"
+    assert zapustit(capsys, papka, 'magaziny')[1] == "1\tУгол\t3\t1336.50\n"
+    
+    put = faily / "vygruzka.jsonl"
+    assert zapustit(capsys, papka, 'eksport', "Угол", str(put))[1] == "Выгружено товаров: 3\n"
+    vygruzheno = [json.loads(stroka) for stroka in put.read_text(encoding='utf-8').splitlines()]
+    assert [(z['tovar'], z['cena'], z['kolichestvo']) for z in vygruzheno] == [
+        ("Хлеб", 50.05, 10), ("Сыр", 352.0, 2), ("Чай", 132.0, 1)]
+
+
+def test_komandy_zadach(capsys, faily):
+    papka = faily / "dannye"
+    assert zapustit(capsys, papka, 'import-zadach', str(faily / "zadachi.csv"))[:2] == \
+        (0, "Добавлено задач: 2\n")
+    put = faily / "vygruzka.csv"
+    assert zapustit(capsys, papka, 'eksport-zadach', str(put))[:2] == (0, "Выгружено задач: 2\n")
+    stroki = put.read_text(encoding='utf-8').splitlines()
+    assert stroki[0] == "opisanie,srok,vremia_sozdania,vremia_vypolnenia"
+    assert [stroka.split(',')[:2] for stroka in stroki[1:]] == [["Купить хлеб", "Сегодня"],
+                                                               ["Позвонить", ""]]
+    
+    kod, _, oshibka = zapustit(capsys, papka, 'import-zadach', str(faily / "net.csv"))
+    assert kod == 1 and oshibka.startswith("Ошибка: ")
+
+
+def test_baza_i_metriki(capsys, faily):
+    papka, baza, zamery = faily / "dannye", faily / "magaziny.db", faily / "todoshop.prom"
+    try:
+        kod, _, _ = zapustit(capsys, papka, '--baza', str(baza), '--metriki', str(zamery),
+                             'import', "Угол", str(faily / "tovary.csv"), '--sozdat')
+    finally:
+        metriki.vykliuchit()
+    assert kod == 0 and baza.exists()
+    assert 'operacia="reestr.dobavit"' in zamery.read_text(encoding='utf-8')
+    
+    # Товары в базе, а не в папке: без --baza магазин пустой
+    assert zapustit(capsys, papka, '--baza', str(baza), 'magaziny')[1] == "1\tУгол\t3\t1175.00\n"
+    assert zapustit(capsys, papka, 'magaziny')[1] == ""
+
+
+def test_neizvestnyi_kluch(capsys, tmp_path):
+    with pytest.raises(SystemExit) as vyhod:
+        main(['--papka', str(tmp_path), 'magaziny', '--chto-to'])
+    assert vyhod.value.code == 2
+    assert "неизвестные параметры: --chto-to" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Фоновые задания: слияние по ключу, отмена и выдача результатов через root.after
+"""
+
+import threading
+import time
+
+from todoshop.fon import FonovyeZadaniia
+
+
+class Taimery:
+    """Заменитель окна Tk: вызовы after копятся и выполняются по krutit()"""
+    def __init__(self):
+        self.ochered = []
+    
+    def after(self, ms, func):
+        self.ochered.append(func)
+        return len(self.ochered)
+    
+    def krutit(self, fon, sekund=5):
+        """Выполнять отложенные вызовы, пока у пула есть задания"""
+        konec = time.monotonic() + sekund
+        while fon.aktivnye or self.ochered:
+            assert time.monotonic() < konec, "задания не завершились"
+            if self.ochered:
+                self.ochered.pop(0)()
+            else:
+                time.sleep(0.001)
+
+
+def sozdat_pul():
+    root, hod, oshibki = Taimery(), [], []
+    fon = FonovyeZadaniia(root, hod.append, lambda zadanie, oshibka: oshibki.append(oshibka))
+    return root, fon, hod, oshibki
+
+
+def test_sliianie_po_kluchu():
+    root, fon, hod, _ = sozdat_pul()
+    nachato, otpustit = threading.Event(), threading.Event()
+    rezultaty = []
+    
+    def medlennaia(zadanie):
+        nachato.set()
+        otpustit.wait(5)
+        zadanie.otmetit_hod(1, 2)
+        return 'старое'
+    
+    staroe = fon.zapustit(medlennaia, rezultaty.append, kluch='poisk', opisanie="Поиск")
+    nachato.wait(5)
+    novoe = fon.zapustit(lambda zadanie: 'новое', rezultaty.append, kluch='poisk', opisanie="Поиск")
+    assert staroe.otmeneno and fon.aktivnye == {'poisk': novoe}
+    otpustit.set()
+    root.krutit(fon)
+    
+    # Результат заменённого задания отброшен, а в конце ход очищен
+    assert rezultaty == ['новое']
+    assert hod[-1] == []
+    fon.zakryt()
+
+
+def test_otmena_i_oshibka():
+    root, fon, _, oshibki = sozdat_pul()
+    otpustit = threading.Event()
+    rezultaty, svoi_oshibki = [], []
+    
+    def zhdat(zadanie):
+        otpustit.wait(5)
+        return 1
+    
+    def upast(zadanie):
+        raise ValueError("нет файла")
+    
+    fon.zapustit(zhdat, rezultaty.append, kluch='import')
+    fon.zapustit(upast, rezultaty.append)
+    fon.zapustit(upast, rezultaty.append, oshibka=svoi_oshibki.append)
+    fon.otmenit('import')
+    assert 'import' not in fon.aktivnye
+    otpustit.set()
+    root.krutit(fon)
+    # Отменённое задание доработало, но его результат не выдаётся
+    fon.pul.shutdown(wait=True)
+    fon.proverit()
+    
+    assert rezultaty == []
+    assert [str(o) for o in oshibki] == [str(o) for o in svoi_oshibki] == ["нет файла"]
+    fon.zakryt()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Хранилище: журнал, снимок и загрузка
+"""
+
+import gc
+import os
+import shutil
+import threading
+
+from todoshop import Hranilishche, Magazin, ReestrMagazinov, SpisokZadach, Zadacha
+
+
+def zapolnit(papka, **parametry):
+    """Хранилище с задачами и магазином, изменёнными всеми видами операций"""
+    hranilishche = Hranilishche(str(papka), **parametry)
+    spisok, reestr = SpisokZadach(), ReestrMagazinov()
+    hranilishche.podkliuchit(spisok, reestr)
+    zadachi = [spisok.dobavit(Zadacha(f"Задача {i}", "Завтра")) for i in range(20)]
+    for zadacha in zadachi[::3]:
+        spisok.otmetit(zadacha)
+    spisok.sniat_otmetku(zadachi[3])
+    spisok.udalit(zadachi[4])
+    magazin = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    for i in range(30):
+        magazin.dobavit_tovar(f"Товар {i}", i + 0.25, i % 6, "05.03.2024")
+    magazin.udalit_tovar("Товар 0")
+    magazin.obnovit_cenu("Товар 1", 7.5)
+    magazin.obnovit_kolichestvo("Товар 2", 11)
+    magazin.primenit_prais([(f"Товар {i}", i * 2.0) for i in range(10, 20)])
+    reestr.pereimenovat(magazin, "Уголок")
+    reestr.udalit(reestr.dobavit(Magazin("Времянка", "", "")))
+    return hranilishche, spisok, reestr
+
+
+def sostoianie(spisok, reestr):
+    return ([(z.nomer, z.opisanie, z.srok, z.status, z.vremia_vypolnenia) for z in spisok],
+            spisok.sleduiushchii_nomer,
+            [(m.nomer, m.nazvanie, sorted(m.tovary.items()), m.stoimost) for m in reestr])
+
+
+def test_zhurnal_i_snimok(tmp_path):
+    # Без сжатия всё в журнале; со сжатием - снимок и хвост журнала
+    for papka, kompaktirovat_posle in ((tmp_path / "zhurnal", 10000), (tmp_path / "snimok", 7)):
+        hranilishche, spisok, reestr = zapolnit(papka, kompaktirovat_posle=kompaktirovat_posle)
+        ozhidaetsia = sostoianie(spisok, reestr)
+        hranilishche.zakryt()
+        with open(hranilishche.put_zhurnala, encoding='utf-8') as f:
+            assert sum(1 for _ in f) < kompaktirovat_posle
+        assert sostoianie(*Hranilishche(str(papka)).zagruzit()) == ozhidaetsia
+
+
+def test_oborvannaia_stroka_zhurnala(tmp_path):
+    hranilishche, spisok, reestr = zapolnit(tmp_path)
+    ozhidaetsia = sostoianie(spisok, reestr)
+    hranilishche.zakryt()
+    with open(hranilishche.put_zhurnala, 'a', encoding='utf-8') as f:
+        f.write('{"op":"dobavit_zadachu","nomer":99')
+    
+    # Недописанная строка отрезается, новые операции идут следом за целыми
+    hranilishche = Hranilishche(str(tmp_path))
+    spisok, reestr = hranilishche.zagruzit()
+    assert sostoianie(spisok, reestr) == ozhidaetsia
+    hranilishche.podkliuchit(spisok, reestr)
+    spisok.dobavit(Zadacha("После сбоя", ""))
+    ozhidaetsia = sostoianie(spisok, reestr)
+    hranilishche.zakryt()
+    assert sostoianie(*Hranilishche(str(tmp_path)).zagruzit()) == ozhidaetsia
+
+
+def test_snimok_bez_ochistki_zhurnala(tmp_path):
+    # Сбой между заменой снимка и очисткой журнала: вошедшие в снимок
+    # операции журнала не проигрываются второй раз
+    hranilishche, spisok, reestr = zapolnit(tmp_path)
+    shutil.copy(hranilishche.put_zhurnala, tmp_path / "staryi.jsonl")
+    hranilishche.kompaktirovat()
+    ozhidaetsia = sostoianie(spisok, reestr)
+    hranilishche.zakryt()
+    os.replace(tmp_path / "staryi.jsonl", hranilishche.put_zhurnala)
+    assert sostoianie(*Hranilishche(str(tmp_path)).zagruzit()) == ozhidaetsia
+
+
+def test_zagruzka_ne_trogaet_sborshchik(tmp_path):
+    # Состояние сборщика общее для процесса: библиотека его не меняет
+    hranilishche, _, _ = zapolnit(tmp_path)
+    hranilishche.zakryt()
+    sostoianie = []
+    
+    def zagruzit():
+        Hranilishche(str(tmp_path)).zagruzit()
+        sostoianie.append((gc.isenabled(), gc.get_freeze_count()))
+    
+    gc.unfreeze()
+    zagruzit()
+    potok = threading.Thread(target=zagruzit)
+    potok.start()
+    potok.join()
+    assert sostoianie == [(True, 0), (True, 0)]
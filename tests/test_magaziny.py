@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Магазин: проверка значений, пакетные изменения с итогами и отчёт
+"""
+
+import math
+import random
+
+import pytest
+
+from todoshop import Magazin
+
+
+@pytest.fixture
+def magazin():
+    magazin = Magazin("Угол", "ул. Мира, 1", "Продукты")
+    magazin.PROVERIAT_ITOGI = True
+    for i in range(300):
+        magazin.dobavit_tovar(f"Товар {i}", (0.1, 0.2, 0.3, 1.15, 7)[i % 5], i % 11)
+    return magazin
+
+
+@pytest.mark.parametrize('znachenie', [math.nan, -1, math.inf, 'много', None])
+def test_dobavit_tovar_otvergaet(magazin, znachenie):
+    with pytest.raises(ValueError):
+        magazin.dobavit_tovar("Брак", znachenie)
+    with pytest.raises(ValueError):
+        magazin.dobavit_tovar("Брак", 1.0, znachenie)
+    assert "Брак" not in magazin.tovary
+    magazin.proverit_itogi()
+
+
+@pytest.mark.parametrize('znachenie', [math.nan, -0.5, math.inf])
+def test_prais_vse_ili_nichego(magazin, znachenie):
+    do = list(magazin.tovary.items())
+    with pytest.raises(ValueError):
+        magazin.primenit_prais([("Товар 1", 2.0), ("Товар 2", znachenie)])
+    assert list(magazin.tovary.items()) == do
+
+
+def test_paket_kak_po_odnomu(magazin):
+    # Малые пакеты правят индексы на месте, большие пересобирают - итог один
+    magazin.poriadok('summa')
+    magazin.poriadok('kolichestvo')
+    sluchai = random.Random(5)
+    for razmer in (1, 3, 63, 64, 200, 300):
+        prais = [(f"Товар {sluchai.randrange(300)}", sluchai.choice((0.1, 0.3, 2.5, 0)))
+                 for _ in range(razmer)]
+        magazin.primenit_prais(prais)
+        for tovar, cena in dict(prais).items():
+            assert magazin.uznat_cenu(tovar) == cena
+        magazin.popolnit([(tovar, 2) for tovar, _ in prais])
+        magazin.poriadok('summa')
+    magazin.nacenka(10)
+    magazin.proverit_itogi()
+
+
+def test_stranicy_otcheta(magazin):
+    # Любой кусок отчёта совпадает с тем же куском полного отчёта
+    polnyi = list(magazin.stroki_otcheta())
+    zagolovok = magazin.zagolovok_otcheta()
+    assert len(polnyi) == magazin.chislo_strok_otcheta() == len(zagolovok) + 300
+    assert polnyi[:len(zagolovok)] == zagolovok
+    assert polnyi[len(zagolovok)].startswith(" 1. ") and "7.00 руб." in polnyi[len(zagolovok)]
+    for nachalo, konec in [(0, 3), (2, 20), (len(zagolovok), len(zagolovok) + 1),
+                           (100, 150), (295, 400), (400, 500)]:
+        assert list(magazin.stroki_otcheta(nachalo, konec)) == polnyi[nachalo:konec]
+    
+    pustoi = Magazin("Пусто", "", "")
+    assert list(pustoi.stroki_otcheta()) == pustoi.zagolovok_otcheta()
+    assert pustoi.chislo_strok_otcheta() == len(pustoi.zagolovok_otcheta())
+
+
+@pytest.mark.parametrize('pole', ['cena', 'nazvanie', 'kolichestvo', 'summa'])
+def test_tovary_po_posle_izmenenii(magazin, pole):
+    # Порядок для таблицы строится после удалений и дальше правится на месте
+    for i in range(0, 300, 7):
+        magazin.udalit_tovar(f"Товар {i}")
+    magazin.poriadok(pole)
+    magazin.dobavit_tovar("Аааа", 0.5, 100)
+    magazin.obnovit_cenu("Товар 1", 1000)
+    magazin.obnovit_kolichestvo("Товар 2", 0)
+    magazin.primenit_prais([(f"Товар {i}", 3.5) for i in range(3, 300, 10) if i % 7])
+    magazin.nacenka(5, [f"Товар {i}" for i in range(5, 300, 20) if i % 7])
+    
+    kluch = {'cena': lambda t, c, k: c, 'nazvanie': lambda t, c, k: t,
+             'kolichestvo': lambda t, c, k: k, 'summa': lambda t, c, k: c * k}[pole]
+    vse = sorted(((tovar, info['cena'], info['kolichestvo']) for tovar, info in magazin.tovary.items()),
+                 key=lambda stroka: (kluch(*stroka), stroka[0]))
+    for nachalo, skolko in [(0, 25), (100, 25), (240, 30), (400, 10)]:
+        assert magazin.tovary_po(pole, nachalo, skolko) == vse[nachalo:nachalo + skolko]
+        assert magazin.tovary_po(pole, nachalo, skolko, ubyvanie=True) == \
+            vse[::-1][nachalo:nachalo + skolko]
+    magazin.proverit_itogi()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Замеры: кольцевой буфер, распределения, точки замера и выгрузка
+"""
+
+import pytest
+
+from todoshop import metriki
+from todoshop.metriki import Gistogramma, Metriki, tochka_zamera
+
+
+class Schetchik:
+    @tochka_zamera('test.shag')
+    def shag(self, n):
+        return n + 1
+
+
+def test_procentili():
+    gistogramma = Gistogramma()
+    assert gistogramma.procentil(50) is None
+    for i in range(1, 101):
+        gistogramma.zapisat(i / 1000)
+    assert gistogramma.chislo == 100 and gistogramma.maksimum == 0.1
+    assert gistogramma.summa == pytest.approx(5.05)
+    # Процентиль - верхняя граница корзины: не меньше точного и не больше чем на шаг
+    for p, tochno in [(1, 0.001), (50, 0.05), (95, 0.095)]:
+        assert tochno <= gistogramma.procentil(p) <= tochno * 2 ** 0.25
+    assert gistogramma.procentil(100) == 0.1
+
+
+def test_vytesnennye_zapisi():
+    zamery = Metriki(emkost=4)
+    for i in range(10):
+        zamery.zapisat('a', 0.001 * (i + 1))
+    # В распределение попали только 4 последние записи
+    ((imia, chislo, (p50, _, p99), maksimum),) = zamery.svodka()
+    assert (imia, chislo, maksimum, p99) == ('a', 4, 0.01, 0.01)
+    assert 0.008 <= p50 < 0.01
+    assert zamery.poteriano == 6
+    zamery.zapisat('b', 0.5)
+    zamery.zapisat('a', 0.002)
+    assert [(imia, chislo) for imia, chislo, _, _ in zamery.svodka()] == [('a', 5), ('b', 1)]
+    assert zamery.poteriano == 6
+    assert [(imia, sekund) for _, imia, sekund in zamery.medlennye(2)] == [('b', 0.5), ('a', 0.01)]
+    
+    zamery.sbrosit()
+    zamery.zapisat('v', 0.1)
+    assert [imia for imia, _, _, _ in zamery.svodka()] == ['v'] and zamery.poteriano == 0
+
+
+def test_vkliuchenie_tochek():
+    ishodnaia = Schetchik.shag
+    zamery = metriki.vkliuchit()
+    try:
+        assert Schetchik().shag(1) == 2 and Schetchik().shag(2) == 3
+        assert Schetchik.shag is not ishodnaia and Schetchik.shag.__name__ == 'shag'
+    finally:
+        metriki.vykliuchit()
+    assert Schetchik.shag is ishodnaia and metriki.aktivnye is None
+    Schetchik().shag(3)
+    assert [(imia, chislo) for imia, chislo, _, _ in zamery.svodka()] == [('test.shag', 2)]
+
+
+def zamery_dlia_vygruzki():
+    zamery = Metriki(emkost=3)
+    for sekund in (0.5, 0.002, 0.002):
+        zamery.zapisat('okno.obnovit', sekund)
+    zamery.zapisat('imia "v kavychkah"', 1e-5)
+    return zamery
+
+
+def test_tekst_prometheus():
+    stroki = metriki.tekst_prometheus(zamery_dlia_vygruzki()).splitlines()
+    imia = 'todoshop_operacia_sekund'
+    assert f'# TYPE {imia} histogram' in stroki
+    assert f'{imia}_count{{operacia="okno.obnovit"}} 2' in stroki
+    assert f'{imia}_sum{{operacia="okno.obnovit"}} 0.004' in stroki
+    assert f'{imia}_bucket{{operacia="okno.obnovit",le="+Inf"}} 2' in stroki
+    assert f'{imia}_count{{operacia="imia \\"v kavychkah\\""}} 1' in stroki
+    # Корзины накопительные: число записей по границам не убывает
+    korziny = [int(s.rsplit(' ', 1)[1]) for s in stroki
+               if s.startswith(f'{imia}_bucket{{operacia="okno.obnovit"')]
+    assert korziny == sorted(korziny) and korziny[0] == 0
+    assert stroki[-3:] == ['# HELP todoshop_poteriano_zamerov_total '
+                           'Замеры, вытесненные из кольцевого буфера до сбора.',
+                           '# TYPE todoshop_poteriano_zamerov_total counter',
+                           'todoshop_poteriano_zamerov_total 1']
+
+
+def test_eksport_openmetrics(tmp_path):
+    put = tmp_path / "todoshop.prom"
+    metriki.eksportirovat(zamery_dlia_vygruzki(), str(put), openmetrics=True)
+    tekst = put.read_text(encoding='utf-8')
+    assert [p.name for p in tmp_path.iterdir()] == ["todoshop.prom"]
+    assert tekst.endswith('todoshop_poteriano_zamerov_total 1\n# EOF\n')
+    assert '# TYPE todoshop_poteriano_zamerov counter\n' in tekst
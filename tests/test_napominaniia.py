@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Напоминания: один таймер на ближайший срок, выполненные и удалённые задачи молчат
+"""
+
+from datetime import date, timedelta
+import time
+
+from todoshop import SpisokZadach, Zadacha
+from todoshop.napominaniia import Napominaniia
+from todoshop.sroki import konec_dnia
+
+
+class Taimery:
+    """Заменитель окна Tk: запоминает after и снимает по after_cancel"""
+    def __init__(self):
+        self.taimery = {}
+        self.nomera = iter(range(1, 1000))
+    
+    def after(self, ms, func):
+        nomer = next(self.nomera)
+        self.taimery[nomer] = (ms, func)
+        return nomer
+    
+    def after_cancel(self, nomer):
+        del self.taimery[nomer]
+    
+    def srabotat(self):
+        """Выполнить единственный заведённый таймер"""
+        ((nomer, (_, func)),) = self.taimery.items()
+        del self.taimery[nomer]
+        func()
+
+
+def test_napominanie_o_sroke(monkeypatch):
+    zavtra, cherez_nedeliu = date.today() + timedelta(days=1), date.today() + timedelta(days=7)
+    spisok = SpisokZadach()
+    root, napomneno = Taimery(), []
+    napominaniia = Napominaniia(root, napomneno.append)
+    napominaniia.podkliuchit(spisok)
+    assert root.taimery == {} and len(napominaniia) == 0
+    
+    zadachi = [spisok.dobavit(Zadacha(opisanie, f"{den:%d.%m.%Y}"))
+               for opisanie, den in [("Позже", cherez_nedeliu), ("Купить хлеб", zavtra),
+                                     ("Сделано", zavtra), ("Удалено", zavtra)]]
+    spisok.dobavit(Zadacha("Просрочено", "01.01.2000"))
+    spisok.dobavit(Zadacha("Без срока", ""))
+    assert len(root.taimery) == 1 and len(napominaniia) == 4
+    assert napominaniia.srok_taimera == konec_dnia(zavtra)
+    spisok.otmetit(zadachi[2])
+    spisok.udalit(zadachi[3])
+    
+    # Срок истёк: напоминание только о невыполненной задаче, таймер - на следующий срок
+    monkeypatch.setattr(time, 'time', lambda: konec_dnia(zavtra) + 1)
+    root.srabotat()
+    assert napomneno == [[zadachi[1]]]
+    assert napominaniia.srok_taimera == konec_dnia(cherez_nedeliu) and len(napominaniia) == 1
+    ((ms, _),) = root.taimery.values()
+    assert ms == Napominaniia.CHAS * 1000 + 1
+    
+    napominaniia.ostanovit()
+    assert root.taimery == {} and len(napominaniia) == 0
+    spisok.dobavit(Zadacha("После остановки", f"{cherez_nedeliu:%d.%m.%Y}"))
+    assert root.taimery == {}
+
+
+def test_blizhaishii_srok_perezavodit_taimer():
+    spisok = SpisokZadach()
+    spisok.dobavit(Zadacha("Позже", f"{date.today() + timedelta(days=30):%d.%m.%Y}"))
+    root = Taimery()
+    napominaniia = Napominaniia(root, lambda zadachi: None)
+    napominaniia.podkliuchit(spisok)
+    (staryi,) = root.taimery
+    spisok.dobavit(Zadacha("Раньше", "Сегодня"))
+    (novyi,) = root.taimery
+    assert novyi != staryi and napominaniia.srok_taimera == konec_dnia(date.today())
+    
+    # Более поздний срок таймер не трогает
+    spisok.dobavit(Zadacha("Ещё позже", f"{date.today() + timedelta(days=60):%d.%m.%Y}"))
+    assert list(root.taimery) == [novyi] and len(napominaniia) == 3
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Импорт и экспорт: выгруженное загружается обратно без потерь
+"""
+
+import pytest
+
+from todoshop import Hranilishche, Magazin, ReestrMagazinov, SpisokZadach, Zadacha
+from todoshop.obmen import (eksportirovat_tovary, eksportirovat_zadachi, importirovat_tovary,
+                            importirovat_zadachi)
+
+NAZVANIIA = ["Хлеб", "Сыр, твёрдый", 'Чай "Утро"', "Две\nстроки", "  пробелы  ", "ё" * 50]
+
+
+def sozdat_magazin():
+    magazin = Magazin("Угол", "ул. Мира, 1", "Продукты")
+    for i, nazvanie in enumerate(NAZVANIIA):
+        magazin.dobavit_tovar(nazvanie.strip(), 0.1 * (i + 1) + 1e-9, i, "05.03.2024")
+    for i in range(500):
+        magazin.dobavit_tovar(f"Товар {i}", i / 3, i % 7, "06.03.2024")
+    return magazin
+
+
+@pytest.mark.parametrize('rasshirenie', ['csv', 'jsonl'])
+@pytest.mark.parametrize('shema_izvestna', [False, True])
+def test_tovary(tmp_path, rasshirenie, shema_izvestna):
+    magazin = sozdat_magazin()
+    put = str(tmp_path / f"tovary.{rasshirenie}")
+    assert eksportirovat_tovary(magazin, put) == len(magazin.tovary)
+    
+    kopiia = Magazin("Копия", "", "")
+    assert importirovat_tovary(kopiia, put, shema_izvestna=shema_izvestna) == len(magazin.tovary)
+    assert list(kopiia.tovary.items()) == list(magazin.tovary.items())
+    assert kopiia.stoimost == magazin.stoimost
+
+
+def test_tovary_cherez_hranilishche(tmp_path):
+    # Импорт сохраняется снимком: после загрузки магазин тот же
+    put = str(tmp_path / "tovary.csv")
+    eksportirovat_tovary(sozdat_magazin(), put)
+    hranilishche = Hranilishche(str(tmp_path / "dannye"))
+    reestr = ReestrMagazinov()
+    hranilishche.podkliuchit(SpisokZadach(), reestr)
+    magazin = reestr.dobavit(Magazin("Угол", "", ""))
+    importirovat_tovary(magazin, put)
+    hranilishche.zakryt()
+    
+    _, zagruzhennyi = Hranilishche(str(tmp_path / "dannye")).zagruzit()
+    kopiia = zagruzhennyi.naiti("Угол")
+    assert list(kopiia.tovary.items()) == list(magazin.tovary.items())
+    assert kopiia.stoimost == magazin.stoimost
+
+
+@pytest.mark.parametrize('soderzhimoe', [
+    "tovar,cena,kolichestvo\nХлеб,45,1\nСыр,-1,2\n",
+    "tovar,cena,kolichestvo\nХлеб,45,1\nСыр,nan,2\n",
+    "tovar,cena,kolichestvo\nХлеб,45,1\nСыр,10,-3\n",
+    "tovar,cena,kolichestvo\nХлеб,45,1\n,10,3\n",
+])
+def test_oshibka_s_nomerom_stroki(tmp_path, soderzhimoe):
+    put = tmp_path / "tovary.csv"
+    put.write_text(soderzhimoe, encoding='utf-8')
+    magazin = Magazin("Угол", "", "")
+    with pytest.raises(ValueError, match="строка 3"):
+        importirovat_tovary(magazin, str(put))
+    # Загруженное до ошибки остаётся, итоги ему соответствуют
+    assert list(magazin.tovary) == ["Хлеб"]
+    magazin.proverit_itogi()
+
+
+@pytest.mark.parametrize('rasshirenie', ['csv', 'jsonl'])
+def test_zadachi(tmp_path, rasshirenie):
+    spisok = SpisokZadach()
+    zadachi = [spisok.dobavit(Zadacha(f"Задача, {i}", "Завтра" if i % 2 else "")) for i in range(30)]
+    for zadacha in zadachi[::4]:
+        spisok.otmetit(zadacha)
+    put = str(tmp_path / f"zadachi.{rasshirenie}")
+    assert eksportirovat_zadachi(spisok, put) == 30
+    
+    kopiia = SpisokZadach()
+    assert importirovat_zadachi(kopiia, put) == 30
+    
+    def stroki(spisok):
+        return sorted((z.opisanie, z.srok, z.vremia_sozdania, z.vremia_vypolnenia) for z in spisok)
+    
+    assert stroki(kopiia) == stroki(spisok)
+
+
+def test_zadachi_paketami():
+    # Задачи ложатся в список по мере чтения, событие - одно в конце
+    spisok = SpisokZadach()
+    sobytiia = []
+    spisok.podpisat(lambda sobytie, dannye: sobytiia.append(sobytie))
+    
+    def istochnik(nachalo):
+        for i in range(nachalo, nachalo + 100):
+            # Предыдущие задачи уже в списке: источник не копится целиком
+            assert len(spisok) == i
+            yield Zadacha(f"Задача {i}", "")
+    
+    for nachalo in range(0, 500, 100):
+        assert spisok.zagruzit(istochnik(nachalo), soobshchit=False) == 100
+    assert sobytiia == [] and len(spisok) == 500
+    spisok.uvedomit('zagruzheny', None)
+    assert sobytiia == ['zagruzheny']
+    assert [z.nomer for z in spisok] == list(range(1, 501))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Отмена и повтор: состояние после отмен совпадает с сохранённым
+"""
+
+from todoshop import Hranilishche, Magazin, ReestrMagazinov, SpisokZadach, Zadacha, ZhurnalIzmenenii
+
+
+def podkliuchit(papka):
+    hranilishche = Hranilishche(str(papka))
+    spisok, reestr = SpisokZadach(), ReestrMagazinov()
+    hranilishche.podkliuchit(spisok, reestr)
+    zhurnal = ZhurnalIzmenenii()
+    zhurnal.podkliuchit(reestr)
+    return hranilishche, spisok, reestr, zhurnal
+
+
+def sostoianie_zadach(spisok):
+    return [(z.nomer, z.opisanie, z.status, z.vremia_vypolnenia) for z in spisok]
+
+
+def test_zadachi(tmp_path):
+    hranilishche, spisok, _, zhurnal = podkliuchit(tmp_path)
+    zadachi = [zhurnal.dobavit_zadachu(spisok, Zadacha(f"Задача {i}", "")) for i in range(6)]
+    zhurnal.otmetit_zadachu(spisok, zadachi[1])
+    zhurnal.otmetit_zadachu(spisok, zadachi[2])
+    zhurnal.vernut_zadachu(spisok, zadachi[2])
+    zhurnal.udalit_zadachu(spisok, zadachi[3])
+    
+    # Удалённая задача возвращается на своё место, возвращённая - снова выполнена
+    zhurnal.otmenit()
+    zhurnal.otmenit()
+    assert [z.nomer for z in spisok.zadachi] == [1, 4, 5, 6]
+    assert zadachi[2].vremia_vypolnenia is not None
+    posle_otmen = sostoianie_zadach(spisok)
+    hranilishche.zakryt()
+    assert sostoianie_zadach(Hranilishche(str(tmp_path)).zagruzit()[0]) == posle_otmen
+
+
+def test_povtor_posle_otmeny(tmp_path):
+    hranilishche, spisok, _, zhurnal = podkliuchit(tmp_path)
+    zadachi = [zhurnal.dobavit_zadachu(spisok, Zadacha(f"Задача {i}", "")) for i in range(4)]
+    zhurnal.otmetit_zadachu(spisok, zadachi[0])
+    zhurnal.udalit_zadachu(spisok, zadachi[1])
+    ozhidaetsia = sostoianie_zadach(spisok)
+    for _ in range(3):
+        zhurnal.otmenit()
+    for _ in range(3):
+        zhurnal.povtorit()
+    assert sostoianie_zadach(spisok) == ozhidaetsia
+    hranilishche.zakryt()
+    assert sostoianie_zadach(Hranilishche(str(tmp_path)).zagruzit()[0]) == ozhidaetsia
+
+
+def test_tovary(tmp_path):
+    hranilishche, _, reestr, zhurnal = podkliuchit(tmp_path)
+    magazin = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    for i in range(10):
+        zhurnal.dobavit_tovar(magazin, f"Товар {i}", 10.0 + i, i)
+    zhurnal.obnovit_cenu(magazin, "Товар 3", 99.5)
+    zhurnal.obnovit_kolichestvo(magazin, "Товар 4", 40)
+    zhurnal.udalit_tovar(magazin, "Товар 5")
+    zhurnal.dobavit_tovar(magazin, "Товар 6", 1.25, 2)
+    for _ in range(4):
+        zhurnal.otmenit()
+    zhurnal.povtorit()
+    
+    assert magazin.tovary["Товар 3"]['cena'] == 99.5
+    assert magazin.tovary["Товар 4"]['kolichestvo'] == 4
+    assert magazin.tovary["Товар 6"]['cena'] == 16.0
+    assert "Товар 5" in magazin.tovary
+    magazin.proverit_itogi()
+    hranilishche.zakryt()
+    
+    kopiia = next(iter(Hranilishche(str(tmp_path)).zagruzit()[1]))
+    assert sorted(kopiia.tovary.items()) == sorted(magazin.tovary.items())
+    assert kopiia.stoimost == magazin.stoimost
+
+
+def test_paket_stiraet_istoriiu(tmp_path):
+    hranilishche, _, reestr, zhurnal = podkliuchit(tmp_path)
+    magazin = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    zhurnal.dobavit_tovar(magazin, "Хлеб", 45.5, 3)
+    magazin.primenit_prais([("Хлеб", 50.0)])
+    assert zhurnal.otmenit() is None
+    assert magazin.tovary["Хлеб"]['cena'] == 50.0
+    hranilishche.zakryt()
+
+
+def test_povtornaia_otmetka_ne_zapominaetsia(tmp_path):
+    hranilishche, spisok, _, zhurnal = podkliuchit(tmp_path)
+    zadacha = zhurnal.dobavit_zadachu(spisok, Zadacha("Купить хлеб", ""))
+    assert zhurnal.otmetit_zadachu(spisok, zadacha)
+    assert not zhurnal.otmetit_zadachu(spisok, zadacha)
+    
+    # Отмена снимает ту единственную отметку, что была, и задача в работе
+    zhurnal.otmenit()
+    assert zadacha.vremia_vypolnenia is None and spisok.zadachi == [zadacha]
+    zhurnal.otmenit()
+    assert len(spisok) == 0 and zhurnal.otmenit() is None
+    hranilishche.zakryt()
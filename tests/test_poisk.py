@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Поиск товаров: индекс следует за магазинами и находит с опечатками
+"""
+
+from todoshop import IndeksTovarov, Magazin, ReestrMagazinov
+
+
+def sozdat_indeks():
+    reestr = ReestrMagazinov()
+    ugol = reestr.dobavit(Magazin("Угол", "", ""))
+    lavka = reestr.dobavit(Magazin("Лавка", "", ""))
+    for tovar, cena in [("Молоко", 80.0), ("Молоко топлёное", 95.0), ("Мука", 60.0), ("Хлеб", 45.0)]:
+        ugol.dobavit_tovar(tovar, cena, 1)
+    lavka.dobavit_tovar("молоко", 75.0, 3)
+    return reestr, ugol, lavka, IndeksTovarov(reestr)
+
+
+def test_po_prefiksu_i_pohozhie():
+    _, ugol, lavka, indeks = sozdat_indeks()
+    assert indeks.po_prefiksu("МОЛ") == ["молоко", "молоко топлёное"]
+    assert indeks.po_prefiksu("м", limit=2) == ["молоко", "молоко топлёное"]
+    # Опечатка: по началу ничего, но находится по триграммам
+    assert indeks.po_prefiksu("малоко") == []
+    assert indeks.naiti("малоко")[0] == "молоко"
+    assert indeks.naiti("   ") == []
+    assert indeks.gde_prodaetsia("Молоко") == [(lavka, 75.0), (ugol, 80.0)]
+    assert indeks.naiti_s_cenami("молоко", limit=1) == [("молоко", "молоко", lavka, 75.0, 2)]
+
+
+def test_izmeneniia_magazinov():
+    reestr, ugol, lavka, indeks = sozdat_indeks()
+    ugol.dobavit_tovar("Масло", 150.0, 2)
+    lavka.obnovit_cenu("молоко", 90.0)
+    ugol.udalit_tovar("Хлеб")
+    assert indeks.po_prefiksu("ма") == ["масло"]
+    assert indeks.samyi_deshevyi("Молоко") == (ugol, 80.0)
+    assert "хлеб" not in indeks.predlozheniia and indeks.naiti("хлеб") == []
+    
+    # Удалённый магазин уходит из предложений, его единственные товары - из индекса
+    reestr.udalit(ugol)
+    assert indeks.gde_prodaetsia("молоко") == [(lavka, 90.0)]
+    assert indeks.kluchi == ["молоко"]
+    assert all(kluchi == {"молоко"} for kluchi in indeks.trigrammy.values())
+    
+    # И магазины, добавленные позже, тоже попадают в индекс
+    kiosk = Magazin("Киоск", "", "")
+    kiosk.dobavit_tovar("Мука", 55.0, 1)
+    reestr.dobavit(kiosk)
+    assert indeks.naiti_s_cenami("мука") == [("мука", "Мука", kiosk, 55.0, 1)]
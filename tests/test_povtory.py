@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Повторяющиеся задачи: отметки повторов, отмена и сохранение
+"""
+
+import time
+from datetime import date, timedelta
+
+from todoshop import Hranilishche, ReestrMagazinov, SpisokZadach, Zadacha, ZhurnalIzmenenii
+from todoshop.sroki import Povtory, den_povtora, nomer_povtora
+
+DEN = 86400
+
+
+def sostoianie(spisok):
+    """Всё, что должно пережить сохранение: номер, статус, отметки повторов, срок"""
+    return [(z.nomer, z.status, None if z.povtory is None else z.povtory.sostoianie(), z.srok_do)
+            for z in spisok]
+
+
+def sozdat_hranilishche(papka, **parametry):
+    hranilishche = Hranilishche(str(papka), **parametry)
+    spisok = SpisokZadach()
+    hranilishche.podkliuchit(spisok, ReestrMagazinov())
+    return hranilishche, spisok
+
+
+def test_dni_povtorov_bez_sdviga():
+    nachalo = date(2024, 1, 31)
+    assert [den_povtora('mesiac', nachalo, k) for k in range(4)] == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+    for pravilo in ('den', 'nedelia', 'mesiac'):
+        for k in range(0, 60, 7):
+            for sdvig in range(-3, 3):
+                den = den_povtora(pravilo, nachalo, k) + timedelta(days=sdvig)
+                n = nomer_povtora(pravilo, nachalo, den)
+                assert den_povtora(pravilo, nachalo, n) >= den
+                assert n == 0 or den_povtora(pravilo, nachalo, n - 1) < den
+
+
+def test_otrezki_otmetok():
+    povtory = Povtory()
+    for k in list(range(3650)) + [4000, 4001]:
+        povtory.otmetit(k)
+    assert povtory.sostoianie() == [0, 0, 3650, 4000, 4002]
+    assert len(povtory) == 3652
+    assert povtory.vypolnen(3649) and not povtory.vypolnen(3650) and povtory.vypolnen(4001)
+    assert povtory.sniat() == 4001
+    assert povtory.sostoianie() == [0, 0, 3650, 4000, 4001]
+
+
+def test_otmechaetsia_segodniashnii_povtor():
+    zadacha = Zadacha("Пары", "Каждый день")
+    zadacha.vremia_sozdania = time.time() - 10 * DEN
+    spisok = SpisokZadach()
+    spisok.dobavit(zadacha)
+    assert len(spisok.prosrocheny()) == 1
+    
+    spisok.otmetit(zadacha)
+    segodnia = date.today()
+    vypolnennye = [den for _, den, vypolnen in zadacha.povtory_v_okne(segodnia - timedelta(days=20),
+                                                                      segodnia + timedelta(days=2))
+                   if vypolnen]
+    assert vypolnennye == [segodnia]
+    assert zadacha.srok_do > time.time() + DEN / 2
+    assert not spisok.prosrocheny()
+
+
+def test_otmena_otmetki_vozvrashchaet_sostoianie():
+    zadacha = Zadacha("Пары", "Каждый день")
+    zadacha.vremia_sozdania = time.time() - 5 * DEN
+    spisok = SpisokZadach()
+    zhurnal = ZhurnalIzmenenii()
+    zhurnal.dobavit_zadachu(spisok, zadacha)
+    zhurnal.otmetit_zadachu(spisok, zadacha)
+    zhurnal.otmetit_zadachu(spisok, zadacha)
+    posle = zadacha.povtory.sostoianie()
+    
+    zhurnal.otmenit()
+    zhurnal.otmenit()
+    assert zadacha.povtory.sostoianie() == [0]
+    assert len(spisok.prosrocheny()) == 1
+    zhurnal.povtorit()
+    zhurnal.povtorit()
+    assert zadacha.povtory.sostoianie() == posle
+
+
+def test_otmena_udaleniia_sohraniaetsia(tmp_path):
+    hranilishche, spisok = sozdat_hranilishche(tmp_path)
+    zhurnal = ZhurnalIzmenenii()
+    ezhednevnaia = zhurnal.dobavit_zadachu(spisok, Zadacha("Пары", "Каждый день"))
+    razovaia = zhurnal.dobavit_zadachu(spisok, Zadacha("Купить хлеб", "Сегодня"))
+    zhurnal.otmetit_zadachu(spisok, ezhednevnaia)
+    zhurnal.otmetit_zadachu(spisok, razovaia)
+    zhurnal.udalit_zadachu(spisok, ezhednevnaia)
+    zhurnal.udalit_zadachu(spisok, razovaia)
+    zhurnal.otmenit()
+    zhurnal.otmenit()
+    ozhidaetsia = sostoianie(spisok)
+    assert ezhednevnaia.povtory.sostoianie() == [ezhednevnaia.povtory.tekushchii, 0, 1]
+    hranilishche.zakryt()
+    
+    zagruzhennyi, _ = Hranilishche(str(tmp_path)).zagruzit()
+    assert sostoianie(zagruzhennyi) == ozhidaetsia
+    assert zagruzhennyi.vypolneno == 1
+
+
+def test_povtory_v_snimke(tmp_path):
+    hranilishche, spisok = sozdat_hranilishche(tmp_path, kompaktirovat_posle=3)
+    zadacha = spisok.dobavit(Zadacha("Отчёт", "Каждую неделю"))
+    for _ in range(4):
+        spisok.otmetit(zadacha)
+    ozhidaetsia = sostoianie(spisok)
+    hranilishche.zakryt()
+    
+    zagruzhennyi, _ = Hranilishche(str(tmp_path)).zagruzit()
+    assert sostoianie(zagruzhennyi) == ozhidaetsia
+    assert sorted(zagruzhennyi.indeks_srokov().items()) == sorted(spisok.indeks_srokov().items())
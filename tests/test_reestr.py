@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Реестр магазинов: поиск по номеру и названию после любых изменений
+"""
+
+import pytest
+
+from todoshop import Magazin, ReestrMagazinov
+
+
+def sozdat_reestr(*nazvaniia):
+    return ReestrMagazinov(Magazin(nazvanie, "", "") for nazvanie in nazvaniia)
+
+
+def test_odnoimennye_magaziny():
+    reestr = sozdat_reestr("Угол", "Лавка", "Угол")
+    ugol, lavka, vtoroi = reestr
+    assert [m.nomer for m in reestr] == [1, 2, 3]
+    assert reestr.po_nomeru[3] is vtoroi
+    assert reestr.naiti("Угол") is ugol and reestr.naiti("Киоск") is None
+    assert reestr.metka(ugol) == "Угол (№1)" and reestr.metka(lavka) == "Лавка"
+    
+    # Единственный оставшийся магазин с названием снова подписан без номера
+    reestr.udalit(ugol)
+    assert reestr.naiti("Угол") is vtoroi and reestr.metka(vtoroi) == "Угол"
+    assert 1 not in reestr.po_nomeru and len(reestr) == 2
+
+
+def test_pereimenovanie():
+    reestr = sozdat_reestr("Угол", "Лавка")
+    ugol, lavka = reestr
+    sobytiia = []
+    reestr.podpisat(lambda sobytie, magazin: sobytiia.append((sobytie, magazin.nomer)))
+    reestr.pereimenovat(ugol, "Лавка")
+    assert reestr.naiti("Угол") is None and "Угол" not in reestr.po_nazvaniiu
+    assert reestr.po_nazvaniiu["Лавка"] == {1: ugol, 2: lavka}
+    assert reestr.metka(ugol) == "Лавка (№1)"
+    reestr.pereimenovat(lavka, "Киоск")
+    assert reestr.naiti("Лавка") is ugol and reestr.naiti("Киоск") is lavka
+    assert sobytiia == [('pereimenovan', 1), ('pereimenovan', 2)]
+
+
+def test_nomera_ne_povtoriaiutsia():
+    reestr = sozdat_reestr("Угол", "Лавка")
+    reestr.udalit(reestr.po_nomeru[2])
+    assert reestr.dobavit(Magazin("Киоск", "", "")).nomer == 3
+    
+    # Сохранённый номер восстанавливается как есть, занятый - ошибка
+    assert reestr.dobavit(Magazin("Лавка", "", ""), nomer=10).nomer == 10
+    assert reestr.dobavit(Magazin("Ларёк", "", "")).nomer == 11
+    with pytest.raises(ValueError):
+        reestr.dobavit(Magazin("Дубль", "", ""), nomer=3)
+    assert reestr.naiti("Дубль") is None and len(reestr) == 4
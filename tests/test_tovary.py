@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Колонки товаров: словарный интерфейс, порядок и сохранение
+"""
+
+import pytest
+
+from todoshop import Hranilishche, KolonochnyeTovary, Magazin, ReestrMagazinov, SpisokZadach
+
+
+def tovary_magazina(magazin):
+    return list(magazin.tovary.items())
+
+
+def test_kak_slovar():
+    kolonki, slovar = KolonochnyeTovary(), {}
+    for i in range(300):
+        info = {'cena': i / 4, 'kolichestvo': i % 7, 'data_dobavlenia': '01.02.2024'}
+        kolonki[f"т{i}"] = slovar[f"т{i}"] = info
+    for i in range(0, 300, 3):
+        del kolonki[f"т{i}"], slovar[f"т{i}"]
+    kolonki["т1"] = slovar["т1"] = {'cena': 9.5, 'kolichestvo': 2, 'data_dobavlenia': '03.02.2024'}
+    kolonki["т0"] = slovar["т0"] = {'cena': 1.0, 'kolichestvo': 1, 'data_dobavlenia': '03.02.2024'}
+    
+    assert list(kolonki.items()) == list(slovar.items())
+    assert len(kolonki) == len(slovar) and "т3" not in kolonki and "т4" in kolonki
+    with pytest.raises(KeyError):
+        del kolonki["т3"]
+
+
+def test_poriadok_posle_udaleniia():
+    kolonki = KolonochnyeTovary()
+    for tovar in "абвгд":
+        kolonki.zapisat(tovar, 1.0, 1, 0)
+    del kolonki["б"]
+    assert list(kolonki) == list("авгд")
+    assert kolonki.stroka("д") == 1
+
+
+def test_sohranenie(tmp_path):
+    hranilishche = Hranilishche(str(tmp_path), kompaktirovat_posle=50)
+    reestr = ReestrMagazinov()
+    hranilishche.podkliuchit(SpisokZadach(), reestr)
+    magazin = reestr.dobavit(Magazin("Угол", "ул. Мира, 1", "Продукты"))
+    for i in range(120):
+        magazin.dobavit_tovar(f"Товар {i}", i * 1.1, i % 5, "05.03.2024")
+    for i in range(0, 120, 4):
+        magazin.udalit_tovar(f"Товар {i}")
+    magazin.obnovit_cenu("Товар 1", 0.1)
+    ozhidaetsia = tovary_magazina(magazin)
+    hranilishche.zakryt()
+    
+    _, zagruzhennyi = Hranilishche(str(tmp_path)).zagruzit()
+    kopiia = next(iter(zagruzhennyi))
+    assert sorted(tovary_magazina(kopiia)) == sorted(ozhidaetsia)
+    assert kopiia.stoimost == magazin.stoimost
+
+
+def test_svedeniia_tolko_dlia_chteniia():
+    # Сведения собираются из колонок: правка на месте не должна теряться молча
+    magazin = Magazin("Угол", "ул. Мира, 1", "Продукты")
+    magazin.dobavit_tovar("Хлеб", 45.5, 3, "05.03.2024")
+    with pytest.raises(TypeError):
+        magazin.tovary["Хлеб"]['cena'] = 1.0
+    for _, info in magazin.tovary.items():
+        with pytest.raises(TypeError):
+            info['kolichestvo'] = 0
+    assert magazin.tovary["Хлеб"] == {'cena': 45.5, 'kolichestvo': 3, 'data_dobavlenia': "05.03.2024"}
+    
+    # Запись целиком и dict() от сведений по-прежнему работают
+    magazin.tovary["Хлеб"] = dict(magazin.tovary["Хлеб"], cena=50.0)
+    assert magazin.tovary["Хлеб"]['cena'] == 50.0
+
+
+def test_items_i_values_kak_u_dict():
+    kolonki, slovar = KolonochnyeTovary(), {}
+    for i in range(5):
+        kolonki[f"т{i}"] = slovar[f"т{i}"] = {'cena': i + 0.5, 'kolichestvo': i,
+                                             'data_dobavlenia': '01.02.2024'}
+    for kolonki_vid, slovar_vid in ((kolonki.items(), slovar.items()),
+                                    (kolonki.values(), slovar.values())):
+        assert len(kolonki_vid) == len(slovar_vid) == 5
+        assert list(kolonki_vid) == list(kolonki_vid) == list(slovar_vid)
+    assert ("т2", slovar["т2"]) in kolonki.items()
+    
+    # Представление живое: видит изменения после создания
+    vid = kolonki.items()
+    del kolonki["т0"]
+    assert len(vid) == 4 and [tovar for tovar, _ in vid] == ["т1", "т2", "т3", "т4"]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Список задач: счётчики сроков сходятся со списками задач
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+from todoshop import SpisokZadach, Zadacha
+
+DEN = 86400
+
+
+def test_schetchiki_srokov():
+    sluchai = random.Random(7)
+    segodnia = date.today()
+    spisok = SpisokZadach()
+    for i in range(200):
+        srok = sluchai.choice([f"{segodnia + timedelta(days=sluchai.randrange(-3, 4)):%d.%m.%Y}",
+                               "Сегодня", "Завтра", "Каждый день", ""])
+        zadacha = Zadacha(f"Задача {i}", srok)
+        zadacha.vremia_sozdania = time.time() - sluchai.randrange(4) * DEN
+        spisok.dobavit(zadacha)
+    
+    for shag in range(300):
+        otkrytye = list(spisok.zadachi)
+        deistvie = sluchai.randrange(3)
+        if deistvie == 0 and otkrytye:
+            spisok.otmetit(sluchai.choice(otkrytye))
+        elif deistvie == 1 and otkrytye:
+            spisok.udalit(sluchai.choice(otkrytye))
+        elif spisok.vypolneno:
+            spisok.sniat_otmetku(spisok.stranica_arhiva(0, 1)[0][0])
+        seichas = time.time() + sluchai.choice([0, DEN, 2 * DEN])
+        assert spisok.chislo_prosrochennyh(seichas) == len(spisok.prosrocheny(seichas))
+        assert spisok.chislo_na_segodnia(seichas) == len(spisok.na_segodnia(seichas))
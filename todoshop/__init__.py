@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+TodoShop - менеджер задач и магазинов
+
+Пакет без графического интерфейса: задачи, магазины, поиск,
+хранилища и импорт/экспорт работают без tkinter и без дисплея.
+Окно находится в todoshop.gui и загружается только при обращении
+к todoshop.GlavnoeOkno; пул фоновых заданий окна - в todoshop.fon,
+напоминания о сроках по таймеру окна - в todoshop.napominaniia.
+"""
+
+from .sobytiia import Nabliudaemyi
+from .zadachi import StatusZadachi, Zadacha, SpisokZadach
+from .arhiv import ArhivZadach
+from .tovary import KolonochnyeTovary
+from .magaziny import Magazin, ReestrMagazinov
+from .poisk import IndeksTovarov
+from .hranilishche import PAPKA_DANNYH, Hranilishche
+from .otmena import ZhurnalIzmenenii
+from .baza import SqliteTovary, SqliteBaza
+from .obmen import (KOLONKI_TOVAROV, KOLONKI_ZADACH, chitat_tovary, chitat_zadachi,
+                    chitat_prais, importirovat_tovary, importirovat_zadachi,
+                    eksportirovat_tovary, eksportirovat_zadachi)
+
+
+def __getattr__(imia):
+    # Окно подгружаем только по требованию: import todoshop не тянет tkinter
+    if imia == 'GlavnoeOkno':
+        from .gui import GlavnoeOkno
+        return GlavnoeOkno
+    raise AttributeError(f"module {__name__!r} has no attribute {imia!r}")
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Запуск командной строки: python -m todoshop
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
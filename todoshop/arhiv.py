@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Архив выполненных задач
+"""
+
+from array import array
+from bisect import bisect_right
+
+# ============================================
+# АРХИВ ВЫПОЛНЕННЫХ ЗАДАЧ
+# ============================================
+
+class ArhivZadach:
+    """Выполненные задачи, упакованные в колонки
+    
+    Выполненная задача уходит из рабочего списка сюда: вместо объекта
+    Zadacha с двумя числами-моментами - строка в массивах номеров,
+    моментов создания и выполнения ('q', секунды от 01.01.1970)
+    и номеров сроков ('i'; одинаковые строки сроков хранятся один раз).
+    Строки идут в порядке выполнения, номер строки задачи - в словаре
+    stroki. Задачи отдаются кортежами (номер, описание, срок, создана,
+    выполнена), как в снимке хранилища.
+    
+    Извлечённая из середины задача оставляет пустую строку (описание
+    None): массивы не сдвигаются, а когда пустых строк становится
+    больше, чем задач, архив уплотняется за один проход. Задача,
+    вернувшаяся с тем же моментом выполнения (отмена удаления),
+    занимает свою прежнюю строку, остальные встают на место по моменту.
+    """
+    def __init__(self):
+        self.nomera = array('q')
+        self.opisaniia = []
+        self.sroki = array('i')
+        self.sozdany = array('q')
+        self.vypolneny = array('q')
+        self.vse_sroki = []         # номер срока -> строка
+        self.nomer_sroka = {}       # строка -> номер срока
+        self.stroki = {}            # номер задачи -> номер строки
+        self.pustye = {}            # номер извлечённой задачи -> её пустая строка
+    
+    def dobavit(self, nomer, opisanie, srok, sozdana, vypolnena):
+        """Записать выполненную задачу на место по моменту выполнения"""
+        nomer_sroka = self.nomer_sroka.get(srok)
+        if nomer_sroka is None:
+            nomer_sroka = self.nomer_sroka[srok] = len(self.vse_sroki)
+            self.vse_sroki.append(srok)
+        j = self.pustye.pop(nomer, None)
+        if j is not None and self.vypolneny[j] == vypolnena:
+            # Прежняя строка задачи: порядок восстанавливается как был
+            self.opisaniia[j] = opisanie
+            self.sroki[j] = nomer_sroka
+            self.sozdany[j] = sozdana
+            self.stroki[nomer] = j
+            return
+        
+        vypolneny = self.vypolneny
+        i = bisect_right(vypolneny, vypolnena)
+        self.nomera.insert(i, nomer)
+        self.opisaniia.insert(i, opisanie)
+        self.sroki.insert(i, nomer_sroka)
+        self.sozdany.insert(i, sozdana)
+        vypolneny.insert(i, vypolnena)
+        self.stroki[nomer] = i
+        # Обычно задача выполнена последней и строк после неё нет
+        for k in range(i + 1, len(self.nomera)):
+            if self.opisaniia[k] is not None:
+                self.stroki[self.nomera[k]] = k
+    
+    def stroka(self, i):
+        """Задача в строке i: (номер, описание, срок, создана, выполнена)"""
+        return (self.nomera[i], self.opisaniia[i], self.vse_sroki[self.sroki[i]],
+                self.sozdany[i], self.vypolneny[i])
+    
+    def naiti(self, nomer):
+        """Строка задачи с номером nomer (-1, если её нет)"""
+        return self.stroki.get(nomer, -1)
+    
+    def izvlech(self, nomer):
+        """Убрать задачу из архива и вернуть её кортеж (None, если её нет)"""
+        i = self.stroki.pop(nomer, None)
+        if i is None:
+            return None
+        zadacha = self.stroka(i)
+        self.opisaniia[i] = None
+        self.pustye[nomer] = i
+        # Пустые строки в конце (отменили последнюю отметку) просто отрезаются
+        while self.opisaniia and self.opisaniia[-1] is None:
+            poslednii = self.nomera.pop()
+            if self.pustye.get(poslednii) == len(self.nomera):
+                del self.pustye[poslednii]
+            for kolonka in (self.opisaniia, self.sroki, self.sozdany, self.vypolneny):
+                kolonka.pop()
+        if len(self.pustye) > len(self.stroki):
+            self.uplotnit()
+        return zadacha
+    
+    def uplotnit(self):
+        """Убрать пустые строки и заново пронумеровать задачи"""
+        zhivye = [i for i, opisanie in enumerate(self.opisaniia) if opisanie is not None]
+        self.nomera = array('q', map(self.nomera.__getitem__, zhivye))
+        self.opisaniia = [self.opisaniia[i] for i in zhivye]
+        self.sroki = array('i', map(self.sroki.__getitem__, zhivye))
+        self.sozdany = array('q', map(self.sozdany.__getitem__, zhivye))
+        self.vypolneny = array('q', map(self.vypolneny.__getitem__, zhivye))
+        self.stroki = {nomer: i for i, nomer in enumerate(self.nomera)}
+        self.pustye = {}
+    
+    def stranica(self, nachalo, skolko):
+        """skolko задач от недавно выполненных, пропустив nachalo последних строк
+        
+        Возвращает (задачи, откуда продолжить; None - дальше задач нет),
+        как poisk: пустые строки пропускаются, поэтому страницы
+        считаются по строкам, а не по задачам.
+        """
+        return self.poisk(None, nachalo, skolko)
+    
+    def poisk(self, tekst, nachalo=0, skolko=50):
+        """Задачи, в описании или сроке которых есть tekst (без учёта регистра)
+        
+        Просмотр идёт от недавно выполненных, пропустив первые nachalo
+        строк, и останавливается на skolko найденных. Возвращает
+        (найденные, откуда продолжить; None - архив просмотрен до конца).
+        tekst=None - подходит любая задача.
+        """
+        if tekst is not None:
+            tekst = tekst.casefold()
+        opisaniia, sroki, vse_sroki = self.opisaniia, self.sroki, self.vse_sroki
+        naideno = []
+        i = len(opisaniia) - nachalo - 1
+        while i >= 0 and len(naideno) < skolko:
+            opisanie = opisaniia[i]
+            if opisanie is not None and (tekst is None or tekst in opisanie.casefold()
+                                         or tekst in vse_sroki[sroki[i]].casefold()):
+                naideno.append(self.stroka(i))
+            i -= 1
+        while i >= 0 and opisaniia[i] is None:
+            i -= 1
+        return naideno, (len(opisaniia) - i - 1 if i >= 0 else None)
+    
+    def __len__(self):
+        return len(self.stroki)
+    
+    def __iter__(self):
+        """Задачи в порядке выполнения"""
+        opisaniia = self.opisaniia
+        return (self.stroka(i) for i in range(len(opisaniia)) if opisaniia[i] is not None)
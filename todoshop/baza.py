@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Хранение магазинов и товаров в SQLite
+"""
+
+from datetime import datetime
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from contextlib import contextmanager
+from types import MappingProxyType
+import sqlite3
+
+from .magaziny import Magazin
+
+# ============================================
+# ХРАНЕНИЕ В SQLITE
+# ============================================
+
+class SqliteTovary(MutableMapping):
+    """Товары одного магазина в таблице SQLite
+    
+    Ведёт себя как словарь {название: {'cena', 'kolichestvo',
+    'data_dobavlenia'}}, поэтому подставляется в Magazin вместо tovary.
+    Сведения читаются из таблицы и, как у KolonochnyeTovary, отдаются
+    только для чтения.
+    """
+    def __init__(self, baza, magazin_id):
+        self.baza = baza
+        self.magazin_id = magazin_id
+    
+    def __getitem__(self, tovar):
+        stroka = self.baza.soedinenie.execute(
+            'SELECT cena, kolichestvo, data_dobavlenia FROM tovary '
+            'WHERE magazin_id = ? AND nazvanie = ?', (self.magazin_id, tovar)).fetchone()
+        if stroka is None:
+            raise KeyError(tovar)
+        return MappingProxyType({'cena': stroka[0], 'kolichestvo': stroka[1],
+                                 'data_dobavlenia': stroka[2]})
+    
+    def __setitem__(self, tovar, info):
+        self.baza.soedinenie.execute(
+            'INSERT OR REPLACE INTO tovary VALUES (?, ?, ?, ?, ?)',
+            (self.magazin_id, tovar, info['cena'], info['kolichestvo'], info['data_dobavlenia']))
+    
+    def __delitem__(self, tovar):
+        kursor = self.baza.soedinenie.execute(
+            'DELETE FROM tovary WHERE magazin_id = ? AND nazvanie = ?', (self.magazin_id, tovar))
+        if kursor.rowcount == 0:
+            raise KeyError(tovar)
+    
+    def __contains__(self, tovar):
+        return self.baza.soedinenie.execute(
+            'SELECT 1 FROM tovary WHERE magazin_id = ? AND nazvanie = ?',
+            (self.magazin_id, tovar)).fetchone() is not None
+    
+    def __len__(self):
+        return self.baza.soedinenie.execute(
+            'SELECT COUNT(*) FROM tovary WHERE magazin_id = ?', (self.magazin_id,)).fetchone()[0]
+    
+    def __iter__(self):
+        for (tovar,) in self.baza.soedinenie.execute(
+                'SELECT nazvanie FROM tovary WHERE magazin_id = ?', (self.magazin_id,)):
+            yield tovar
+    
+    def items(self):
+        """Все товары; обход - одним запросом"""
+        return SqliteStroki(self)
+    
+    def values(self):
+        """Сведения обо всех товарах; обход - одним запросом"""
+        return SqliteSvedeniia(self)
+    
+    def zapisat_mnogo(self, stroki):
+        """Записать товары (название, цена, количество, дата) одной транзакцией
+        
+        Magazin.zagruzit_tovary зовёт это вместо записи по строке. Если
+        источник оборвался ошибкой, записанное до неё остаётся (как
+        у KolonochnyeTovary), а ошибка передаётся дальше.
+        Возвращает число записанных строк.
+        """
+        chislo = 0
+        oshibka = None
+        
+        def zapisi():
+            nonlocal chislo, oshibka
+            try:
+                for tovar, cena, kolichestvo, data in stroki:
+                    yield self.magazin_id, tovar, cena, kolichestvo, data
+                    chislo += 1
+            except Exception as e:
+                oshibka = e
+        
+        with self.baza.partiia():
+            self.baza.soedinenie.executemany('INSERT OR REPLACE INTO tovary VALUES (?, ?, ?, ?, ?)',
+                                             zapisi())
+        if oshibka is not None:
+            raise oshibka
+        return chislo
+    
+    def obnovit_pole(self, znacheniia, pole):
+        """Записать товарам новые значения поля ('cena' или 'kolichestvo') одной транзакцией
+        
+        znacheniia - словарь {товар: значение}. Magazin.izmenit_pole
+        зовёт это вместо записи товаров по одному: прайс-лист на тысячи
+        позиций - одно executemany и одна фиксация, а не тысяча.
+        """
+        if pole not in ('cena', 'kolichestvo'):
+            raise ValueError(f"Неизвестное поле товара: {pole}")
+        with self.baza.partiia():
+            self.baza.soedinenie.executemany(
+                f'UPDATE tovary SET {pole} = ? WHERE magazin_id = ? AND nazvanie = ?',
+                ((znachenie, self.magazin_id, tovar) for tovar, znachenie in znacheniia.items()))
+
+
+class SqliteStroki(ItemsView):
+    """items() таблицы товаров: как у dict, обход одним SELECT"""
+    __slots__ = ()
+    
+    def __iter__(self):
+        tovary = self._mapping
+        for tovar, cena, kolichestvo, data in tovary.baza.soedinenie.execute(
+                'SELECT nazvanie, cena, kolichestvo, data_dobavlenia FROM tovary '
+                'WHERE magazin_id = ?', (tovary.magazin_id,)):
+            yield tovar, MappingProxyType({'cena': cena, 'kolichestvo': kolichestvo,
+                                           'data_dobavlenia': data})
+
+
+class SqliteSvedeniia(ValuesView):
+    """values() таблицы товаров, обход одним SELECT"""
+    __slots__ = ()
+    
+    def __iter__(self):
+        for _, info in SqliteStroki(self._mapping):
+            yield info
+
+
+class SqliteBaza:
+    """Магазины и товары в базе SQLite (режим WAL)
+    
+    Каждое изменение вне partiia() фиксируется сразу. Внутри
+    "with baza.partiia():" все изменения идут одной транзакцией.
+    
+    Номер магазина в реестре - его id в базе. После podkliuchit(reestr)
+    база сама записывает добавление, переименование и удаление
+    магазинов; товары пишет SqliteTovary.
+    """
+    SHEMA = """
+        CREATE TABLE IF NOT EXISTS magaziny (
+            id INTEGER PRIMARY KEY,
+            nazvanie TEXT NOT NULL,
+            adres TEXT NOT NULL,
+            tip TEXT NOT NULL,
+            data_sozdania TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_magaziny_nazvanie ON magaziny (nazvanie);
+        
+        CREATE TABLE IF NOT EXISTS tovary (
+            magazin_id INTEGER NOT NULL REFERENCES magaziny (id),
+            nazvanie TEXT NOT NULL,
+            cena REAL NOT NULL,
+            kolichestvo INTEGER NOT NULL,
+            data_dobavlenia TEXT NOT NULL,
+            PRIMARY KEY (magazin_id, nazvanie)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_tovary_nazvanie ON tovary (nazvanie);
+    """
+    
+    def __init__(self, put):
+        # isolation_level=None: транзакциями управляем сами через partiia().
+        # Окно загружает данные в пуле, а меняет в потоке Tk - по очереди,
+        # поэтому соединение не привязано к потоку
+        self.soedinenie = sqlite3.connect(put, isolation_level=None, check_same_thread=False)
+        self.soedinenie.execute('PRAGMA journal_mode = WAL')
+        self.soedinenie.execute('PRAGMA synchronous = NORMAL')
+        self.soedinenie.executescript(self.SHEMA)
+        self.glubina_partii = 0
+    
+    @contextmanager
+    def partiia(self):
+        """Выполнить группу изменений одной транзакцией (можно вкладывать)"""
+        if self.glubina_partii == 0:
+            self.soedinenie.execute('BEGIN')
+        self.glubina_partii += 1
+        try:
+            yield self
+        except BaseException:
+            self.glubina_partii -= 1
+            if self.glubina_partii == 0:
+                self.soedinenie.execute('ROLLBACK')
+            raise
+        self.glubina_partii -= 1
+        if self.glubina_partii == 0:
+            self.soedinenie.execute('COMMIT')
+    
+    def sozdat_magazin(self, nazvanie, adres, tip):
+        """Создать магазин, товары которого хранятся в базе"""
+        data = datetime.now().strftime("%d.%m.%Y")
+        kursor = self.soedinenie.execute(
+            'INSERT INTO magaziny (nazvanie, adres, tip, data_sozdania) VALUES (?, ?, ?, ?)',
+            (nazvanie, adres, tip, data))
+        magazin = Magazin(nazvanie, adres, tip, SqliteTovary(self, kursor.lastrowid))
+        magazin.nomer = kursor.lastrowid
+        magazin.data_sozdania = data
+        return magazin
+    
+    def zagruzit_magaziny(self, nazvanie=None):
+        """Все магазины из базы (или только с данным названием)"""
+        zapros = 'SELECT id, nazvanie, adres, tip, data_sozdania FROM magaziny'
+        parametry = ()
+        if nazvanie is not None:
+            zapros += ' WHERE nazvanie = ?'
+            parametry = (nazvanie,)
+        magaziny = []
+        for magazin_id, nazv, adres, tip, data in self.soedinenie.execute(zapros + ' ORDER BY id',
+                                                                          parametry):
+            magazin = Magazin(nazv, adres, tip, SqliteTovary(self, magazin_id))
+            magazin.nomer = magazin_id
+            magazin.data_sozdania = data
+            magaziny.append(magazin)
+        return magaziny
+    
+    def podkliuchit(self, reestr):
+        """Хранить в базе магазины реестра и дальше следить за его изменениями
+        
+        Магазины, товары которых ещё в памяти (демонстрационные или
+        из прежнего снимка), переносятся в базу. Возвращает число
+        перенесённых магазинов.
+        """
+        pereneseno = sum(self.perenesti(magazin) for magazin in reestr)
+        reestr.podpisat(self.pri_izmenenii_reestra)
+        return pereneseno
+    
+    def perenesti(self, magazin):
+        """Записать магазин с товарами в базу под его номером (False, если он уже там)"""
+        tovary = magazin.tovary
+        if isinstance(tovary, SqliteTovary) and tovary.baza is self:
+            return False
+        with self.partiia():
+            self.soedinenie.execute(
+                'INSERT INTO magaziny (id, nazvanie, adres, tip, data_sozdania) VALUES (?, ?, ?, ?, ?)',
+                (magazin.nomer, magazin.nazvanie, magazin.adres, magazin.tip, magazin.data_sozdania))
+            self.soedinenie.executemany(
+                'INSERT OR REPLACE INTO tovary VALUES (?, ?, ?, ?, ?)',
+                ((magazin.nomer, tovar, info['cena'], info['kolichestvo'], info['data_dobavlenia'])
+                 for tovar, info in tovary.items()))
+        # Итоги и индексы магазина остаются верными: товары те же
+        magazin.tovary = SqliteTovary(self, magazin.nomer)
+        return True
+    
+    def pri_izmenenii_reestra(self, sobytie, magazin):
+        """Записать добавление, удаление или переименование магазина"""
+        if sobytie == 'dobavlen':
+            self.perenesti(magazin)
+        elif sobytie == 'udalen':
+            with self.partiia():
+                self.soedinenie.execute('DELETE FROM tovary WHERE magazin_id = ?', (magazin.nomer,))
+                self.soedinenie.execute('DELETE FROM magaziny WHERE id = ?', (magazin.nomer,))
+        elif sobytie == 'pereimenovan':
+            self.soedinenie.execute('UPDATE magaziny SET nazvanie = ? WHERE id = ?',
+                                    (magazin.nazvanie, magazin.nomer))
+    
+    def massovyi_import(self, magazin, tovary):
+        """Загрузить товары (название, цена, количество) одной транзакцией
+        
+        Тот же путь, что у импорта из файла (Magazin.zagruzit_tovary ->
+        SqliteTovary.zapisat_mnogo); подписчики получают 'zagruzheny'.
+        Возвращает число загруженных товаров.
+        """
+        data = datetime.now().strftime("%d.%m.%Y")
+        try:
+            return magazin.zagruzit_tovary((tovar, cena, kolichestvo, data)
+                                           for tovar, cena, kolichestvo in tovary)
+        finally:
+            magazin.soobshchit('zagruzheny', None)
+    
+    def zakryt(self):
+        """Закрыть соединение с базой"""
+        self.soedinenie.close()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Командная строка TodoShop для пакетной работы без окна
+
+    python -m todoshop magaziny
+    python -m todoshop import "ТехноМир" tovary.csv
+    python -m todoshop eksport "ТехноМир" tovary.jsonl
+    python -m todoshop prais "ТехноМир" ceny.csv
+    python -m todoshop nacenka "ТехноМир" 5
+    python -m todoshop import-zadach zadachi.csv
+    python -m todoshop eksport-zadach zadachi.csv
+    python -m todoshop okno [--bez-demo] [--profile-startup]
+
+Данные те же, что у окна (папка меняется ключом --papka; с ключом
+--baza FAIL магазины и товары хранятся в базе SQLite). Модуль
+не импортирует tkinter, пока не запрошено окно.
+"""
+
+import argparse
+import sys
+
+from .baza import SqliteBaza
+from .hranilishche import PAPKA_DANNYH, Hranilishche
+from .magaziny import Magazin
+from .metriki import vkliuchit, eksportirovat
+from .obmen import (chitat_prais, importirovat_tovary, importirovat_zadachi,
+                    eksportirovat_tovary, eksportirovat_zadachi)
+
+
+def sozdat_razbor():
+    """Описание команд и ключей"""
+    razbor = argparse.ArgumentParser(prog='todoshop',
+                                     description="Пакетные операции с задачами и магазинами TodoShop")
+    razbor.add_argument('--papka', default=PAPKA_DANNYH,
+                        help=f"папка с данными (по умолчанию {PAPKA_DANNYH})")
+    razbor.add_argument('--baza', metavar='FAIL',
+                        help="хранить магазины и товары в базе SQLite (задачи остаются в папке)")
+    razbor.add_argument('--metriki', metavar='FAIL',
+                        help="замерить операции и записать замеры в файл (формат Prometheus)")
+    razbor.add_argument('--openmetrics', action='store_true',
+                        help="записать замеры в формате OpenMetrics")
+    komandy = razbor.add_subparsers(dest='komanda', required=True, metavar='КОМАНДА')
+    
+    komandy.add_parser('magaziny', help="список магазинов с итогами")
+    
+    komanda = komandy.add_parser('import', help="загрузить товары из CSV/JSONL в магазин")
+    komanda.add_argument('magazin', help="название или номер магазина")
+    komanda.add_argument('fail')
+    komanda.add_argument('--sozdat', action='store_true', help="создать магазин, если его нет")
+    komanda.add_argument('--shema', action='store_true',
+                         help="файл выгружен командой eksport: значения не перепроверять")
+    
+    komanda = komandy.add_parser('eksport', help="выгрузить товары магазина в CSV/JSONL")
+    komanda.add_argument('magazin', help="название или номер магазина")
+    komanda.add_argument('fail')
+    
+    komanda = komandy.add_parser('prais', help="установить цены по прайс-листу (колонки tovar, cena)")
+    komanda.add_argument('magazin', help="название или номер магазина")
+    komanda.add_argument('fail')
+    
+    komanda = komandy.add_parser('nacenka', help="изменить все цены магазина на процент")
+    komanda.add_argument('magazin', help="название или номер магазина")
+    komanda.add_argument('procent', type=float)
+    
+    komanda = komandy.add_parser('import-zadach', help="добавить задачи из CSV/JSONL")
+    komanda.add_argument('fail')
+    
+    komanda = komandy.add_parser('eksport-zadach', help="выгрузить задачи в CSV/JSONL")
+    komanda.add_argument('fail')
+    
+    komandy.add_parser('okno', help="открыть окно программы (ключи окна, например "
+                                    "--profile-startup, передаются ему)")
+    return razbor
+
+
+def naiti_magazin(reestr, imia):
+    """Магазин по названию или номеру (ValueError, если нет)"""
+    magazin = reestr.naiti(imia)
+    if magazin is None and imia.isdigit():
+        magazin = reestr.po_nomeru.get(int(imia))
+    if magazin is None:
+        raise ValueError(f"Нет магазина '{imia}'")
+    return magazin
+
+
+def pechatat_progress(gotovo, vsego):
+    """Показывать ход в терминале (если вывод ошибок - терминал)"""
+    if sys.stderr.isatty():
+        print(f"\r{gotovo / vsego if vsego else 1:.0%}", end='', file=sys.stderr, flush=True)
+
+
+def vypolnit(argumenty, spisok_zadach, reestr):
+    """Выполнить команду над загруженными данными"""
+    komanda = argumenty.komanda
+    if komanda == 'magaziny':
+        for magazin in reestr:
+            print(f"{magazin.nomer}\t{magazin.nazvanie}\t{magazin.chislo_tovarov}\t"
+                  f"{magazin.obshchaia_stoimost():.2f}")
+    elif komanda == 'import':
+        try:
+            magazin = naiti_magazin(reestr, argumenty.magazin)
+        except ValueError:
+            if not argumenty.sozdat:
+                raise
+            magazin = reestr.dobavit(Magazin(argumenty.magazin, "", ""))
+        chislo = importirovat_tovary(magazin, argumenty.fail, shema_izvestna=argumenty.shema,
+                                     progress=pechatat_progress)
+        print(f"Загружено товаров: {chislo}")
+    elif komanda == 'eksport':
+        chislo = eksportirovat_tovary(naiti_magazin(reestr, argumenty.magazin), argumenty.fail,
+                                      progress=pechatat_progress)
+        print(f"Выгружено товаров: {chislo}")
+    elif komanda == 'prais':
+        magazin = naiti_magazin(reestr, argumenty.magazin)
+        chislo = magazin.primenit_prais(chitat_prais(argumenty.fail, progress=pechatat_progress))
+        print(f"Изменено цен: {chislo}")
+    elif komanda == 'nacenka':
+        chislo = naiti_magazin(reestr, argumenty.magazin).nacenka(argumenty.procent)
+        print(f"Изменено цен: {chislo}")
+    elif komanda == 'import-zadach':
+        chislo = importirovat_zadachi(spisok_zadach, argumenty.fail, progress=pechatat_progress)
+        print(f"Добавлено задач: {chislo}")
+    elif komanda == 'eksport-zadach':
+        chislo = eksportirovat_zadachi(spisok_zadach, argumenty.fail, progress=pechatat_progress)
+        print(f"Выгружено задач: {chislo}")
+
+
+def main(argv=None):
+    """Точка входа командной строки; возвращает код завершения"""
+    argumenty, ostatok = sozdat_razbor().parse_known_args(argv)
+    if argumenty.komanda == 'okno':
+        from .gui import main as zapustit_okno
+        if argumenty.metriki:
+            ostatok += ['--metriki', argumenty.metriki] + ['--openmetrics'] * argumenty.openmetrics
+        if argumenty.baza:
+            ostatok += ['--baza', argumenty.baza]
+        return zapustit_okno(['--papka', argumenty.papka] + ostatok)
+    if ostatok:
+        sozdat_razbor().error(f"неизвестные параметры: {' '.join(ostatok)}")
+    
+    metriki = vkliuchit() if argumenty.metriki else None
+    baza = SqliteBaza(argumenty.baza) if argumenty.baza else None
+    hranilishche = Hranilishche(argumenty.papka, baza=baza)
+    try:
+        spisok_zadach, reestr = hranilishche.zagruzit()
+        hranilishche.podkliuchit(spisok_zadach, reestr)
+        vypolnit(argumenty, spisok_zadach, reestr)
+    except (OSError, ValueError) as oshibka:
+        print(f"Ошибка: {oshibka}", file=sys.stderr)
+        return 1
+    finally:
+        hranilishche.zakryt()
+        if baza is not None:
+            baza.zakryt()
+        if metriki is not None:
+            eksportirovat(metriki, argumenty.metriki, argumenty.openmetrics)
+    return 0
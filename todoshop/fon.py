@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Фоновые задания: пул потоков с выдачей результатов в поток окна
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import queue
+
+# ============================================
+# ФОНОВЫЕ ЗАДАНИЯ
+# ============================================
+
+class ZadanieOtmeneno(Exception):
+    """Фоновое задание отменено"""
+
+
+class FonovoeZadanie:
+    """Одно задание пула: ключ, отмена и ход выполнения
+    
+    Работа узнаёт об отмене через otmeneno или автоматически:
+    otmetit_hod (его удобно передавать как progress) после отмены
+    бросает ZadanieOtmeneno.
+    """
+    def __init__(self, kluch, opisanie, gotovo, oshibka):
+        self.kluch = kluch
+        self.opisanie = opisanie
+        self.gotovo = gotovo
+        self.oshibka = oshibka
+        self.otmeneno = False
+        self.progress = None
+        self.budushchee = None
+    
+    def otmenit(self):
+        """Отменить задание (ещё не начатое не начнётся вовсе)"""
+        self.otmeneno = True
+        if self.budushchee is not None:
+            self.budushchee.cancel()
+    
+    def otmetit_hod(self, gotovo, vsego):
+        """Запомнить долю выполненного (вызывается из потока пула)"""
+        if self.otmeneno:
+            raise ZadanieOtmeneno(self.opisanie)
+        self.progress = gotovo / vsego if vsego else 1.0
+
+
+class FonovyeZadaniia:
+    """Пул потоков для долгих операций окна
+    
+    zapustit() отдаёт работу пулу и сразу возвращается. Результат
+    кладётся в очередь, а окно забирает его по таймеру root.after и
+    вызывает gotovo(результат) уже в потоке Tk - только там можно
+    трогать виджеты и менять данные. Новое задание с ключом
+    незавершённого заменяет его: старое отменяется, его результат
+    отбрасывается, поэтому частые одинаковые обновления сливаются
+    в одно. Пока идут задания с описанием, на каждом шаге таймера
+    вызывается pokazat_hod(список таких заданий), после них -
+    pokazat_hod([]).
+    """
+    INTERVAL = 30       # мс между проверками очереди
+    
+    def __init__(self, root, pokazat_hod, pri_oshibke, potokov=2):
+        self.root = root
+        self.pokazat_hod = pokazat_hod
+        self.pri_oshibke = pri_oshibke
+        self.pul = ThreadPoolExecutor(max_workers=potokov, thread_name_prefix='todoshop')
+        self.rezultaty = queue.Queue()
+        self.aktivnye = {}          # ключ -> задание
+        self.proverka = None        # запланированный вызов proverit
+    
+    def zapustit(self, rabota, gotovo=None, kluch=None, opisanie="", oshibka=None):
+        """Выполнить rabota(задание) в пуле, затем gotovo(результат) в потоке Tk
+        
+        Без ключа задание ни с чем не сливается. Ошибка работы уходит
+        в oshibka(исключение), по умолчанию - в pri_oshibke(задание, исключение).
+        """
+        if kluch is None:
+            kluch = object()
+        staroe = self.aktivnye.get(kluch)
+        if staroe is not None:
+            staroe.otmenit()
+        zadanie = FonovoeZadanie(kluch, opisanie, gotovo, oshibka)
+        self.aktivnye[kluch] = zadanie
+        zadanie.budushchee = self.pul.submit(self.vypolnit, zadanie, rabota)
+        if self.proverka is None:
+            self.proverka = self.root.after(self.INTERVAL, self.proverit)
+        return zadanie
+    
+    def vypolnit(self, zadanie, rabota):
+        """Выполнить работу в потоке пула и положить итог в очередь"""
+        try:
+            self.rezultaty.put((zadanie, rabota(zadanie), None))
+        except ZadanieOtmeneno:
+            pass
+        except Exception as oshibka:
+            self.rezultaty.put((zadanie, None, oshibka))
+    
+    def proverit(self):
+        """Раздать готовые результаты и показать ход заданий (поток Tk)"""
+        self.proverka = None
+        while True:
+            try:
+                zadanie, rezultat, oshibka = self.rezultaty.get_nowait()
+            except queue.Empty:
+                break
+            if zadanie.otmeneno:
+                continue
+            if self.aktivnye.get(zadanie.kluch) is zadanie:
+                del self.aktivnye[zadanie.kluch]
+            if oshibka is not None:
+                if zadanie.oshibka is not None:
+                    zadanie.oshibka(oshibka)
+                else:
+                    self.pri_oshibke(zadanie, oshibka)
+            elif zadanie.gotovo is not None:
+                zadanie.gotovo(rezultat)
+        
+        self.pokazat_hod([z for z in self.aktivnye.values() if z.opisanie])
+        if self.aktivnye and self.proverka is None:
+            self.proverka = self.root.after(self.INTERVAL, self.proverit)
+    
+    def otmenit(self, kluch):
+        """Отменить задание с ключом kluch, если оно ещё идёт"""
+        zadanie = self.aktivnye.pop(kluch, None)
+        if zadanie is not None:
+            zadanie.otmenit()
+    
+    def otmenit_vse(self):
+        """Отменить все незавершённые задания"""
+        for kluch in list(self.aktivnye):
+            self.otmenit(kluch)
+    
+    def zakryt(self):
+        """Отменить задания и остановить пул (при выходе из программы)"""
+        self.otmenit_vse()
+        self.pul.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,2324 @@
+# -*- coding: utf-8 -*-
+"""
+Графический интерфейс TodoShop (tkinter)
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from contextlib import contextmanager
+import tkinter as tk
+from tkinter import ttk, messagebox, font, filedialog
+from datetime import datetime
+from bisect import bisect_left
+from operator import attrgetter
+import queue
+import tracemalloc
+
+from .zadachi import StatusZadachi, Zadacha, SpisokZadach
+from .magaziny import Magazin, ReestrMagazinov
+from .poisk import IndeksTovarov
+from .hranilishche import PAPKA_DANNYH, Hranilishche
+from .baza import SqliteBaza
+from .obmen import (KOLONKI_TOVAROV, pakety, chitat_tovary, chitat_zadachi, eksportirovat_zadachi,
+                    stroki_tovarov, zapisat_zapisi)
+from .fon import ZadanieOtmeneno, FonovyeZadaniia
+from .otmena import ZhurnalIzmenenii
+from .napominaniia import Napominaniia
+from .metriki import (Gistogramma, Metriki, tochka_zamera, vkliuchit, vykliuchit,
+                      eksportirovat, format_dlitelnosti, pamiat_processa)
+
+# ============================================
+# НАСТРОЙКИ ВНЕШНЕГО ВИДА
+# ============================================
+
+# Цветовая схема
+COLORS = {
+    'primary': '#2C3E50',      # Тёмно-синий
+    'secondary': '#3498DB',    # Синий
+    'success': '#27AE60',      # Зелёный
+    'danger': '#E74C3C',       # Красный
+    'warning': '#F39C12',      # Оранжевый
+    'light': '#ECF0F1',        # Светлый
+    'dark': '#2C3E50',         # Тёмный
+    'background': '#F5F7FA',   # Фон
+    'text': '#2C3E50',         # Текст
+}
+
+# Высота строки в списке задач (пикселей)
+VYSOTA_STROKI = 34
+
+# Файлы для импорта и экспорта
+TIPY_FAILOV = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson"), ("Все файлы", "*.*")]
+
+# Колонки таблицы товаров: (поле сортировки магазина, заголовок, ширина)
+KOLONKI_TABLICY = [
+    ('nazvanie', "Товар", 200),
+    ('cena', "Цена, руб.", 90),
+    ('kolichestvo', "Кол-во", 70),
+    ('summa', "Сумма, руб.", 100),
+]
+
+# Сколько выполненных задач показывать на странице архива
+STRANICA_ARHIVA = 50
+
+# Поля ввода, где Ctrl+Z/Ctrl+Y правят набранный текст (ttk.Combobox и ttk.Spinbox - тоже ttk.Entry)
+POLIA_VVODA = (tk.Entry, tk.Text, tk.Spinbox, ttk.Entry)
+
+# Размер окна при запуске
+SHIRINA_OKNA = 900
+VYSOTA_OKNA = 650
+
+# ============================================
+# ПРОФИЛЬ ЗАПУСКА
+# ============================================
+
+class ProfilZapuska:
+    """Время этапов запуска окна (--profile-startup)
+    
+    Этапы печатаются в stderr таблицей в духе python -X importtime:
+    длительность этапа, время от начала запуска и название. Сначала
+    выводится всё, что было до первой отрисовки, дальше (фоновая
+    загрузка, вкладки, построенные при первом открытии) - по мере
+    готовности. Выключенный профиль ничего не замеряет.
+    """
+    def __init__(self, vkliuchen=False, nachalo=None):
+        self.vkliuchen = vkliuchen
+        self.nachalo = time.perf_counter() if nachalo is None else nachalo
+        self.etapy = []
+        self.srazu = False
+    
+    @contextmanager
+    def etap(self, nazvanie):
+        """Замерить этап запуска"""
+        if not self.vkliuchen:
+            yield
+            return
+        nachalo_etapa = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.zapisat(nazvanie, nachalo_etapa)
+    
+    def zapisat(self, nazvanie, nachalo_etapa):
+        """Записать этап, начавшийся в nachalo_etapa и закончившийся сейчас"""
+        if not self.vkliuchen:
+            return
+        konec = time.perf_counter()
+        self.etapy.append((konec - nachalo_etapa, konec - self.nachalo, nazvanie))
+        if self.srazu:
+            self.pechat()
+    
+    def pechat(self):
+        """Вывести накопленные этапы; следующие выводятся сразу"""
+        if not self.vkliuchen:
+            return
+        if not self.srazu:
+            print("запуск: этап [мс] | с начала [мс] | что", file=sys.stderr)
+            self.srazu = True
+        for dlitelnost, s_nachala, nazvanie in self.etapy:
+            print(f"запуск: {dlitelnost * 1000:9.1f} | {s_nachala * 1000:13.1f} | {nazvanie}",
+                  file=sys.stderr)
+        self.etapy.clear()
+
+# ============================================
+# ЗАМЕРЫ ОБРАБОТЧИКОВ
+# ============================================
+
+# Период проверки задержки цикла событий и обновления панели замеров (мс)
+SHAG_ZADERZHKI = 100
+SHAG_PANELI = 1000
+
+# Период выгрузки замеров в файл при запуске с --metriki (мс)
+SHAG_VYGRUZKI = 15000
+
+
+def imia_obrabotchika(func):
+    """Имя обработчика Tk для отчёта, например 'GlavnoeOkno.dobavit_zadachu'"""
+    kod = getattr(func, '__code__', None)
+    # after() оборачивает обработчик во вложенную функцию callit
+    if kod is not None and kod.co_name == 'callit' and 'func' in kod.co_freevars:
+        func = func.__closure__[kod.co_freevars.index('func')].cell_contents
+    imia = getattr(func, '__qualname__', None) or type(func).__name__
+    return imia.replace('.<locals>', '')
+
+
+class IzmeriaemyiVyzov(tk.CallWrapper):
+    """Вызов обработчика Tk с замером длительности
+    
+    Tk вызывает все обработчики (command, bind, after) через
+    tkinter.CallWrapper. Окно ставит этот класс на его место до
+    создания виджетов (ustanovit) и возвращает прежний, когда его
+    корень Tk разрушен (sniat), поэтому замеряются все обработчики
+    окна, а имя каждого вычисляется один раз - при регистрации.
+    Обработчики виджетов других корней Tk не замеряются. Пока замеры
+    окна выключены (metriki_obrabotchikov - None), вызов стоит одной
+    проверки.
+    """
+    okna = {}                   # корень Tk -> окно, обработчики которого замеряются
+    iskhodnyi = tk.CallWrapper
+    
+    def __init__(self, func, subst, widget):
+        super().__init__(func, subst, widget)
+        self.imia = imia_obrabotchika(func)
+        self.okno = self.okna.get(widget._root()) if widget is not None else None
+    
+    @classmethod
+    def ustanovit(cls, root, okno):
+        """Замерять обработчики виджетов корня root для окна okno"""
+        cls.okna[root] = okno
+        tk.CallWrapper = cls
+    
+    @classmethod
+    def sniat(cls, root):
+        """Перестать замерять обработчики корня root; без окон - вернуть tkinter как был"""
+        cls.okna.pop(root, None)
+        if not cls.okna and tk.CallWrapper is cls:
+            tk.CallWrapper = cls.iskhodnyi
+    
+    def __call__(self, *args):
+        metriki = self.okno.metriki_obrabotchikov if self.okno is not None else None
+        if metriki is None:
+            return super().__call__(*args)
+        nachalo = time.perf_counter()
+        try:
+            return super().__call__(*args)
+        finally:
+            metriki.zapisat(self.imia, time.perf_counter() - nachalo)
+
+
+def posschitat_vidzhety(vidzhet):
+    """Сколько виджетов вложено в vidzhet (на всех уровнях)"""
+    return sum(1 + posschitat_vidzhety(v) for v in vidzhet.winfo_children())
+
+# ============================================
+# ГЛАВНОЕ ОКНО ПРОГРАММЫ
+# ============================================
+
+class GlavnoeOkno:
+    """Главное окно
+    
+    Сохранённые данные читаются в пуле уже после первой отрисовки:
+    до их прихода окно показывает пустые списки, а добавление задач
+    и импорт откладываются. Вкладки, кроме первой, строятся при
+    первом открытии. demo=False - не заполнять пустое хранилище
+    примерами. metriki - уже включённые замеры (--metriki): тогда
+    они идут всё время, иначе - только пока следит панель замеров.
+    glubina_otmeny - сколько последних изменений можно отменить.
+    posle_zagruzki() вызывается в потоке Tk, когда данные подключены.
+    """
+    def __init__(self, root, hranilishche=None, demo=True, profil=None, metriki=None,
+                 glubina_otmeny=100, posle_zagruzki=None):
+        self.root = root
+        self.posle_zagruzki = posle_zagruzki
+        self.vsego_tovarov = 0      # на вкладке «О программе», считается при её открытии
+        self.profil = profil or ProfilZapuska()
+        
+        # Замеры методов и обработчиков - для панели на вкладке проверки
+        self.metriki = metriki
+        self.zamery_vsegda = metriki is not None
+        self.zaderzhka_cikla = Gistogramma()
+        self.slezhenie = False
+        self.taimery_slezheniia = {}
+        self.snimok_pamiati = None
+        self.rost_pamiati = ""
+        self.metriki_obrabotchikov = metriki
+        IzmeriaemyiVyzov.ustanovit(root, self)
+        self.root.bind('<Destroy>', self.pri_razrushenii, add='+')
+        with self.profil.etap("окно и шрифты"):
+            self.root.title("📋 TodoShop - Менеджер задач и магазинов")
+            
+            # Центрируем окно по известному размеру, не дожидаясь его отрисовки
+            x = (self.root.winfo_screenwidth() - SHIRINA_OKNA) // 2
+            y = (self.root.winfo_screenheight() - VYSOTA_OKNA) // 2
+            self.root.geometry(f'{SHIRINA_OKNA}x{VYSOTA_OKNA}+{x}+{y}')
+            self.root.configure(bg=COLORS['background'])
+            
+            # Загружаем шрифты
+            self.load_fonts()
+        
+        # Инициализируем данные: сохранённые придут из пула, пустое
+        # хранилище заполняется демонстрационными
+        self.hranilishche = hranilishche
+        self.spisok_zadach = SpisokZadach()
+        self.spisok_magazinov = ReestrMagazinov()
+        self.zagruzka_idet = hranilishche is not None and not hranilishche.pustoe()
+        if demo and not self.zagruzka_idet:
+            with self.profil.etap("демо-данные"):
+                self.sozdat_magaziny()
+                self.dobavit_testovye_zadachi()
+        self.indeks_tovarov = IndeksTovarov(self.spisok_magazinov)
+        self.poisk_zaplanirovan = None
+        self.poisk_arhiva_zaplanirovan = None
+        self.import_idet = False
+        
+        # Изменения из окна идут через журнал: по его событиям обновляются
+        # кнопки отмены и показывается магазин, где изменение отменено
+        self.zhurnal_izmenenii = ZhurnalIzmenenii(glubina_otmeny)
+        self.zhurnal_izmenenii.podpisat(self.pri_izmenenii_zhurnala)
+        
+        # Долгие операции идут в пуле потоков, результаты - через root.after
+        self.fon = FonovyeZadaniia(root, self.pokazat_hod_zadanii, self.pri_oshibke_zadaniia)
+        
+        # Один таймер на ближайший срок задач - без опроса всего списка
+        self.napominaniia = Napominaniia(root, self.napomnit)
+        
+        # Создаем интерфейс
+        self.sozdat_interfeis()
+        
+        if self.zagruzka_idet:
+            self.fon.zapustit(self.zagruzit_dannye, self.podkliuchit_dannye,
+                              kluch='zagruzka', opisanie="Загрузка данных",
+                              oshibka=self.pri_oshibke_zagruzki)
+        else:
+            self.podkliuchit_dannye((self.spisok_zadach, self.spisok_magazinov, self.indeks_tovarov))
+        
+        # Первая отрисовка - когда Tk освободится после построения окна
+        nachalo_otrisovki = time.perf_counter()
+        self.root.after_idle(self.pervaia_otrisovka, nachalo_otrisovki)
+    
+    def load_fonts(self):
+        """Загружаем и настраиваем шрифты"""
+        self.font_h1 = ('Arial', 16, 'bold')
+        self.font_h2 = ('Arial', 14, 'bold')
+        self.font_h3 = ('Arial', 12, 'bold')
+        self.font_normal = ('Arial', 10)
+        self.font_small = ('Arial', 9)
+        self.font_mono = ('Courier New', 10)
+    
+    def sozdat_magaziny(self):
+        """Создаем магазины для демонстрации"""
+        # Магазин 1 - Продукты
+        mag1 = Magazin("🍎 Фруктовый рай", "ул. Яблочная, 25", "Продуктовый")
+        mag1.dobavit_tovar("Яблоки Голден", 120, 50)
+        mag1.dobavit_tovar("Бананы", 90, 30)
+        mag1.dobavit_tovar("Апельсины", 150, 40)
+        mag1.dobavit_tovar("Молоко", 85, 20)
+        mag1.dobavit_tovar("Хлеб", 45, 25)
+        
+        # Магазин 2 - Электроника
+        mag2 = Magazin("💻 ТехноМир", "пр. Космонавтов, 17", "Электроника")
+        mag2.dobavit_tovar("Наушники Sony", 4500, 5)
+        mag2.dobavit_tovar("Клавиатура", 2500, 8)
+        mag2.dobavit_tovar("Мышь беспроводная", 1200, 12)
+        mag2.dobavit_tovar("Флешка 64GB", 800, 15)
+        
+        # Магазин 3 - Книги
+        mag3 = Magazin("📚 Книжная лавка", "ул. Пушкина, 10", "Книжный")
+        mag3.dobavit_tovar("Python для начинающих", 1500, 7)
+        mag3.dobavit_tovar("Роман '1984'", 600, 10)
+        mag3.dobavit_tovar("Детская энциклопедия", 1200, 5)
+        mag3.dobavit_tovar("Книга рецептов", 850, 8)
+        
+        self.spisok_magazinov = ReestrMagazinov([mag1, mag2, mag3])
+    
+    def dobavit_testovye_zadachi(self):
+        """Добавляем тестовые задачи"""
+        self.spisok_zadach.dobavit(Zadacha("Сдать проект по ООП", "15.01.2026"))
+        self.spisok_zadach.dobavit(Zadacha("Купить продукты на неделю", "10.01.2026"))
+        self.spisok_zadach.dobavit(Zadacha("Сходить на пары", "Каждый день"))
+        self.spisok_zadach.dobavit(Zadacha("Сделать презентацию", "12.01.2026"))
+        self.spisok_zadach.dobavit(Zadacha("Встретиться с друзьями", "09.01.2026"))
+        
+        # Отмечаем одну задачу как выполненную
+        self.spisok_zadach.otmetit(self.spisok_zadach.zadachi[1])
+    
+    def sozdat_interfeis(self):
+        """Создаем основной интерфейс"""
+        # Верхняя панель
+        top_frame = tk.Frame(self.root, bg=COLORS['primary'], height=80)
+        top_frame.pack(fill='x')
+        top_frame.pack_propagate(False)
+        
+        # Заголовок
+        title_label = tk.Label(top_frame, 
+                              text="📋 TodoShop - Менеджер задач и магазинов",
+                              font=self.font_h1,
+                              fg='white',
+                              bg=COLORS['primary'])
+        title_label.pack(pady=20)
+        
+        # Подзаголовок
+        subtitle_label = tk.Label(top_frame,
+                                 text="Проект по объектно-ориентированному программированию",
+                                 font=self.font_small,
+                                 fg='#BDC3C7',
+                                 bg=COLORS['primary'])
+        subtitle_label.pack()
+        
+        # Контейнер для вкладок
+        main_frame = tk.Frame(self.root, bg=COLORS['background'])
+        main_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        # Создаем вкладки: пустые рамки сразу, содержимое - при первом открытии
+        self.vkladki = ttk.Notebook(main_frame)
+        self.vkladki.pack(fill='both', expand=True)
+        
+        self.postroiteli = {}
+        for nazvanie, postroit in (("📝 Мои задачи", self.sdelat_vkladku_zadach),
+                                   ("🗄 Архив", self.sdelat_vkladku_arhiva),
+                                   ("🏪 Магазины", self.sdelat_vkladku_magazinov),
+                                   ("🧪 Проверка", self.sdelat_vkladku_proverki),
+                                   ("ℹ️ О программе", self.sdelat_vkladku_informacii)):
+            vkladka = tk.Frame(self.vkladki, bg=COLORS['background'])
+            self.vkladki.add(vkladka, text=nazvanie)
+            self.postroiteli[str(vkladka)] = (vkladka, postroit, nazvanie)
+        self.vkladki.bind('<<NotebookTabChanged>>', lambda e: self.smenit_vkladku())
+        
+        # Первая вкладка видна сразу
+        self.postroit_vkladku(next(iter(self.postroiteli)))
+        
+        # Статус бар (создаём ПОСЛЕ вкладок)
+        with self.profil.etap("строка состояния"):
+            self.sozdat_status_bar()
+    
+    def smenit_vkladku(self):
+        """Построить открытую вкладку при первом открытии и освежить статистику"""
+        imia = self.vkladki.select()
+        self.postroit_vkladku(imia)
+        if hasattr(self, 'vkladka_informacii') and imia == str(self.vkladka_informacii):
+            # За товарами всех магазинов окно не следит - их число
+            # на вкладке «О программе» считается только при её открытии
+            self.vsego_tovarov = sum(m.chislo_tovarov for m in self.spisok_magazinov)
+        self.obnovit_statistiku()
+    
+    def postroit_vkladku(self, imia):
+        """Построить содержимое вкладки при первом открытии"""
+        if imia not in self.postroiteli:
+            return
+        vkladka, postroit, nazvanie = self.postroiteli.pop(imia)
+        with self.profil.etap(f"вкладка «{nazvanie}»"):
+            postroit(vkladka)
+    
+    def pervaia_otrisovka(self, nachalo_otrisovki):
+        """Окно показано: вывести профиль запуска"""
+        self.profil.zapisat("первая отрисовка", nachalo_otrisovki)
+        self.profil.pechat()
+    
+    # ============================================
+    # ЗАГРУЗКА ДАННЫХ
+    # ============================================
+    
+    def zagruzit_dannye(self, zadanie):
+        """Прочитать хранилище и построить индекс товаров (в пуле)"""
+        with self.profil.etap("загрузка данных (в пуле)"):
+            spisok_zadach, spisok_magazinov = self.hranilishche.zagruzit()
+            return spisok_zadach, spisok_magazinov, IndeksTovarov(spisok_magazinov)
+    
+    @tochka_zamera('okno.podkliuchit_dannye')
+    def podkliuchit_dannye(self, dannye):
+        """Показать данные и начать следить за их изменениями"""
+        with self.profil.etap("подключение данных"):
+            self.spisok_zadach, self.spisok_magazinov, self.indeks_tovarov = dannye
+            self.zagruzka_idet = False
+            if self.hranilishche is not None:
+                self.hranilishche.podkliuchit(self.spisok_zadach, self.spisok_magazinov)
+            self.spisok_zadach.podpisat(self.pri_izmenenii_zadach)
+            self.spisok_magazinov.podpisat(self.pri_izmenenii_reestra)
+            self.napominaniia.podkliuchit(self.spisok_zadach)
+            self.zhurnal_izmenenii.podkliuchit(self.spisok_magazinov)
+            
+            # Уже построенные вкладки показывали пустые списки
+            self.obnovit_spisok_zadach()
+            self.obnovit_statistiku()
+            self.obnovit_arhiv()
+            if hasattr(self, 'magazin_combo'):
+                self.obnovit_spisok_magazinov()
+                if self.magaziny_po_metke and self.vybrannyi() is None:
+                    self.vybrannyi_magazin.set(next(iter(self.magaziny_po_metke)))
+                self.pokazat_info_magazina()
+        if self.posle_zagruzki is not None:
+            self.posle_zagruzki()
+    
+    def pri_oshibke_zagruzki(self, oshibka):
+        """Сохранённые данные не прочитались: работать без хранилища"""
+        # Хранилище не подключаем, чтобы не затереть файлы пустыми данными
+        self.hranilishche = None
+        self.podkliuchit_dannye((self.spisok_zadach, self.spisok_magazinov, self.indeks_tovarov))
+        messagebox.showerror("Ошибка загрузки",
+                             f"Не удалось прочитать сохранённые данные:\n{oshibka}\n\n"
+                             "Изменения в этом сеансе не сохранятся.")
+    
+    def zhdat_zagruzki(self):
+        """True (с сообщением), если сохранённые данные ещё не пришли"""
+        if self.zagruzka_idet and hasattr(self, 'status_label'):
+            self.status_label.config(text="⏳ Данные ещё загружаются")
+        return self.zagruzka_idet
+    
+    def sozdat_status_bar(self):
+        """Создаем статус бар внизу окна"""
+        status_frame = tk.Frame(self.root, bg=COLORS['dark'], height=30)
+        status_frame.pack(fill='x', side='bottom')
+        status_frame.pack_propagate(False)
+        
+        # Статистика слева
+        self.status_label = tk.Label(status_frame,
+                                    text="Готов к работе",
+                                    font=self.font_small,
+                                    fg='white',
+                                    bg=COLORS['dark'])
+        self.status_label.pack(side='left', padx=10)
+        
+        # Отмена и повтор изменений (Ctrl+Z, Ctrl+Y)
+        self.knopka_povtora = tk.Button(status_frame,
+                                       text="↷",
+                                       command=self.povtorit_izmenenie,
+                                       state='disabled',
+                                       bg=COLORS['dark'],
+                                       fg='white',
+                                       font=self.font_small,
+                                       relief='flat')
+        self.knopka_povtora.pack(side='right', padx=(0, 10))
+        self.knopka_otkata = tk.Button(status_frame,
+                                      text="↶",
+                                      command=self.otmenit_izmenenie,
+                                      state='disabled',
+                                      bg=COLORS['dark'],
+                                      fg='white',
+                                      font=self.font_small,
+                                      relief='flat')
+        self.knopka_otkata.pack(side='right')
+        self.root.bind('<Control-z>', lambda e: self.pri_klavishe_otmeny(e, self.otmenit_izmenenie))
+        self.root.bind('<Control-y>', lambda e: self.pri_klavishe_otmeny(e, self.povtorit_izmenenie))
+        self.root.bind('<Control-Z>', lambda e: self.pri_klavishe_otmeny(e, self.povtorit_izmenenie))
+        
+        # Отмена фоновых заданий (видна, пока они идут)
+        self.knopka_otmeny = tk.Button(status_frame,
+                                      text="✖ Отменить",
+                                      command=self.otmenit_zadaniia,
+                                      bg=COLORS['danger'],
+                                      fg='white',
+                                      font=self.font_small,
+                                      relief='flat')
+        
+        # Время справа
+        self.time_label = tk.Label(status_frame,
+                                  text=datetime.now().strftime("%d.%m.%Y %H:%M"),
+                                  font=self.font_small,
+                                  fg='white',
+                                  bg=COLORS['dark'])
+        self.time_label.pack(side='right', padx=10)
+    
+    def sdelat_vkladku_zadach(self, vkladka):
+        """Создаем вкладку для управления задачами"""
+        # Две колонки
+        left_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        left_frame.pack(side='left', fill='both', expand=True, padx=10, pady=10)
+        
+        right_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        right_frame.pack(side='right', fill='both', expand=True, padx=10, pady=10)
+        
+        # === ЛЕВАЯ КОЛОНКА: Добавление задачи ===
+        add_frame = tk.LabelFrame(left_frame,
+                                 text="➕ Новая задача",
+                                 font=self.font_h2,
+                                 bg=COLORS['background'],
+                                 fg=COLORS['primary'],
+                                 padx=15,
+                                 pady=15)
+        add_frame.pack(fill='x', pady=(0, 10))
+        
+        # Описание задачи
+        tk.Label(add_frame,
+                text="Что нужно сделать:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(anchor='w', pady=(0, 5))
+        
+        self.pole_opisania = tk.Text(add_frame,
+                                    height=3,
+                                    width=40,
+                                    font=self.font_normal,
+                                    relief='solid',
+                                    borderwidth=1)
+        self.pole_opisania.pack(fill='x', pady=(0, 10))
+        self.pole_opisania.insert('1.0', "Например: Сделать домашнее задание")
+        
+        # Срок выполнения
+        tk.Label(add_frame,
+                text="Срок выполнения:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(anchor='w', pady=(0, 5))
+        
+        srok_frame = tk.Frame(add_frame, bg=COLORS['background'])
+        srok_frame.pack(fill='x', pady=(0, 15))
+        
+        self.pole_sroka = ttk.Combobox(srok_frame,
+                                      values=[
+                                          "Сегодня",
+                                          "Завтра",
+                                          "На этой неделе",
+                                          "На следующей неделе",
+                                          "В этом месяце"
+                                      ],
+                                      font=self.font_normal,
+                                      state='readonly',
+                                      width=25)
+        self.pole_sroka.pack(side='left')
+        self.pole_sroka.set("На этой неделе")
+        
+        # Кнопка добавления
+        add_btn = tk.Button(add_frame,
+                           text="✅ Добавить задачу",
+                           command=self.dobavit_zadachu,
+                           bg=COLORS['success'],
+                           fg='white',
+                           font=('Arial', 11, 'bold'),
+                           padx=20,
+                           pady=10)
+        add_btn.pack(pady=10)
+        
+        # Импорт и экспорт задач
+        file_frame = tk.Frame(add_frame, bg=COLORS['background'])
+        file_frame.pack(pady=(0, 5))
+        
+        tk.Button(file_frame,
+                 text="📥 Импорт задач",
+                 command=self.importirovat_zadachi,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=10).pack(side='left', padx=2)
+        
+        tk.Button(file_frame,
+                 text="📤 Экспорт задач",
+                 command=self.eksportirovat_zadachi,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=10).pack(side='left', padx=2)
+        
+        # === ПРАВАЯ КОЛОНКА: Список задач ===
+        list_frame = tk.LabelFrame(right_frame,
+                                  text="📋 Текущие задачи",
+                                  font=self.font_h2,
+                                  bg=COLORS['background'],
+                                  fg=COLORS['primary'],
+                                  padx=15,
+                                  pady=15)
+        list_frame.pack(fill='both', expand=True)
+        
+        # Заголовки списка
+        header_frame = tk.Frame(list_frame, bg=COLORS['light'])
+        header_frame.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(header_frame,
+                text="Статус",
+                font=self.font_h3,
+                bg=COLORS['light'],
+                width=8).pack(side='left', padx=2)
+        tk.Label(header_frame,
+                text="Задача",
+                font=self.font_h3,
+                bg=COLORS['light'],
+                width=25).pack(side='left', padx=2)
+        tk.Label(header_frame,
+                text="Срок",
+                font=self.font_h3,
+                bg=COLORS['light'],
+                width=12).pack(side='left', padx=2)
+        
+        # Прокручиваемый список задач
+        list_container = tk.Frame(list_frame, bg=COLORS['background'])
+        list_container.pack(fill='both', expand=True)
+        
+        # Виртуальный список: виджеты есть только у видимых строк,
+        # при прокрутке строки из пула получают новые задачи
+        self.task_scrollbar = ttk.Scrollbar(list_container,
+                                           orient='vertical',
+                                           command=self.prokrutit_zadachi)
+        self.task_list_frame = tk.Frame(list_container, bg=COLORS['background'])
+        
+        self.task_scrollbar.pack(side='right', fill='y')
+        self.task_list_frame.pack(side='left', fill='both', expand=True)
+        
+        self.stroki_zadach = []       # пул строк (виджетов)
+        self.otkrytye_zadachi = []    # невыполненные задачи (по возрастанию номера)
+        self.pervaia_stroka = 0       # номер задачи в верхней видимой строке
+        self.vidimo_strok = 0
+        
+        # Обновляем список задач и дальше меняем только затронутые строки
+        self.obnovit_spisok_zadach()
+        
+        # Настройка прокрутки
+        self.task_list_frame.bind('<Configure>', self.izmenit_razmer_spiska)
+        self.privyazat_kolesiko(self.task_list_frame)
+        
+        # Кнопки управления
+        btn_frame = tk.Frame(list_frame, bg=COLORS['background'])
+        btn_frame.pack(fill='x', pady=(10, 0))
+        
+        tk.Button(btn_frame,
+                 text="✓ Выполнить",
+                 command=self.otmetit_gotovoi,
+                 bg=COLORS['success'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=15,
+                 pady=5).pack(side='left', padx=5)
+        
+        tk.Button(btn_frame,
+                 text="✎ Редактировать",
+                 command=self.redaktirovat_zadachu,
+                 bg=COLORS['warning'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=15,
+                 pady=5).pack(side='left', padx=5)
+        
+        tk.Button(btn_frame,
+                 text="🗑 Удалить",
+                 command=self.udalit_zadachu,
+                 bg=COLORS['danger'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=15,
+                 pady=5).pack(side='left', padx=5)
+        
+        # Статистика
+        stats_frame = tk.Frame(right_frame, bg=COLORS['background'])
+        stats_frame.pack(fill='x', pady=(10, 0))
+        
+        self.stats_label = tk.Label(stats_frame,
+                                   text="Всего задач: 0 | Выполнено: 0 | Осталось: 0",
+                                   font=self.font_small,
+                                   bg=COLORS['background'],
+                                   fg=COLORS['dark'])
+        self.stats_label.pack()
+        
+        self.obnovit_statistiku()
+    
+    def sdelat_vkladku_arhiva(self, vkladka):
+        """Создаем вкладку с выполненными задачами"""
+        # Поиск по архиву (по мере ввода)
+        search_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        search_frame.pack(fill='x', padx=10, pady=10)
+        
+        tk.Label(search_frame,
+                text="🔍 Найти в архиве:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(side='left', padx=(0, 10))
+        
+        self.tekst_poiska_arhiva = tk.StringVar()
+        tk.Entry(search_frame,
+                textvariable=self.tekst_poiska_arhiva,
+                font=self.font_normal,
+                width=30).pack(side='left', padx=5)
+        self.tekst_poiska_arhiva.trace_add('write', lambda *args: self.zaplanirovat_poisk_arhiva())
+        
+        # Страница архива: задачи от недавно выполненных
+        list_frame = tk.LabelFrame(vkladka,
+                                  text="✅ Выполненные задачи",
+                                  font=self.font_h2,
+                                  bg=COLORS['background'],
+                                  fg=COLORS['primary'],
+                                  padx=15,
+                                  pady=15)
+        list_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        
+        self.spisok_arhiva = tk.Listbox(list_frame,
+                                       font=self.font_small,
+                                       relief='solid',
+                                       borderwidth=1)
+        self.spisok_arhiva.pack(fill='both', expand=True)
+        self.nomera_arhiva = []        # номера задач в строках страницы
+        self.stranicy_arhiva = []      # начала предыдущих страниц
+        self.nachalo_arhiva = 0        # начало показанной страницы
+        self.dalshe_arhiva = None      # начало следующей (None - её нет)
+        
+        # Листание и возврат задачи в работу
+        btn_frame = tk.Frame(list_frame, bg=COLORS['background'])
+        btn_frame.pack(fill='x', pady=(10, 0))
+        
+        self.knopka_nazad_arhiva = tk.Button(btn_frame,
+                                            text="◀ Новее",
+                                            command=self.predydushchaia_stranica_arhiva,
+                                            font=self.font_normal,
+                                            padx=10)
+        self.knopka_nazad_arhiva.pack(side='left', padx=5)
+        
+        self.knopka_vpered_arhiva = tk.Button(btn_frame,
+                                             text="Старее ▶",
+                                             command=self.sleduiushchaia_stranica_arhiva,
+                                             font=self.font_normal,
+                                             padx=10)
+        self.knopka_vpered_arhiva.pack(side='left', padx=5)
+        
+        tk.Button(btn_frame,
+                 text="↩ Вернуть в работу",
+                 command=self.vernut_iz_arhiva,
+                 bg=COLORS['warning'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=15).pack(side='right', padx=5)
+        
+        self.metka_arhiva = tk.Label(btn_frame,
+                                    font=self.font_small,
+                                    bg=COLORS['background'],
+                                    fg=COLORS['dark'])
+        self.metka_arhiva.pack(side='left', padx=10)
+        
+        self.pokazat_stranicu_arhiva()
+    
+    def sdelat_vkladku_magazinov(self, vkladka):
+        """Создаем вкладку для управления магазинами"""
+        # Верхняя часть - выбор магазина
+        top_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        top_frame.pack(fill='x', padx=10, pady=10)
+        
+        tk.Label(top_frame,
+                text="Выберите магазин:",
+                font=self.font_h2,
+                bg=COLORS['background']).pack(side='left', padx=(0, 10))
+        
+        self.vybrannyi_magazin = tk.StringVar()
+        
+        self.magazin_combo = ttk.Combobox(top_frame,
+                                         textvariable=self.vybrannyi_magazin,
+                                         state='readonly',
+                                         width=30)
+        self.magazin_combo.pack(side='left', padx=5)
+        self.magazin_combo.bind('<<ComboboxSelected>>', lambda e: self.vybrat_magazin())
+        
+        # Подпись в списке -> номер магазина в реестре
+        self.magaziny_po_metke = {}
+        self.obnovit_spisok_magazinov()
+        if self.magaziny_po_metke:
+            self.vybrannyi_magazin.set(next(iter(self.magaziny_po_metke)))
+        
+        # Кнопка обновить
+        tk.Button(top_frame,
+                 text="🔄 Обновить",
+                 command=self.pokazat_info_magazina,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=15).pack(side='left', padx=10)
+        
+        # Поиск товара во всех магазинах (по мере ввода)
+        search_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        search_frame.pack(fill='x', padx=10, pady=(0, 10))
+        
+        tk.Label(search_frame,
+                text="🔍 Найти товар:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(side='left', anchor='n', padx=(0, 10))
+        
+        self.tekst_poiska = tk.StringVar()
+        tk.Entry(search_frame,
+                textvariable=self.tekst_poiska,
+                font=self.font_normal,
+                width=25).pack(side='left', anchor='n', padx=5)
+        self.tekst_poiska.trace_add('write', lambda *args: self.zaplanirovat_poisk())
+        
+        self.rezultaty_poiska = tk.Listbox(search_frame,
+                                          height=4,
+                                          font=self.font_small,
+                                          relief='solid',
+                                          borderwidth=1)
+        self.rezultaty_poiska.pack(side='left', fill='x', expand=True, padx=5)
+        self.rezultaty_poiska.bind('<<ListboxSelect>>', lambda e: self.vybrat_rezultat_poiska())
+        self.kluchi_poiska = []
+        
+        # Основная информация
+        info_frame = tk.Frame(vkladka, bg=COLORS['background'])
+        info_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        
+        # Сводка магазина и таблица товаров
+        info_text_frame = tk.LabelFrame(info_frame,
+                                       text="📊 Информация о магазине",
+                                       font=self.font_h2,
+                                       bg=COLORS['background'],
+                                       fg=COLORS['primary'],
+                                       padx=15,
+                                       pady=15)
+        info_text_frame.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        self.metka_svodki = tk.Label(info_text_frame,
+                                    text="",
+                                    font=self.font_small,
+                                    bg=COLORS['background'],
+                                    fg=COLORS['text'],
+                                    justify='left',
+                                    anchor='w')
+        self.metka_svodki.pack(fill='x', pady=(0, 5))
+        
+        # Виртуальная таблица: строки есть только у видимых товаров (ключ
+        # строки - название товара), остальные магазин выдаёт срезом
+        # своего порядка сортировки по мере прокрутки
+        self.vysota_stroki_tablicy = font.Font(font=self.font_normal).metrics('linespace') + 6
+        ttk.Style().configure('Tovary.Treeview', rowheight=self.vysota_stroki_tablicy)
+        self.tablica_tovarov = ttk.Treeview(info_text_frame,
+                                           columns=[pole for pole, _, _ in KOLONKI_TABLICY],
+                                           show='headings',
+                                           selectmode='browse',
+                                           style='Tovary.Treeview',
+                                           height=20)
+        for pole, nazvanie, shirina in KOLONKI_TABLICY:
+            self.tablica_tovarov.heading(pole, text=nazvanie,
+                                         command=lambda p=pole: self.sortirovat_tovary(p))
+            self.tablica_tovarov.column(pole, width=shirina, stretch=pole == 'nazvanie',
+                                        anchor='w' if pole == 'nazvanie' else 'e')
+        self.tablica_tovarov.pack(side='left', fill='both', expand=True)
+        
+        self.sortirovka = ('cena', True)     # (поле, по убыванию)
+        self.pervaia_stroka_tovarov = 0
+        self.strok_tovarov = 20
+        self.magazin_v_tablice = None
+        self.pokazat_sortirovku()
+        
+        self.scrollbar_tovarov = ttk.Scrollbar(info_text_frame, command=self.prokrutit_tovary)
+        self.scrollbar_tovarov.pack(side='right', fill='y')
+        
+        self.tablica_tovarov.bind('<Configure>', self.izmenit_razmer_tablicy)
+        self.tablica_tovarov.bind('<<TreeviewSelect>>', lambda e: self.vybrat_tovar())
+        self.tablica_tovarov.bind('<MouseWheel>',
+                                  lambda e: self.prokrutit_tovary('scroll', -3 if e.delta > 0 else 3, 'units'))
+        self.tablica_tovarov.bind('<Button-4>', lambda e: self.prokrutit_tovary('scroll', -3, 'units'))
+        self.tablica_tovarov.bind('<Button-5>', lambda e: self.prokrutit_tovary('scroll', 3, 'units'))
+        
+        # Панель управления товарами
+        control_frame = tk.LabelFrame(info_frame,
+                                     text="🛠 Управление товарами",
+                                     font=self.font_h2,
+                                     bg=COLORS['background'],
+                                     fg=COLORS['primary'],
+                                     padx=15,
+                                     pady=15)
+        control_frame.pack(side='right', fill='both', padx=(10, 0))
+        
+        # Поля ввода
+        tk.Label(control_frame,
+                text="Название товара:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(anchor='w', pady=(0, 5))
+        
+        self.pole_tovara = tk.Entry(control_frame,
+                                   font=self.font_normal,
+                                   width=25)
+        self.pole_tovara.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(control_frame,
+                text="Цена (руб.):",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(anchor='w', pady=(0, 5))
+        
+        self.pole_ceny = tk.Entry(control_frame,
+                                 font=self.font_normal,
+                                 width=15)
+        self.pole_ceny.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(control_frame,
+                text="Количество:",
+                font=self.font_h3,
+                bg=COLORS['background']).pack(anchor='w', pady=(0, 5))
+        
+        self.pole_kolichestva = tk.Entry(control_frame,
+                                        font=self.font_normal,
+                                        width=10)
+        self.pole_kolichestva.pack(fill='x', pady=(0, 20))
+        self.pole_kolichestva.insert(0, "1")
+        
+        # Кнопки в сетке
+        button_grid = tk.Frame(control_frame, bg=COLORS['background'])
+        button_grid.pack(fill='x')
+        
+        # Первый ряд кнопок
+        btn1_frame = tk.Frame(button_grid, bg=COLORS['background'])
+        btn1_frame.pack(fill='x', pady=5)
+        
+        tk.Button(btn1_frame,
+                 text="➕ Добавить",
+                 command=self.dobavit_tovar,
+                 bg=COLORS['success'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        tk.Button(btn1_frame,
+                 text="➖ Удалить",
+                 command=self.udalit_tovar,
+                 bg=COLORS['danger'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        # Второй ряд кнопок
+        btn2_frame = tk.Frame(button_grid, bg=COLORS['background'])
+        btn2_frame.pack(fill='x', pady=5)
+        
+        tk.Button(btn2_frame,
+                 text="💰 Узнать цену",
+                 command=self.uznat_cenu_tovara,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        tk.Button(btn2_frame,
+                 text="✎ Изменить цену",
+                 command=self.izmenit_cenu,
+                 bg=COLORS['warning'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        # Третий ряд кнопок - файлы CSV/JSONL
+        btn3_frame = tk.Frame(button_grid, bg=COLORS['background'])
+        btn3_frame.pack(fill='x', pady=5)
+        
+        tk.Button(btn3_frame,
+                 text="📥 Импорт",
+                 command=self.importirovat_tovary,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        tk.Button(btn3_frame,
+                 text="📤 Экспорт",
+                 command=self.eksportirovat_tovary,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=12,
+                 pady=8).pack(side='left', padx=2)
+        
+        # Результат операций
+        self.metka_rezultata = tk.Label(control_frame,
+                                       text="",
+                                       font=self.font_small,
+                                       bg=COLORS['background'],
+                                       fg=COLORS['success'],
+                                       height=2,
+                                       wraplength=200)
+        self.metka_rezultata.pack(pady=10)
+        
+        # Показать информацию о первом магазине
+        self.pokazat_info_magazina()
+    
+    def sdelat_vkladku_proverki(self, vkladka):
+        """Вкладка для тестирования работы классов"""
+        # Заголовок
+        tk.Label(vkladka,
+                text="Тестирование работы классов",
+                font=self.font_h1,
+                bg=COLORS['background'],
+                fg=COLORS['primary']).pack(pady=(10, 5))
+        
+        # Описание
+        description = """Здесь можно проверить корректность работы всех методов классов.
+        Программа автоматически протестирует основные функции и покажет результат."""
+        
+        tk.Label(vkladka,
+                text=description,
+                font=self.font_normal,
+                bg=COLORS['background'],
+                wraplength=600,
+                justify='center').pack(pady=5)
+        
+        # Кнопка запуска теста
+        test_btn = tk.Button(vkladka,
+                            text="▶ Запустить полную проверку",
+                            command=self.proverit_vse,
+                            bg=COLORS['primary'],
+                            fg='white',
+                            font=('Arial', 12, 'bold'),
+                            padx=30,
+                            pady=8)
+        test_btn.pack(pady=5)
+        
+        # Живые замеры производительности
+        perf_frame = tk.LabelFrame(vkladka,
+                                  text="📈 Производительность",
+                                  font=self.font_h2,
+                                  bg=COLORS['background'],
+                                  fg=COLORS['primary'],
+                                  padx=15,
+                                  pady=5)
+        perf_frame.pack(fill='both', expand=True, padx=20, pady=5)
+        
+        perf_btn_frame = tk.Frame(perf_frame, bg=COLORS['background'])
+        perf_btn_frame.pack(fill='x', pady=(0, 5))
+        
+        self.knopka_slezheniia = tk.Button(perf_btn_frame,
+                                          text="▶ Следить",
+                                          command=self.pereklyuchit_slezhenie,
+                                          bg=COLORS['success'],
+                                          fg='white',
+                                          font=self.font_normal,
+                                          width=14)
+        self.knopka_slezheniia.pack(side='left', padx=2)
+        
+        tk.Button(perf_btn_frame,
+                 text="📸 Снимок памяти",
+                 command=self.snimok_pamiati_processa,
+                 bg=COLORS['secondary'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=16).pack(side='left', padx=2)
+        
+        tk.Button(perf_btn_frame,
+                 text="🗑 Сбросить замеры",
+                 command=self.sbrosit_zamery,
+                 bg=COLORS['warning'],
+                 fg='white',
+                 font=self.font_normal,
+                 width=16).pack(side='left', padx=2)
+        
+        self.pole_metrik = tk.Text(perf_frame,
+                                  height=10,
+                                  font=self.font_mono,
+                                  bg='#FAFAFA',
+                                  relief='solid',
+                                  borderwidth=1,
+                                  state='disabled')
+        self.pole_metrik.pack(fill='both', expand=True)
+        
+        # Область для вывода результатов
+        result_frame = tk.LabelFrame(vkladka,
+                                    text="📊 Результаты проверки",
+                                    font=self.font_h2,
+                                    bg=COLORS['background'],
+                                    fg=COLORS['primary'],
+                                    padx=15,
+                                    pady=5)
+        result_frame.pack(fill='both', expand=True, padx=20, pady=5)
+        
+        self.pole_rezultatov = tk.Text(result_frame,
+                                      height=8,
+                                      font=self.font_mono,
+                                      bg='#FAFAFA',
+                                      relief='solid',
+                                      borderwidth=1)
+        self.pole_rezultatov.pack(fill='both', expand=True)
+        
+        # Добавляем прокрутку
+        scrollbar = ttk.Scrollbar(self.pole_rezultatov)
+        scrollbar.pack(side='right', fill='y')
+        self.pole_rezultatov.config(yscrollcommand=scrollbar.set)
+        scrollbar.config(command=self.pole_rezultatov.yview)
+    
+    def sdelat_vkladku_informacii(self, vkladka):
+        """Вкладка с информацией о проекте"""
+        self.vkladka_informacii = vkladka
+        # Заголовок
+        tk.Label(vkladka,
+                text="TodoShop - Менеджер задач и магазинов",
+                font=self.font_h1,
+                bg=COLORS['background'],
+                fg=COLORS['primary']).pack(pady=30)
+        
+        # Информация о проекте
+        info_text = """📋 Описание проекта:
+
+Этот проект разработан в рамках изучения объектно-ориентированного
+программирования (ООП) на языке Python.
+
+Проект демонстрирует:
+• Создание и использование классов
+• Работу с атрибутами и методами объектов
+• Построение графического интерфейса с помощью Tkinter
+• Практическое применение ООП в реальной задаче
+
+🛠 Функциональность:
+• Управление задачами (добавление, выполнение, удаление)
+• Управление магазинами и товарами
+• Тестирование всех методов классов
+• Подробная статистика
+
+📚 Используемые технологии:
+• Python 3.x
+• Tkinter для GUI
+• ООП (классы, объекты, методы, инкапсуляция)
+
+👨‍💻 Автор: [Введите ваше имя]
+📅 Дата создания: Декабрь 2023
+🎯 Курс: Программирование на Python
+        """
+        
+        info_label = tk.Label(vkladka,
+                             text=info_text,
+                             font=self.font_normal,
+                             bg=COLORS['background'],
+                             justify='left',
+                             wraplength=600)
+        info_label.pack(pady=20, padx=40)
+        
+        # Разделитель
+        tk.Frame(vkladka, height=2, bg=COLORS['light']).pack(fill='x', padx=50, pady=20)
+        
+        # Статистика программы (заполняет obnovit_statistiku)
+        self.metka_statistiki = tk.Label(vkladka,
+                                        font=self.font_normal,
+                                        bg=COLORS['light'],
+                                        justify='left',
+                                        relief='solid',
+                                        borderwidth=1,
+                                        padx=20,
+                                        pady=20)
+        self.metka_statistiki.pack(pady=10, padx=50)
+        self.obnovit_statistiku()
+        
+        # Кнопка закрытия
+        tk.Button(vkladka,
+                 text="Закрыть программу",
+                 command=self.root.quit,
+                 bg=COLORS['danger'],
+                 fg='white',
+                 font=self.font_normal,
+                 padx=30,
+                 pady=10).pack(pady=30)
+    
+    # ============================================
+    # МЕТОДЫ ДЛЯ РАБОТЫ С ЗАДАЧАМИ
+    # ============================================
+    
+    def dobavit_zadachu(self):
+        """Добавить новую задачу"""
+        opisanie = self.pole_opisania.get('1.0', 'end-1c').strip()
+        srok = self.pole_sroka.get()
+        
+        if not opisanie or opisanie == "Например: Сделать домашнее задание":
+            messagebox.showwarning("Внимание", "Введите описание задачи!")
+            return
+        if self.zhdat_zagruzki():
+            return
+        
+        self.zhurnal_izmenenii.dobavit_zadachu(self.spisok_zadach, Zadacha(opisanie, srok))
+        
+        self.pole_opisania.delete('1.0', 'end')
+        self.pole_opisania.insert('1.0', "Например: Сделать домашнее задание")
+        
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text=f"Задача добавлена: {opisanie[:20]}...")
+    
+    @tochka_zamera('okno.obnovit_spisok_zadach')
+    def obnovit_spisok_zadach(self):
+        """Обновить список задач на экране"""
+        # Рабочий список модели - это и есть невыполненные задачи по номеру
+        self.otkrytye_zadachi = self.spisok_zadach.zadachi
+        self.pokazat_vidimye_zadachi()
+    
+    def pri_izmenenii_zadach(self, sobytie, zadacha):
+        """Обработать событие списка задач, перерисовав только затронутые строки"""
+        if sobytie == 'zagruzheny':
+            self.obnovit_spisok_zadach()
+            self.obnovit_statistiku()
+            self.obnovit_arhiv()
+            return
+        # Модель уже вставила задачу в список открытых или убрала из него
+        # (выполненная - в архив): строки с её места и ниже сдвинулись
+        pozicia = bisect_left(self.otkrytye_zadachi, zadacha.nomer, key=attrgetter('nomer'))
+        self.pokazat_vidimye_zadachi(pozicia)
+        self.obnovit_statistiku()
+        # Архив меняют отметка, её снятие и выполненные задачи
+        if sobytie == 'izmenena' or zadacha.status is StatusZadachi.VYPOLNENO:
+            self.obnovit_arhiv()
+    
+    def obnovit_arhiv(self):
+        """Перерисовать страницу архива, если вкладка уже построена"""
+        if hasattr(self, 'spisok_arhiva'):
+            self.pokazat_stranicu_arhiva()
+    
+    def sozdat_stroku_zadachi(self, nomer):
+        """Создать строку пула для виртуального списка задач"""
+        task_frame = tk.Frame(self.task_list_frame,
+                              bg=COLORS['background'],
+                              height=VYSOTA_STROKI)
+        task_frame.pack_propagate(False)
+        
+        # Статус
+        status_btn = tk.Button(task_frame,
+                              text="◯",
+                              command=lambda k=nomer: self.otmetit_po_stroke(k),
+                              bg=COLORS['light'],
+                              fg=COLORS['dark'],
+                              font=('Arial', 12),
+                              width=3,
+                              relief='flat')
+        status_btn.pack(side='left', padx=5)
+        
+        # Описание
+        desc_label = tk.Label(task_frame,
+                             font=self.font_normal,
+                             bg=COLORS['background'],
+                             anchor='w',
+                             width=30)
+        desc_label.pack(side='left', padx=5)
+        
+        # Срок
+        srok_label = tk.Label(task_frame,
+                             font=self.font_small,
+                             bg=COLORS['background'],
+                             fg=COLORS['dark'],
+                             width=12)
+        srok_label.pack(side='left', padx=5)
+        
+        # Кнопка удаления
+        del_btn = tk.Button(task_frame,
+                           text="×",
+                           command=lambda k=nomer: self.udalit_po_stroke(k),
+                           bg=COLORS['light'],
+                           fg=COLORS['danger'],
+                           font=('Arial', 12, 'bold'),
+                           width=2,
+                           relief='flat')
+        del_btn.pack(side='right', padx=5)
+        
+        for widget in (task_frame, status_btn, desc_label, srok_label, del_btn):
+            self.privyazat_kolesiko(widget)
+        
+        return {'frame': task_frame, 'opisanie': desc_label, 'srok': srok_label}
+    
+    @tochka_zamera('okno.pokazat_vidimye_zadachi')
+    def pokazat_vidimye_zadachi(self, ot=0, do=None):
+        """Заполнить строки пула задачами из видимой области
+        
+        ot/do - позиции в списке открытых задач, которые изменились;
+        строки вне этого диапазона не трогаются.
+        """
+        vsego = len(self.otkrytye_zadachi)
+        seichas = time.time()
+        pervaia = max(0, min(self.pervaia_stroka, vsego - self.vidimo_strok))
+        if pervaia != self.pervaia_stroka:
+            # Окно сдвинулось - перерисовываем все строки
+            self.pervaia_stroka = pervaia
+            ot, do = 0, None
+        
+        nachalo = max(0, ot - pervaia)
+        konec = len(self.stroki_zadach) if do is None else min(len(self.stroki_zadach), do - pervaia)
+        for k in range(nachalo, konec):
+            stroka = self.stroki_zadach[k]
+            pozicia = pervaia + k
+            if k < self.vidimo_strok and pozicia < vsego:
+                zadacha = self.otkrytye_zadachi[pozicia]
+                stroka['opisanie'].config(text=zadacha.opisanie[:40])
+                srok_do = zadacha.srok_do
+                # У повторяющейся задачи - день ближайшего невыполненного повтора
+                tekst_sroka = zadacha.srok if zadacha.povtor is None \
+                    else f"↻ {datetime.fromtimestamp(srok_do - 1):%d.%m}"
+                stroka['srok'].config(text=tekst_sroka,
+                                      fg=COLORS['danger'] if srok_do is not None and srok_do <= seichas
+                                      else COLORS['dark'])
+                stroka['frame'].place(x=0, y=k * VYSOTA_STROKI, relwidth=1)
+            else:
+                stroka['frame'].place_forget()
+        
+        if vsego:
+            self.task_scrollbar.set(self.pervaia_stroka / vsego,
+                                    min(1.0, (self.pervaia_stroka + self.vidimo_strok) / vsego))
+        else:
+            self.task_scrollbar.set(0.0, 1.0)
+    
+    def izmenit_razmer_spiska(self, event):
+        """Подогнать пул строк под новую высоту списка"""
+        self.vidimo_strok = max(1, event.height // VYSOTA_STROKI)
+        while len(self.stroki_zadach) < self.vidimo_strok:
+            self.stroki_zadach.append(self.sozdat_stroku_zadachi(len(self.stroki_zadach)))
+        self.pokazat_vidimye_zadachi()
+    
+    def prokrutit_zadachi(self, *args):
+        """Обработать команду полосы прокрутки ('moveto' или 'scroll')"""
+        if args[0] == 'moveto':
+            self.pervaia_stroka = int(float(args[1]) * len(self.otkrytye_zadachi))
+        elif args[0] == 'scroll':
+            shag = int(args[1])
+            if args[2] == 'pages':
+                shag *= self.vidimo_strok
+            self.pervaia_stroka += shag
+        self.pokazat_vidimye_zadachi()
+    
+    def privyazat_kolesiko(self, widget):
+        """Прокрутка списка задач колёсиком мыши"""
+        widget.bind('<MouseWheel>',
+                    lambda e: self.prokrutit_zadachi('scroll', -1 if e.delta > 0 else 1, 'units'))
+        widget.bind('<Button-4>', lambda e: self.prokrutit_zadachi('scroll', -1, 'units'))
+        widget.bind('<Button-5>', lambda e: self.prokrutit_zadachi('scroll', 1, 'units'))
+    
+    def otmetit_po_stroke(self, nomer):
+        """Отметить задачу, показанную в строке пула"""
+        pozicia = self.pervaia_stroka + nomer
+        if pozicia < len(self.otkrytye_zadachi):
+            self.otmetit_po_indeksu(pozicia)
+    
+    def udalit_po_stroke(self, nomer):
+        """Удалить задачу, показанную в строке пула"""
+        pozicia = self.pervaia_stroka + nomer
+        if pozicia < len(self.otkrytye_zadachi):
+            self.udalit_po_indeksu(pozicia)
+    
+    @tochka_zamera('okno.obnovit_statistiku')
+    def obnovit_statistiku(self):
+        """Обновить статистику по счётчикам списка (без обхода задач и магазинов)"""
+        spisok = self.spisok_zadach
+        prosrocheno = spisok.chislo_prosrochennyh()
+        na_segodnia = spisok.chislo_na_segodnia()
+        self.stats_label.config(text=f"Всего задач: {len(spisok)} | Выполнено: {spisok.vypolneno} "
+                                     f"| Осталось: {spisok.otkryto}\nНа сегодня: {na_segodnia} "
+                                     f"| Просрочено: {prosrocheno}")
+        
+        if hasattr(self, 'metka_statistiki'):
+            sroki = "".join(f"\n    {srok or 'Без срока'}: {chislo}"
+                            for srok, chislo in spisok.po_srokam(5))
+            self.metka_statistiki.config(text=f"""📊 Статистика программы:
+
+• Всего задач в системе: {len(spisok)} (выполнено {spisok.vypolneno}, осталось {spisok.otkryto})
+• Невыполненные по срокам:{sroki or " нет"}
+• Срок истекает сегодня: {na_segodnia}, просрочено: {prosrocheno}
+• Магазинов создано: {len(self.spisok_magazinov)}
+• Общее количество товаров: {self.vsego_tovarov}
+        """)
+    
+    def napomnit(self, zadachi):
+        """Сообщить об истёкших сроках и перекрасить сроки в списке"""
+        self.root.bell()
+        if hasattr(self, 'status_label'):
+            eshche = f" и ещё {len(zadachi) - 1}" if len(zadachi) > 1 else ""
+            self.status_label.config(text=f"⏰ Срок истёк: {zadachi[0].opisanie[:20]}{eshche}")
+        if hasattr(self, 'task_list_frame'):
+            self.pokazat_vidimye_zadachi()
+            self.obnovit_statistiku()
+    
+    def otmetit_po_indeksu(self, index):
+        """Отметить задачу по индексу в списке невыполненных"""
+        if 0 <= index < len(self.otkrytye_zadachi):
+            zadacha = self.otkrytye_zadachi[index]
+            self.zhurnal_izmenenii.otmetit_zadachu(self.spisok_zadach, zadacha)
+            if hasattr(self, 'status_label'):
+                if zadacha.povtor is not None:
+                    self.status_label.config(text=f"Повтор выполнен, следующий - "
+                                                  f"{datetime.fromtimestamp(zadacha.srok_do - 1):%d.%m.%Y}")
+                else:
+                    self.status_label.config(text="Задача отмечена как выполненная")
+    
+    def udalit_po_indeksu(self, index):
+        """Удалить задачу по индексу в списке невыполненных"""
+        if 0 <= index < len(self.otkrytye_zadachi):
+            zadacha = self.otkrytye_zadachi[index]
+            opisanie = zadacha.opisanie
+            self.zhurnal_izmenenii.udalit_zadachu(self.spisok_zadach, zadacha)
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Задача удалена: {opisanie[:20]}...")
+    
+    def otmetit_gotovoi(self):
+        """Отметить выбранную задачу как выполненную"""
+        if not self.spisok_zadach:
+            messagebox.showwarning("Внимание", "Нет задач для отметки")
+            return
+        
+        # Первая невыполненная задача - первая в списке открытых
+        if self.otkrytye_zadachi:
+            self.zhurnal_izmenenii.otmetit_zadachu(self.spisok_zadach, self.otkrytye_zadachi[0])
+    
+    def redaktirovat_zadachu(self):
+        """Редактировать задачу (заглушка)"""
+        messagebox.showinfo("Редактирование", "Функция редактирования в разработке")
+    
+    def udalit_zadachu(self):
+        """Удалить задачу (заглушка)"""
+        if not self.spisok_zadach:
+            messagebox.showwarning("Внимание", "Нет задач для удаления")
+            return
+        
+        # Удаляем первую невыполненную задачу
+        if self.otkrytye_zadachi:
+            self.zhurnal_izmenenii.udalit_zadachu(self.spisok_zadach, self.otkrytye_zadachi[0])
+    
+    # ============================================
+    # АРХИВ ВЫПОЛНЕННЫХ ЗАДАЧ
+    # ============================================
+    
+    def zaplanirovat_poisk_arhiva(self):
+        """Отложить поиск по архиву до паузы в наборе"""
+        if self.poisk_arhiva_zaplanirovan is not None:
+            self.root.after_cancel(self.poisk_arhiva_zaplanirovan)
+        self.poisk_arhiva_zaplanirovan = self.root.after(100, self.nachat_poisk_arhiva)
+    
+    def nachat_poisk_arhiva(self):
+        """Показать первую страницу архива под новую строку поиска"""
+        self.poisk_arhiva_zaplanirovan = None
+        self.stranicy_arhiva.clear()
+        self.nachalo_arhiva = 0
+        self.pokazat_stranicu_arhiva()
+    
+    @tochka_zamera('okno.pokazat_stranicu_arhiva')
+    def pokazat_stranicu_arhiva(self):
+        """Вывести страницу архива с позиции nachalo_arhiva
+        
+        Просмотр идёт только до STRANICA_ARHIVA задач (с поиском -
+        найденных), и следующая страница продолжает его с того места,
+        где он остановился.
+        """
+        spisok = self.spisok_zadach
+        tekst = self.tekst_poiska_arhiva.get().strip()
+        if tekst:
+            zadachi, self.dalshe_arhiva = spisok.iskat_v_arhive(tekst, self.nachalo_arhiva,
+                                                                STRANICA_ARHIVA)
+        else:
+            zadachi, self.dalshe_arhiva = spisok.stranica_arhiva(self.nachalo_arhiva, STRANICA_ARHIVA)
+        
+        self.nomera_arhiva = [z.nomer for z in zadachi]
+        self.spisok_arhiva.delete(0, 'end')
+        for z in zadachi:
+            self.spisok_arhiva.insert('end', f"✓ {z.data_vypolnenia}  {z.opisanie[:50]}  ({z.srok})")
+        
+        self.knopka_nazad_arhiva.config(state='normal' if self.stranicy_arhiva else 'disabled')
+        self.knopka_vpered_arhiva.config(state='disabled' if self.dalshe_arhiva is None else 'normal')
+        self.metka_arhiva.config(text=f"Страница {len(self.stranicy_arhiva) + 1} | "
+                                      f"в архиве задач: {spisok.vypolneno}")
+    
+    def sleduiushchaia_stranica_arhiva(self):
+        """Показать более старые выполненные задачи"""
+        if self.dalshe_arhiva is None:
+            return
+        self.stranicy_arhiva.append(self.nachalo_arhiva)
+        self.nachalo_arhiva = self.dalshe_arhiva
+        self.pokazat_stranicu_arhiva()
+    
+    def predydushchaia_stranica_arhiva(self):
+        """Вернуться к более новым выполненным задачам"""
+        if not self.stranicy_arhiva:
+            return
+        self.nachalo_arhiva = self.stranicy_arhiva.pop()
+        self.pokazat_stranicu_arhiva()
+    
+    def vernut_iz_arhiva(self):
+        """Снять отметку с выбранной задачи архива"""
+        vybor = self.spisok_arhiva.curselection()
+        if not vybor:
+            messagebox.showwarning("Внимание", "Выберите задачу в архиве")
+            return
+        zadacha = self.spisok_zadach.po_nomeru(self.nomera_arhiva[vybor[0]])
+        if zadacha is None:
+            return
+        self.zhurnal_izmenenii.vernut_zadachu(self.spisok_zadach, zadacha)
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text=f"Задача снова в работе: {zadacha.opisanie[:20]}...")
+    
+    # ============================================
+    # МЕТОДЫ ДЛЯ РАБОТЫ С МАГАЗИНАМИ
+    # ============================================
+    
+    def zaplanirovat_poisk(self):
+        """Отложить поиск до паузы в наборе, чтобы не искать на каждую букву"""
+        if self.poisk_zaplanirovan is not None:
+            self.root.after_cancel(self.poisk_zaplanirovan)
+        self.poisk_zaplanirovan = self.root.after(100, self.vypolnit_poisk)
+    
+    def vypolnit_poisk(self):
+        """Найти в фоне товары, подходящие под строку поиска, с лучшей ценой"""
+        self.poisk_zaplanirovan = None
+        zapros = self.tekst_poiska.get()
+        indeks = self.indeks_tovarov
+        
+        def iskat(zadanie):
+            # Индекс меняется в потоке Tk - ищем под его замком
+            return [(kluch, f"{nazvanie} — от {cena:.2f} руб. "
+                            f"({magazin.nazvanie}, магазинов: {magazinov})")
+                    for kluch, nazvanie, magazin, cena, magazinov in indeks.naiti_s_cenami(zapros)]
+        
+        self.fon.zapustit(iskat, self.pokazat_rezultaty_poiska, kluch='poisk')
+    
+    @tochka_zamera('okno.pokazat_rezultaty_poiska')
+    def pokazat_rezultaty_poiska(self, rezultaty):
+        """Вывести найденные товары в список"""
+        self.kluchi_poiska = [kluch for kluch, _ in rezultaty]
+        self.rezultaty_poiska.delete(0, 'end')
+        for _, tekst in rezultaty:
+            self.rezultaty_poiska.insert('end', tekst)
+    
+    def vybrat_rezultat_poiska(self):
+        """Открыть магазин с самой низкой ценой на найденный товар"""
+        vybor = self.rezultaty_poiska.curselection()
+        if not vybor:
+            return
+        kluch = self.kluchi_poiska[vybor[0]]
+        magazin, cena = self.indeks_tovarov.samyi_deshevyi(kluch)
+        tovar = self.indeks_tovarov.predlozheniia[kluch][magazin.nomer][0]
+        
+        self.vybrannyi_magazin.set(self.spisok_magazinov.metka(magazin))
+        self.vybrat_magazin()
+        self.pole_tovara.delete(0, 'end')
+        self.pole_tovara.insert(0, tovar)
+        self.metka_rezultata.config(text=f"💰 Дешевле всего: {cena:.2f} руб. в «{magazin.nazvanie}»",
+                                    fg=COLORS['success'])
+    
+    @tochka_zamera('okno.obnovit_spisok_magazinov')
+    def obnovit_spisok_magazinov(self):
+        """Заполнить список выбора магазинов по реестру"""
+        vybrannyi = self.vybrannyi()
+        self.magaziny_po_metke = {self.spisok_magazinov.metka(m): m.nomer
+                                  for m in self.spisok_magazinov}
+        self.magazin_combo.config(values=list(self.magaziny_po_metke))
+        
+        # Подпись выбранного магазина могла измениться
+        if vybrannyi is not None and vybrannyi.nomer in self.spisok_magazinov.po_nomeru:
+            self.vybrannyi_magazin.set(self.spisok_magazinov.metka(vybrannyi))
+    
+    def pri_izmenenii_reestra(self, sobytie, magazin):
+        """Обновить список выбора, если вкладка магазинов уже построена"""
+        if hasattr(self, 'magazin_combo'):
+            self.obnovit_spisok_magazinov()
+    
+    def vybrannyi(self):
+        """Выбранный в списке магазин (None, если ничего не выбрано)"""
+        nomer = self.magaziny_po_metke.get(self.vybrannyi_magazin.get())
+        return self.spisok_magazinov.po_nomeru.get(nomer)
+    
+    def vybrat_magazin(self):
+        """Показать только что выбранный магазин с начала отчёта"""
+        self.pervaia_stroka_tovarov = 0
+        self.pokazat_info_magazina()
+    
+    def izmenit_razmer_tablicy(self, event):
+        """Пересчитать число видимых строк таблицы (без строки заголовков)"""
+        strok = max(1, event.height // self.vysota_stroki_tablicy - 1)
+        if strok != self.strok_tovarov:
+            self.strok_tovarov = strok
+            self.pokazat_info_magazina()
+    
+    def prokrutit_tovary(self, *args):
+        """Обработать прокрутку таблицы ('moveto' или 'scroll')"""
+        magazin = self.vybrannyi()
+        if magazin is None:
+            return 'break'
+        if args[0] == 'moveto':
+            self.pervaia_stroka_tovarov = int(float(args[1]) * magazin.chislo_tovarov)
+        elif args[0] == 'scroll':
+            shag = int(args[1])
+            if args[2] == 'pages':
+                shag *= self.strok_tovarov
+            self.pervaia_stroka_tovarov += shag
+        self.narisovat_tovary(magazin)
+        return 'break'
+    
+    def sortirovat_tovary(self, pole):
+        """Упорядочить таблицу по колонке; повторный щелчок меняет направление"""
+        staroe, ubyvanie = self.sortirovka
+        # Числа сначала по убыванию, названия - по алфавиту
+        self.sortirovka = (pole, not ubyvanie if pole == staroe else pole != 'nazvanie')
+        self.pervaia_stroka_tovarov = 0
+        self.pokazat_sortirovku()
+        self.pokazat_info_magazina()
+    
+    def pokazat_sortirovku(self):
+        """Отметить стрелкой колонку, по которой упорядочена таблица"""
+        pole_sortirovki, ubyvanie = self.sortirovka
+        for pole, nazvanie, _ in KOLONKI_TABLICY:
+            if pole == pole_sortirovki:
+                nazvanie += " ▼" if ubyvanie else " ▲"
+            self.tablica_tovarov.heading(pole, text=nazvanie)
+    
+    def sledit_za_magazinom(self, magazin):
+        """Получать события магазина, показанного в таблице"""
+        if magazin is self.magazin_v_tablice:
+            return
+        if self.magazin_v_tablice is not None:
+            self.magazin_v_tablice.otpisat(self.pri_izmenenii_magazina)
+        if magazin is not None:
+            magazin.podpisat(self.pri_izmenenii_magazina)
+        self.magazin_v_tablice = magazin
+    
+    def pokazat_info_magazina(self):
+        """Показать сводку и видимые строки таблицы выбранного магазина"""
+        magazin = self.vybrannyi()
+        self.sledit_za_magazinom(magazin)
+        
+        if not magazin:
+            return
+        
+        self.narisovat_svodku(magazin)
+        self.narisovat_tovary(magazin)
+    
+    def pri_izmenenii_magazina(self, sobytie, magazin, tovar):
+        """Обновить таблицу по событию показанного магазина
+        
+        Цена или количество, не входящие в ключ сортировки, меняют
+        только строку этого товара, если она видна. Иначе товар мог
+        сдвинуться, и видимые строки берутся из порядка заново.
+        """
+        self.narisovat_svodku(magazin)
+        pole = self.sortirovka[0]
+        if sobytie in ('cena', 'kolichestvo') and pole not in (sobytie, 'summa'):
+            if self.tablica_tovarov.exists(tovar):
+                info = magazin.tovary[tovar]
+                self.tablica_tovarov.item(tovar, values=self.stroka_tablicy(
+                    tovar, info['cena'], info['kolichestvo']))
+            return
+        self.narisovat_tovary(magazin)
+    
+    def narisovat_svodku(self, magazin):
+        """Вывести сводку магазина над таблицей (итоги ведёт сам магазин)"""
+        tekst = f"🏪 {magazin.nazvanie}   📍 {magazin.adres}   📊 {magazin.tip}   📅 {magazin.data_sozdania}\n"
+        if magazin.chislo_tovarov:
+            tekst += (f"📦 Товаров: {magazin.chislo_tovarov} (штук: {magazin.vsego_shtuk})   "
+                      f"🏷 {magazin.min_cena():.2f}–{magazin.max_cena():.2f} руб.   "
+                      f"💰 {magazin.obshchaia_stoimost():.2f} руб.")
+        else:
+            tekst += "📭 В магазине нет товаров"
+        self.metka_svodki.config(text=tekst)
+    
+    @staticmethod
+    def stroka_tablicy(tovar, cena, kolichestvo):
+        """Значения колонок таблицы для товара"""
+        return tovar, f"{cena:.2f}", kolichestvo, f"{cena * kolichestvo:.2f}"
+    
+    @tochka_zamera('okno.narisovat_tovary')
+    def narisovat_tovary(self, magazin):
+        """Показать видимый срез порядка магазина в таблице
+        
+        Строки с теми же товарами остаются и только переставляются,
+        так что прокрутка на строку меняет одну строку таблицы.
+        """
+        pole, ubyvanie = self.sortirovka
+        vsego = magazin.chislo_tovarov
+        pervaia = max(0, min(self.pervaia_stroka_tovarov, vsego - self.strok_tovarov))
+        self.pervaia_stroka_tovarov = pervaia
+        stroki = magazin.tovary_po(pole, pervaia, self.strok_tovarov, ubyvanie)
+        
+        tablica = self.tablica_tovarov
+        vidimye = {tovar for tovar, _, _ in stroki}
+        lishnie = [kluch for kluch in tablica.get_children() if kluch not in vidimye]
+        if lishnie:
+            tablica.delete(*lishnie)
+        for i, (tovar, cena, kolichestvo) in enumerate(stroki):
+            znacheniia = self.stroka_tablicy(tovar, cena, kolichestvo)
+            if tablica.exists(tovar):
+                tablica.item(tovar, values=znacheniia)
+                tablica.move(tovar, '', i)
+            else:
+                tablica.insert('', i, iid=tovar, values=znacheniia)
+        
+        if vsego:
+            self.scrollbar_tovarov.set(pervaia / vsego, min(1.0, (pervaia + self.strok_tovarov) / vsego))
+        else:
+            self.scrollbar_tovarov.set(0.0, 1.0)
+    
+    def vybrat_tovar(self):
+        """Подставить выбранный в таблице товар в поля управления"""
+        vybrano = self.tablica_tovarov.selection()
+        magazin = self.vybrannyi()
+        if not vybrano or magazin is None or vybrano[0] not in magazin.tovary:
+            return
+        info = magazin.tovary[vybrano[0]]
+        for pole, znachenie in ((self.pole_tovara, vybrano[0]),
+                                (self.pole_ceny, f"{info['cena']:g}"),
+                                (self.pole_kolichestva, info['kolichestvo'])):
+            pole.delete(0, 'end')
+            pole.insert(0, znachenie)
+    
+    def dobavit_tovar(self):
+        """Добавить товар в магазин"""
+        magazin = self.vybrannyi()
+        tovar = self.pole_tovara.get().strip()
+        cena_text = self.pole_ceny.get().strip()
+        kol_text = self.pole_kolichestva.get().strip()
+        
+        if magazin is None:
+            self.metka_rezultata.config(text="❌ Выберите магазин", fg=COLORS['danger'])
+            return
+        
+        if not tovar or not cena_text:
+            self.metka_rezultata.config(text="❌ Заполните название и цену", fg=COLORS['danger'])
+            return
+        
+        try:
+            cena = float(cena_text)
+            kolichestvo = int(kol_text) if kol_text else 1
+        except ValueError:
+            self.metka_rezultata.config(text="❌ Цена и количество должны быть числами", fg=COLORS['danger'])
+            return
+        
+        try:
+            self.zhurnal_izmenenii.dobavit_tovar(magazin, tovar, cena, kolichestvo)
+        except ValueError as oshibka:
+            self.metka_rezultata.config(text=f"❌ {oshibka}", fg=COLORS['danger'])
+            return
+        
+        self.pole_tovara.delete(0, 'end')
+        self.pole_ceny.delete(0, 'end')
+        self.metka_rezultata.config(text=f"✅ Товар '{tovar}' добавлен", fg=COLORS['success'])
+        
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text=f"Товар добавлен: {tovar}")
+    
+    def udalit_tovar(self):
+        """Удалить товар из магазина"""
+        magazin = self.vybrannyi()
+        tovar = self.pole_tovara.get().strip()
+        
+        if not tovar:
+            self.metka_rezultata.config(text="❌ Введите название товара", fg=COLORS['danger'])
+            return
+        
+        udalen = magazin is not None and self.zhurnal_izmenenii.udalit_tovar(magazin, tovar)
+        
+        if udalen:
+            self.pole_tovara.delete(0, 'end')
+            self.metka_rezultata.config(text=f"✅ Товар '{tovar}' удален", fg=COLORS['success'])
+            
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Товар удален: {tovar}")
+        else:
+            self.metka_rezultata.config(text=f"❌ Товар '{tovar}' не найден", fg=COLORS['danger'])
+    
+    def izmenit_cenu(self):
+        """Изменить цену товара"""
+        magazin = self.vybrannyi()
+        tovar = self.pole_tovara.get().strip()
+        cena_text = self.pole_ceny.get().strip()
+        
+        if not tovar or not cena_text:
+            self.metka_rezultata.config(text="❌ Заполните название и новую цену", fg=COLORS['danger'])
+            return
+        
+        try:
+            novaia_cena = float(cena_text)
+        except ValueError:
+            self.metka_rezultata.config(text="❌ Цена должна быть числом", fg=COLORS['danger'])
+            return
+        
+        try:
+            obnovlen = (magazin is not None
+                        and self.zhurnal_izmenenii.obnovit_cenu(magazin, tovar, novaia_cena))
+        except ValueError:
+            self.metka_rezultata.config(text="❌ Цена не может быть отрицательной", fg=COLORS['danger'])
+            return
+        
+        if obnovlen:
+            self.metka_rezultata.config(text=f"✅ Цена товара '{tovar}' изменена", fg=COLORS['success'])
+            
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Цена изменена: {tovar}")
+        else:
+            self.metka_rezultata.config(text=f"❌ Товар '{tovar}' не найден", fg=COLORS['danger'])
+    
+    def uznat_cenu_tovara(self):
+        """Узнать цену товара"""
+        magazin = self.vybrannyi()
+        tovar = self.pole_tovara.get().strip()
+        
+        if not tovar:
+            self.metka_rezultata.config(text="❌ Введите название товара", fg=COLORS['danger'])
+            return
+        
+        cena = magazin.uznat_cenu(tovar) if magazin is not None else None
+        
+        if cena is not None:
+            self.metka_rezultata.config(text=f"💰 Цена '{tovar}': {cena:.2f} руб.", fg=COLORS['success'])
+            
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=f"Найдена цена: {tovar}")
+        else:
+            self.metka_rezultata.config(text=f"❌ Товар '{tovar}' не найден", fg=COLORS['danger'])
+    
+    # ============================================
+    # ОТМЕНА И ПОВТОР
+    # ============================================
+    
+    def pri_klavishe_otmeny(self, event, deistvie):
+        """Ctrl+Z/Ctrl+Y окна: в поле ввода клавиши остаются полю, а не журналу изменений"""
+        if isinstance(event.widget, POLIA_VVODA):
+            return
+        deistvie()
+    
+    def otmenit_izmenenie(self):
+        """Отменить последнее изменение (Ctrl+Z)"""
+        zapis = self.zhurnal_izmenenii.otmenit()
+        if zapis is not None and hasattr(self, 'status_label'):
+            self.status_label.config(text=f"Отменено: {zapis[0]}")
+    
+    def povtorit_izmenenie(self):
+        """Повторить отменённое изменение (Ctrl+Y)"""
+        zapis = self.zhurnal_izmenenii.povtorit()
+        if zapis is not None and hasattr(self, 'status_label'):
+            self.status_label.config(text=f"Повторено: {zapis[0]}")
+    
+    def pri_izmenenii_zhurnala(self, sobytie, zapis):
+        """Показать магазин, изменение в котором отменено или повторено, и обновить кнопки"""
+        if (sobytie in ('otmeneno', 'povtoreno') and isinstance(zapis[1], Magazin)
+                and hasattr(self, 'magazin_combo') and zapis[1] is not self.vybrannyi()):
+            # Строки таблицы и списка задач обновляются по событиям
+            # самих объектов; здесь - только переход к другому магазину
+            self.vybrannyi_magazin.set(self.spisok_magazinov.metka(zapis[1]))
+            self.vybrat_magazin()
+        
+        if hasattr(self, 'knopka_otkata'):
+            otmenit = self.zhurnal_izmenenii.mozhno_otmenit()
+            povtorit = self.zhurnal_izmenenii.mozhno_povtorit()
+            self.knopka_otkata.config(state='normal' if otmenit else 'disabled',
+                                      text=f"↶ {otmenit}" if otmenit else "↶")
+            self.knopka_povtora.config(state='normal' if povtorit else 'disabled',
+                                       text=f"↷ {povtorit}" if povtorit else "↷")
+    
+    # ============================================
+    # ИМПОРТ И ЭКСПОРТ
+    # ============================================
+    
+    def importirovat_tovary(self):
+        """Загрузить товары из файла в выбранный магазин"""
+        magazin = self.vybrannyi()
+        if magazin is None:
+            self.metka_rezultata.config(text="❌ Выберите магазин", fg=COLORS['danger'])
+            return
+        put = filedialog.askopenfilename(title="Импорт товаров", filetypes=TIPY_FAILOV)
+        if not put:
+            return
+        
+        def zavershit():
+            magazin.pereschitat_itogi()
+            magazin.soobshchit('zagruzheny', None)
+            self.pokazat_info_magazina()
+        
+        self.zapustit_import(
+            lambda progress: chitat_tovary(put, progress=progress),
+            lambda paket: magazin.zagruzit_tovary(paket, proveriat=False, pereschitat=False),
+            zavershit, "товаров")
+    
+    def importirovat_zadachi(self):
+        """Добавить задачи из файла"""
+        put = filedialog.askopenfilename(title="Импорт задач", filetypes=TIPY_FAILOV)
+        if not put:
+            return
+        # Пакеты сразу уходят в список, а событие - одно в конце:
+        # иначе список на экране и снимок хранилища обновлялись бы много раз
+        self.zapustit_import(lambda progress: chitat_zadachi(put, progress=progress),
+                             lambda paket: self.spisok_zadach.zagruzit(paket, soobshchit=False),
+                             lambda: self.spisok_zadach.uvedomit('zagruzheny', None), "задач")
+    
+    def zapustit_import(self, sozdat_istochnik, primenit, zavershit, chego):
+        """Читать записи в пуле, а применять их в потоке Tk
+        
+        sozdat_istochnik(progress) возвращает поток записей. Задание
+        пула кладёт пакеты записей в ограниченную очередь (памяти нужно
+        на несколько пакетов, каким бы ни был файл), окно забирает их
+        по таймеру root.after и передаёт в primenit. В конце (и после
+        ошибки или отмены) вызывается zavershit. Задание не ждёт места
+        в очереди дольше, чем его не отменили: при ошибке в окне,
+        отмене и закрытии программы оно выходит, а очередь очищается.
+        """
+        if self.zhdat_zagruzki():
+            return
+        if self.import_idet:
+            self.status_label.config(text="⏳ Импорт уже идёт")
+            return
+        self.import_idet = True
+        ochered = queue.Queue(maxsize=4)
+        
+        def polozhit(zadanie, soobshchenie):
+            # Окно могло перестать забирать пакеты - тогда задание отменено
+            while not zadanie.otmeneno:
+                try:
+                    ochered.put(soobshchenie, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            raise ZadanieOtmeneno(zadanie.opisanie)
+        
+        def rabota(zadanie):
+            try:
+                for paket in pakety(sozdat_istochnik(zadanie.otmetit_hod), 20000):
+                    polozhit(zadanie, ('paket', paket))
+                polozhit(zadanie, ('gotovo', None))
+            except ZadanieOtmeneno:
+                pass        # об отмене окно узнаёт по zadanie.otmeneno
+            except Exception as oshibka:
+                try:
+                    polozhit(zadanie, ('oshibka', oshibka))
+                except ZadanieOtmeneno:
+                    pass
+        
+        zadanie = self.fon.zapustit(rabota, kluch='import', opisanie=f"Импорт {chego}")
+        self.root.after(50, self.proverit_import, zadanie, ochered, primenit, zavershit, chego, 0)
+    
+    def proverit_import(self, zadanie, ochered, primenit, zavershit, chego, zagruzheno):
+        """Применить пришедшие пакеты импорта"""
+        # Не больше двух пакетов за раз, чтобы окно успевало отвечать
+        for _ in range(2):
+            if zadanie.otmeneno:
+                vid, dannye = 'otmeneno', None
+            else:
+                try:
+                    vid, dannye = ochered.get_nowait()
+                except queue.Empty:
+                    break
+            if vid == 'paket':
+                try:
+                    primenit(dannye)
+                except Exception as oshibka:
+                    vid, dannye = 'oshibka', oshibka
+                else:
+                    zagruzheno += len(dannye)
+                    continue
+            
+            # Задание больше не нужно: отпускаем его и непрочитанные пакеты
+            if self.fon.aktivnye.get(zadanie.kluch) is zadanie:
+                self.fon.otmenit(zadanie.kluch)
+            while not ochered.empty():
+                ochered.get_nowait()
+            zavershit()
+            self.import_idet = False
+            if vid == 'gotovo':
+                self.status_label.config(text=f"✅ Импортировано {chego}: {zagruzheno}")
+            elif vid == 'otmeneno':
+                self.status_label.config(text=f"⏹ Импорт отменён, загружено записей: {zagruzheno}")
+            else:
+                self.status_label.config(text=f"❌ Импорт прерван после {zagruzheno} записей")
+                messagebox.showerror("Ошибка импорта", str(dannye))
+            return
+        
+        self.root.after(50, self.proverit_import, zadanie, ochered, primenit, zavershit, chego, zagruzheno)
+    
+    def eksportirovat_tovary(self):
+        """Выгрузить товары выбранного магазина в файл"""
+        magazin = self.vybrannyi()
+        if magazin is None:
+            self.metka_rezultata.config(text="❌ Выберите магазин", fg=COLORS['danger'])
+            return
+        put = filedialog.asksaveasfilename(title="Экспорт товаров", defaultextension=".csv",
+                                           filetypes=TIPY_FAILOV)
+        if put:
+            # Строки копируются в потоке Tk: колонки магазина меняются только в нём
+            zapisi = list(stroki_tovarov(magazin))
+            self.fon.zapustit(lambda zadanie: zapisat_zapisi(put, KOLONKI_TOVAROV, zapisi, len(zapisi),
+                                                             progress=zadanie.otmetit_hod),
+                              lambda chislo: self.status_label.config(text=f"📤 Выгружено товаров: {chislo}"),
+                              kluch='eksport_tovarov', opisanie="Экспорт товаров")
+    
+    def eksportirovat_zadachi(self):
+        """Выгрузить все задачи в файл"""
+        put = filedialog.asksaveasfilename(title="Экспорт задач", defaultextension=".csv",
+                                           filetypes=TIPY_FAILOV)
+        if put:
+            # Список задач копируется сразу: пока идёт выгрузка, его могут менять
+            zadachi = list(self.spisok_zadach)
+            self.fon.zapustit(lambda zadanie: eksportirovat_zadachi(zadachi, put, progress=zadanie.otmetit_hod),
+                              lambda chislo: self.status_label.config(text=f"📤 Выгружено задач: {chislo}"),
+                              kluch='eksport_zadach', opisanie="Экспорт задач")
+    
+    def pokazat_hod_zadanii(self, zadaniia):
+        """Показать в строке состояния идущие фоновые задания"""
+        if not hasattr(self, 'status_label'):
+            return
+        if not zadaniia:
+            self.knopka_otmeny.pack_forget()
+            return
+        zadanie = zadaniia[0]
+        tekst = f"⏳ {zadanie.opisanie}"
+        if zadanie.progress is not None:
+            tekst += f": {zadanie.progress:.0%}"
+        if len(zadaniia) > 1:
+            tekst += f" (и ещё {len(zadaniia) - 1})"
+        self.status_label.config(text=tekst)
+        self.knopka_otmeny.pack(side='right', padx=10)
+    
+    def otmenit_zadaniia(self):
+        """Отменить фоновые задания, кроме загрузки сохранённых данных"""
+        for kluch in list(self.fon.aktivnye):
+            if kluch != 'zagruzka':
+                self.fon.otmenit(kluch)
+    
+    def pri_oshibke_zadaniia(self, zadanie, oshibka):
+        """Сообщить об ошибке фонового задания"""
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text=f"❌ {zadanie.opisanie or 'Фоновое задание'}: {oshibka}")
+    
+    # ============================================
+    # МЕТОДЫ ДЛЯ ПРОВЕРКИ
+    # ============================================
+    
+    def proverit_vse(self):
+        """Проверить все классы и методы (в фоне)"""
+        # Сведения о данных программы берём сразу, в потоке Tk
+        zadach = len(self.spisok_zadach)
+        magaziny = [(magazin.nazvanie, len(magazin.tovary)) for magazin in self.spisok_magazinov]
+        self.fon.zapustit(lambda zadanie: self.sobrat_proverku(zadach, magaziny),
+                          self.pokazat_proverku, kluch='proverka', opisanie="Проверка классов")
+    
+    def sobrat_proverku(self, zadach, magaziny):
+        """Проверить классы на тестовых объектах и вернуть текст отчёта"""
+        result_text = "=" * 60 + "\n"
+        result_text += "           ПОЛНАЯ ПРОВЕРКА РАБОТЫ КЛАССОВ\n"
+        result_text += "=" * 60 + "\n\n"
+        
+        # Проверка класса Zadacha
+        result_text += "[1] ПРОВЕРКА КЛАССА ZADACHA\n"
+        result_text += "-" * 40 + "\n"
+        
+        test_zadacha = Zadacha("Тестовая задача", "Сегодня")
+        result_text += f"✓ Создана задача: {test_zadacha}\n"
+        
+        test_zadacha.otmetit_gotovoi()
+        result_text += f"✓ Задача отмечена как выполненная\n"
+        result_text += f"✓ Статус задачи: {test_zadacha.status}\n"
+        result_text += f"✓ Краткая информация: {test_zadacha.info_kratko()}\n\n"
+        
+        # Проверка класса Magazin
+        result_text += "[2] ПРОВЕРКА КЛАССА MAGAZIN\n"
+        result_text += "-" * 40 + "\n"
+        
+        test_magazin = Magazin("Тестовый магазин", "ул. Тестовая, 1", "Тестовый")
+        result_text += f"✓ Создан магазин: {test_magazin.nazvanie}\n"
+        
+        # Добавление товаров
+        test_magazin.dobavit_tovar("Тестовый товар 1", 100, 5)
+        test_magazin.dobavit_tovar("Тестовый товар 2", 200, 3)
+        result_text += f"✓ Добавлено 2 тестовых товара\n"
+        
+        # Проверка цен
+        cena = test_magazin.uznat_cenu("Тестовый товар 1")
+        result_text += f"✓ Цена 'Тестовый товар 1': {cena} руб.\n"
+        
+        # Изменение цены
+        test_magazin.obnovit_cenu("Тестовый товар 1", 150)
+        novaia_cena = test_magazin.uznat_cenu("Тестовый товар 1")
+        result_text += f"✓ Новая цена 'Тестовый товар 1': {novaia_cena} руб.\n"
+        
+        # Удаление товара
+        test_magazin.udalit_tovar("Тестовый товар 2")
+        result_text += f"✓ Товар 'Тестовый товар 2' удален\n"
+        
+        # Общая стоимость
+        total = test_magazin.obshchaia_stoimost()
+        result_text += f"✓ Общая стоимость товаров: {total:.2f} руб.\n\n"
+        
+        # Проверка данных в программе
+        result_text += "[3] ПРОВЕРКА ДАННЫХ В ПРОГРАММЕ\n"
+        result_text += "-" * 40 + "\n"
+        
+        result_text += f"✓ Всего задач в системе: {zadach}\n"
+        result_text += f"✓ Магазинов создано: {len(magaziny)}\n"
+        
+        for i, (nazvanie, tovarov) in enumerate(magaziny, 1):
+            result_text += f"  {i}. {nazvanie}: {tovarov} товаров\n"
+        
+        result_text += "\n" + "=" * 60 + "\n"
+        result_text += "           ПРОВЕРКА ЗАВЕРШЕНА УСПЕШНО!\n"
+        result_text += "=" * 60 + "\n"
+        result_text += "\n✅ Все классы работают корректно!\n"
+        result_text += "✅ Все методы выполняются без ошибок!\n"
+        result_text += "✅ Программа готова к использованию!\n"
+        return result_text
+    
+    def pokazat_proverku(self, result_text):
+        """Вывести отчёт проверки"""
+        self.pole_rezultatov.config(state='normal')
+        self.pole_rezultatov.delete('1.0', 'end')
+        self.pole_rezultatov.insert('1.0', result_text)
+        self.pole_rezultatov.config(state='disabled')
+        
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text="Полная проверка выполнена успешно!")
+    
+    # ============================================
+    # ЗАМЕРЫ ПРОИЗВОДИТЕЛЬНОСТИ
+    # ============================================
+    
+    def pereklyuchit_slezhenie(self):
+        """Начать или остановить живые замеры на панели"""
+        self.slezhenie = not self.slezhenie
+        if self.slezhenie:
+            if not self.zamery_vsegda:
+                self.nachat_zamery()
+            self.knopka_slezheniia.config(text="⏸ Остановить", bg=COLORS['danger'])
+            self.proverit_zaderzhku(time.perf_counter())
+            self.obnovit_panel_metrik()
+        else:
+            self.knopka_slezheniia.config(text="▶ Следить", bg=COLORS['success'])
+            for taimer in self.taimery_slezheniia.values():
+                self.root.after_cancel(taimer)
+            self.taimery_slezheniia.clear()
+            if not self.zamery_vsegda:
+                self.ostanovit_zamery()
+            # Трассировка памяти заметно замедляет программу - только при слежении
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.snimok_pamiati = None
+    
+    def nachat_zamery(self):
+        """Замерять отмеченные методы и обработчики Tk"""
+        if self.metriki is None:
+            self.metriki = Metriki()
+        vkliuchit(self.metriki)
+        self.metriki_obrabotchikov = self.metriki
+    
+    def ostanovit_zamery(self):
+        """Вернуть методам и обработчикам вызов без замеров"""
+        vykliuchit()
+        self.metriki_obrabotchikov = None
+    
+    def pri_razrushenii(self, event):
+        """Окно закрыто - вернуть tkinter обычные обработчики"""
+        # <Destroy> корня приходит и от каждого вложенного виджета
+        if event.widget is self.root:
+            IzmeriaemyiVyzov.sniat(self.root)
+    
+    def vygruzhat_metriki(self, put, openmetrics=False):
+        """Переписывать файл замеров в пуле каждые SHAG_VYGRUZKI мс"""
+        self.fon.zapustit(lambda zadanie: eksportirovat(self.metriki, put, openmetrics),
+                          kluch='metriki')
+        self.root.after(SHAG_VYGRUZKI, self.vygruzhat_metriki, put, openmetrics)
+    
+    def proverit_zaderzhku(self, ozhidalos):
+        """Замерить опоздание таймера - задержку цикла событий Tk"""
+        self.zaderzhka_cikla.zapisat(max(0.0, time.perf_counter() - ozhidalos))
+        self.taimery_slezheniia['zaderzhka'] = self.root.after(
+            SHAG_ZADERZHKI, self.proverit_zaderzhku, time.perf_counter() + SHAG_ZADERZHKI / 1000)
+    
+    def obnovit_panel_metrik(self):
+        """Обновлять панель замеров раз в SHAG_PANELI мс, пока идёт слежение"""
+        self.narisovat_panel_metrik()
+        self.taimery_slezheniia['panel'] = self.root.after(SHAG_PANELI, self.obnovit_panel_metrik)
+    
+    def narisovat_panel_metrik(self):
+        """Вывести текущие замеры на панель"""
+        z = self.zaderzhka_cikla
+        pamiat = pamiat_processa()
+        stroki = [
+            f"Задержка цикла Tk: p50 {format_dlitelnosti(z.procentil(50))} | "
+            f"p95 {format_dlitelnosti(z.procentil(95))} | p99 {format_dlitelnosti(z.procentil(99))} | "
+            f"макс {format_dlitelnosti(z.maksimum if z.chislo else None)} ({z.chislo} замеров)",
+            f"Виджетов в списке задач: {posschitat_vidzhety(self.task_list_frame)} | "
+            f"Память процесса: {'н/д' if pamiat is None else f'{pamiat / 2**20:.1f} МБ'}",
+        ]
+        if tracemalloc.is_tracing():
+            tekushchaia, pik = tracemalloc.get_traced_memory()
+            stroki.append(f"tracemalloc: {tekushchaia / 2**20:.1f} МБ (пик {pik / 2**20:.1f} МБ)")
+        else:
+            stroki.append("tracemalloc: выключен (включает «Снимок памяти»)")
+        
+        if self.metriki is not None:
+            stroki += ["", f"{'операция':40} {'вызовов':>7} {'p50':>9} {'p95':>9} {'p99':>9}"]
+            svodka = sorted(self.metriki.svodka(), key=lambda s: s[2][1], reverse=True)
+            for imia, chislo, (p50, p95, p99), _ in svodka[:20]:
+                stroki.append(f"{imia[-40:]:40} {chislo:>7} {format_dlitelnosti(p50):>9} "
+                              f"{format_dlitelnosti(p95):>9} {format_dlitelnosti(p99):>9}")
+            
+            # По самым долгим операциям видно, что шло во время зависания
+            stroki += ["", "Самые долгие из последних операций:"]
+            for nachalo, imia, sekund in self.metriki.medlennye():
+                stroki.append(f"  {datetime.fromtimestamp(nachalo):%H:%M:%S}  "
+                              f"{imia[-40:]:40} {format_dlitelnosti(sekund):>9}")
+        if self.rost_pamiati:
+            stroki += ["", self.rost_pamiati]
+        
+        self.pole_metrik.config(state='normal')
+        self.pole_metrik.delete('1.0', 'end')
+        self.pole_metrik.insert('1.0', "\n".join(stroki))
+        self.pole_metrik.config(state='disabled')
+    
+    def snimok_pamiati_processa(self):
+        """Снять снимок tracemalloc и показать прирост с прошлого снимка"""
+        if not self.slezhenie:
+            self.pereklyuchit_slezhenie()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.snimok_pamiati = tracemalloc.take_snapshot()
+            self.rost_pamiati = "Трассировка памяти включена: следующий снимок покажет прирост"
+            self.narisovat_panel_metrik()
+            return
+        staryi, novyi = self.snimok_pamiati, tracemalloc.take_snapshot()
+        self.snimok_pamiati = novyi
+        
+        def sravnit(zadanie):
+            bez_trassirovki = (tracemalloc.Filter(False, tracemalloc.__file__),)
+            razlichiia = novyi.filter_traces(bez_trassirovki).compare_to(
+                staryi.filter_traces(bez_trassirovki), 'lineno')
+            stroki = ["Прирост памяти с прошлого снимка:"]
+            for r in razlichiia[:8]:
+                mesto = r.traceback[0]
+                fail = os.path.join(*os.path.normpath(mesto.filename).split(os.sep)[-2:])
+                stroki.append(f"  {r.size_diff / 1024:+10.1f} КБ {r.count_diff:+8} блоков  "
+                              f"{fail}:{mesto.lineno}")
+            return "\n".join(stroki)
+        
+        def pokazat(tekst):
+            self.rost_pamiati = tekst
+            self.narisovat_panel_metrik()
+        
+        self.fon.zapustit(sravnit, pokazat, kluch='pamiat', opisanie="Снимок памяти")
+    
+    def sbrosit_zamery(self):
+        """Забыть накопленные замеры"""
+        if self.metriki is not None:
+            self.metriki.sbrosit()
+        self.zaderzhka_cikla = Gistogramma()
+        self.rost_pamiati = ""
+        self.narisovat_panel_metrik()
+
+# ============================================
+# ЗАПУСК ПРОГРАММЫ
+# ============================================
+
+def sozdat_razbor():
+    """Разбор параметров запуска окна"""
+    razbor = argparse.ArgumentParser(prog='TodoShop',
+                                     description="Менеджер задач и магазинов")
+    razbor.add_argument('--papka', default=PAPKA_DANNYH,
+                        help=f"папка с данными (по умолчанию {PAPKA_DANNYH})")
+    razbor.add_argument('--baza', metavar='FAIL',
+                        help="хранить магазины и товары в базе SQLite (задачи остаются в папке)")
+    razbor.add_argument('--bez-demo', action='store_true',
+                        help="не заполнять пустое хранилище примерами")
+    razbor.add_argument('--profile-startup', action='store_true',
+                        help="вывести в stderr время этапов запуска")
+    razbor.add_argument('--glubina-otmeny', type=int, default=100, metavar='N',
+                        help="сколько последних изменений можно отменить (по умолчанию 100)")
+    razbor.add_argument('--metriki', metavar='FAIL',
+                        help="замерять операции и выгружать замеры в файл (формат Prometheus)")
+    razbor.add_argument('--openmetrics', action='store_true',
+                        help="выгружать замеры в формате OpenMetrics")
+    return razbor
+
+
+def main(argv=None, nachalo=None):
+    """Основная функция программы
+    
+    nachalo - время perf_counter() в начале запуска (до импорта
+    модулей), чтобы профиль запуска учитывал и импорт.
+    """
+    argumenty = sozdat_razbor().parse_args(argv)
+    profil = ProfilZapuska(argumenty.profile_startup, nachalo)
+    if nachalo is not None:
+        profil.zapisat("импорт модулей", nachalo)
+    metriki = vkliuchit() if argumenty.metriki else None
+    try:
+        # Создаем главное окно
+        with profil.etap("tk.Tk()"):
+            root = tk.Tk()
+        
+        # Создаем приложение с сохранением данных между запусками
+        baza = SqliteBaza(argumenty.baza) if argumenty.baza else None
+        hranilishche = Hranilishche(argumenty.papka, baza=baza)
+        # Намеренно, один раз за запуск: загруженные задачи и товары живут
+        # до выхода, и gc.freeze() переносит их в постоянное поколение,
+        # чтобы сборщик мусора больше не обходил их. Это состояние всего
+        # процесса, поэтому его меняет только программа, а не библиотека
+        app = GlavnoeOkno(root, hranilishche, demo=not argumenty.bez_demo, profil=profil,
+                          metriki=metriki, glubina_otmeny=argumenty.glubina_otmeny,
+                          posle_zagruzki=gc.freeze)
+        if metriki is not None:
+            app.vygruzhat_metriki(argumenty.metriki, argumenty.openmetrics)
+        
+        # Запускаем главный цикл
+        root.mainloop()
+        app.fon.zakryt()
+        hranilishche.zakryt()
+        if baza is not None:
+            baza.zakryt()
+        if metriki is not None:
+            eksportirovat(metriki, argumenty.metriki, argumenty.openmetrics)
+    
+    except Exception as e:
+        print(f"Ошибка при запуске программы: {e}")
+        messagebox.showerror("Ошибка", f"Не удалось запустить программу:\n{e}")
+        return 1
+    
+    return 0
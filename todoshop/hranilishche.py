@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Хранение задач и магазинов: журнал операций и снимки
+"""
+
+import json
+import os
+
+from .zadachi import StatusZadachi, Zadacha, SpisokZadach
+from .magaziny import Magazin, ReestrMagazinov
+from .metriki import tochka_zamera
+
+# ============================================
+# ХРАНЕНИЕ ДАННЫХ
+# ============================================
+
+# Папка с данными программы по умолчанию
+PAPKA_DANNYH = os.path.join(os.path.expanduser('~'), '.todoshop')
+
+
+class Hranilishche:
+    """Хранение задач и магазинов: журнал операций + периодический снимок
+    
+    Каждое изменение дописывается в конец журнала одной строкой JSON,
+    поэтому запись стоит O(1) независимо от объёма данных. После
+    kompaktirovat_posle операций состояние целиком пишется в снимок,
+    а журнал начинается заново. При загрузке читается снимок и
+    проигрываются операции журнала, которые в него ещё не вошли.
+    
+    baza - SqliteBaza, если магазины и товары хранятся в ней: тогда
+    журнал и снимок ведут только задачи, а магазины читаются из базы.
+    """
+    FAIL_SNIMKA = 'snimok.json'
+    FAIL_ZHURNALA = 'zhurnal.jsonl'
+    
+    def __init__(self, papka=PAPKA_DANNYH, kompaktirovat_posle=10000, sinhronno=False, baza=None):
+        self.papka = papka
+        self.baza = baza
+        self.put_snimka = os.path.join(papka, self.FAIL_SNIMKA)
+        self.put_zhurnala = os.path.join(papka, self.FAIL_ZHURNALA)
+        self.kompaktirovat_posle = kompaktirovat_posle
+        self.sinhronno = sinhronno
+        self.nomer_operacii = 0
+        self.operacii_v_zhurnale = 0
+        self.zhurnal = None
+        self.spisok_zadach = None
+        self.reestr = None
+    
+    def pustoe(self):
+        """True, если данных на диске ещё нет (первый запуск)"""
+        return not (os.path.exists(self.put_snimka) or os.path.exists(self.put_zhurnala))
+    
+    # --- загрузка ---
+    
+    @tochka_zamera('hranilishche.zagruzit')
+    def zagruzit(self):
+        """Прочитать снимок и журнал, вернуть (spisok_zadach, reestr_magazinov)"""
+        self.spisok_zadach = SpisokZadach()
+        self.reestr = ReestrMagazinov()
+        posledniaia = 0
+        
+        if os.path.exists(self.put_snimka):
+            with open(self.put_snimka, encoding='utf-8') as f:
+                snimok = json.load(f)
+            posledniaia = snimok['posledniaia_operacia']
+            # Невыполненные задачи в снимке уже упорядочены по номеру,
+            # выполненные - в порядке выполнения: просто дописываем
+            self.spisok_zadach.dopisat_sohranennye(snimok['zadachi'])
+            self.spisok_zadach.sleduiushchii_nomer = snimok['sleduiushchii_nomer']
+            self.reestr.sleduiushchii_nomer = snimok['sleduiushchii_nomer_magazina']
+            for dannye in snimok['magaziny']:
+                magazin = self.sozdat_magazin(dannye)
+                magazin.zagruzit_tovary(((tovar, cena, kolichestvo, data) for tovar, (cena, kolichestvo, data)
+                                         in dannye['tovary'].items()), proveriat=False)
+        self.nomer_operacii = posledniaia
+        
+        self.operacii_v_zhurnale = 0
+        if os.path.exists(self.put_zhurnala):
+            with open(self.put_zhurnala, 'rb+') as f:
+                smeshchenie = 0
+                for stroka in f:
+                    try:
+                        if not stroka.endswith(b'\n'):
+                            raise ValueError
+                        operacia = json.loads(stroka)
+                    except ValueError:
+                        # Недописанная строка после аварийного завершения:
+                        # обрезаем её, чтобы новые операции шли следом за целыми
+                        f.truncate(smeshchenie)
+                        break
+                    smeshchenie += len(stroka)
+                    if operacia['n'] > posledniaia:
+                        self.primenit(operacia)
+                        self.nomer_operacii = operacia['n']
+                    self.operacii_v_zhurnale += 1
+        
+        if self.baza is not None:
+            for magazin in self.baza.zagruzit_magaziny():
+                self.reestr.dobavit(magazin, magazin.nomer)
+        return self.spisok_zadach, self.reestr
+    
+    def sozdat_magazin(self, dannye):
+        """Создать магазин по сохранённым данным"""
+        magazin = Magazin(dannye['nazvanie'], dannye['adres'], dannye['tip'])
+        magazin.data_sozdania = dannye['data']
+        return self.reestr.dobavit(magazin, dannye['nomer'])
+    
+    def primenit(self, operacia):
+        """Проиграть одну операцию журнала"""
+        op = operacia['op']
+        if op == 'dobavit_zadachu':
+            # Возвращённая отменой задача приходит со своими отметками
+            zadacha = Zadacha.iz_snimka(operacia['nomer'], operacia['opisanie'], operacia['srok'],
+                                        operacia['vremia'], operacia.get('vypolnena'),
+                                        operacia.get('povtory'))
+            self.spisok_zadach.vosstanovit(zadacha, operacia['nomer'])
+        elif op == 'otmetit_zadachu':
+            self.spisok_zadach.otmetit(self.spisok_zadach.po_nomeru(operacia['nomer']),
+                                       operacia['vremia'])
+        elif op == 'sniat_otmetku':
+            self.spisok_zadach.sniat_otmetku(self.spisok_zadach.po_nomeru(operacia['nomer']))
+        elif op == 'povtor':
+            self.spisok_zadach.ustanovit_povtory(self.spisok_zadach.po_nomeru(operacia['nomer']),
+                                                 operacia['povtory'])
+        elif op == 'udalit_zadachu':
+            self.spisok_zadach.udalit(self.spisok_zadach.po_nomeru(operacia['nomer']))
+        elif op == 'dobavit_magazin':
+            self.sozdat_magazin(operacia)
+        elif op == 'udalit_magazin':
+            self.reestr.udalit(self.reestr.po_nomeru[operacia['nomer']])
+        elif op == 'pereimenovat_magazin':
+            self.reestr.pereimenovat(self.reestr.po_nomeru[operacia['nomer']], operacia['nazvanie'])
+        else:
+            magazin = self.reestr.po_nomeru[operacia['magazin']]
+            if op == 'dobavit_tovar':
+                magazin.dobavit_tovar(operacia['tovar'], operacia['cena'],
+                                      operacia['kolichestvo'], operacia['data'])
+            elif op == 'udalit_tovar':
+                magazin.udalit_tovar(operacia['tovar'])
+            elif op == 'obnovit_cenu':
+                magazin.obnovit_cenu(operacia['tovar'], operacia['cena'])
+            elif op == 'obnovit_kolichestvo':
+                magazin.obnovit_kolichestvo(operacia['tovar'], operacia['kolichestvo'])
+            elif op == 'primenit_prais':
+                magazin.primenit_prais(operacia['ceny'])
+            elif op == 'ustanovit_kolichestva':
+                kolichestva = dict(magazin.proverit_pozicii(operacia['kolichestva'], int))
+                magazin.izmenit_pole(kolichestva, 'kolichestvo')
+            else:
+                raise ValueError(f"Неизвестная операция журнала: {op}")
+    
+    # --- запись ---
+    
+    def podkliuchit(self, spisok_zadach, reestr):
+        """Начать записывать изменения задач и магазинов в журнал"""
+        os.makedirs(self.papka, exist_ok=True)
+        novoe = self.pustoe()
+        self.spisok_zadach = spisok_zadach
+        self.reestr = reestr
+        spisok_zadach.podpisat(self.pri_izmenenii_zadach)
+        if self.baza is not None:
+            # Магазины из прежнего снимка переезжают в базу, и снимок
+            # нужно переписать без них
+            novoe = self.baza.podkliuchit(reestr) > 0 or novoe
+        else:
+            reestr.podpisat(self.pri_izmenenii_reestra)
+            for magazin in reestr:
+                magazin.podpisat(self.pri_izmenenii_magazina)
+        self.zhurnal = open(self.put_zhurnala, 'a', encoding='utf-8')
+        if novoe:
+            # Данные созданы в памяти (например, демонстрационные) - сохраняем их
+            self.kompaktirovat()
+    
+    def pri_izmenenii_reestra(self, sobytie, magazin):
+        """Записать добавление, удаление или переименование магазина"""
+        if sobytie == 'dobavlen':
+            self.zapisat({'op': 'dobavit_magazin', 'nomer': magazin.nomer,
+                          'nazvanie': magazin.nazvanie, 'adres': magazin.adres,
+                          'tip': magazin.tip, 'data': magazin.data_sozdania})
+            for tovar in magazin.tovary:
+                self.pri_izmenenii_magazina('dobavlen', magazin, tovar)
+            magazin.podpisat(self.pri_izmenenii_magazina)
+        elif sobytie == 'udalen':
+            magazin.otpisat(self.pri_izmenenii_magazina)
+            self.zapisat({'op': 'udalit_magazin', 'nomer': magazin.nomer})
+        elif sobytie == 'pereimenovan':
+            self.zapisat({'op': 'pereimenovat_magazin', 'nomer': magazin.nomer,
+                          'nazvanie': magazin.nazvanie})
+    
+    def pri_izmenenii_zadach(self, sobytie, zadacha):
+        """Записать изменение списка задач"""
+        if sobytie == 'dobavlena':
+            operacia = {'op': 'dobavit_zadachu', 'nomer': zadacha.nomer,
+                        'opisanie': zadacha.opisanie, 'srok': zadacha.srok,
+                        'vremia': zadacha.vremia_sozdania}
+            # Отмена удаления возвращает задачу вместе с отметками
+            if zadacha.status is StatusZadachi.VYPOLNENO:
+                operacia['vypolnena'] = zadacha.vremia_vypolnenia
+            if zadacha.povtory is not None:
+                operacia['povtory'] = zadacha.povtory.sostoianie()
+            self.zapisat(operacia)
+        elif sobytie == 'izmenena' and zadacha.status is StatusZadachi.VYPOLNENO:
+            self.zapisat({'op': 'otmetit_zadachu', 'nomer': zadacha.nomer,
+                          'vremia': zadacha.vremia_vypolnenia})
+        elif sobytie == 'izmenena':
+            self.zapisat({'op': 'sniat_otmetku', 'nomer': zadacha.nomer})
+        elif sobytie == 'povtor':
+            # Отметки повторов занимают несколько чисел - пишем их целиком
+            self.zapisat({'op': 'povtor', 'nomer': zadacha.nomer,
+                          'povtory': zadacha.povtory.sostoianie()})
+        elif sobytie == 'udalena':
+            self.zapisat({'op': 'udalit_zadachu', 'nomer': zadacha.nomer})
+        elif sobytie == 'zagruzheny':
+            # После импорта дешевле один снимок, чем строка на каждую задачу
+            self.kompaktirovat()
+    
+    def pri_izmenenii_magazina(self, sobytie, magazin, tovar):
+        """Записать изменение ассортимента магазина"""
+        if sobytie == 'zagruzheny':
+            self.kompaktirovat()
+            return
+        operacia = {'magazin': magazin.nomer, 'tovar': tovar}
+        if sobytie == 'dobavlen':
+            info = magazin.tovary[tovar]
+            operacia.update(op='dobavit_tovar', cena=info['cena'],
+                            kolichestvo=info['kolichestvo'], data=info['data_dobavlenia'])
+        elif sobytie == 'udalen':
+            operacia['op'] = 'udalit_tovar'
+        elif sobytie == 'cena':
+            operacia.update(op='obnovit_cenu', cena=magazin.tovary[tovar]['cena'])
+        elif sobytie == 'kolichestvo':
+            operacia.update(op='obnovit_kolichestvo',
+                            kolichestvo=magazin.tovary[tovar]['kolichestvo'])
+        elif sobytie == 'ceny':
+            # Пакет - одна строка журнала на весь прайс-лист
+            operacia = {'magazin': magazin.nomer, 'op': 'primenit_prais',
+                        'ceny': [[t, magazin.tovary[t]['cena']] for t in tovar]}
+        elif sobytie == 'kolichestva':
+            operacia = {'magazin': magazin.nomer, 'op': 'ustanovit_kolichestva',
+                        'kolichestva': [[t, magazin.tovary[t]['kolichestvo']] for t in tovar]}
+        self.zapisat(operacia)
+    
+    @tochka_zamera('hranilishche.zapisat')
+    def zapisat(self, operacia):
+        """Дописать операцию в конец журнала"""
+        self.nomer_operacii += 1
+        operacia['n'] = self.nomer_operacii
+        self.zhurnal.write(json.dumps(operacia, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.zhurnal.flush()
+        if self.sinhronno:
+            os.fsync(self.zhurnal.fileno())
+        
+        self.operacii_v_zhurnale += 1
+        if self.operacii_v_zhurnale >= self.kompaktirovat_posle:
+            self.kompaktirovat()
+    
+    @tochka_zamera('hranilishche.kompaktirovat')
+    def kompaktirovat(self):
+        """Записать снимок текущего состояния и очистить журнал"""
+        snimok = {
+            'posledniaia_operacia': self.nomer_operacii,
+            'sleduiushchii_nomer': self.spisok_zadach.sleduiushchii_nomer,
+            'sleduiushchii_nomer_magazina': self.reestr.sleduiushchii_nomer,
+            'zadachi': list(self.spisok_zadach.stroki_snimka()),
+            'magaziny': [{'nomer': m.nomer, 'nazvanie': m.nazvanie, 'adres': m.adres, 'tip': m.tip,
+                          'data': m.data_sozdania,
+                          'tovary': {tovar: [info['cena'], info['kolichestvo'],
+                                             info['data_dobavlenia']]
+                                     for tovar, info in m.tovary.items()}}
+                         for m in self.reestr] if self.baza is None else [],
+        }
+        
+        # Сначала новый снимок во временный файл, затем атомарная замена:
+        # после сбоя остаётся либо старый снимок, либо новый
+        vremennyi = self.put_snimka + '.tmp'
+        with open(vremennyi, 'w', encoding='utf-8') as f:
+            json.dump(snimok, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(vremennyi, self.put_snimka)
+        
+        # Операции с номером не больше posledniaia_operacia уже в снимке
+        self.zhurnal.close()
+        self.zhurnal = open(self.put_zhurnala, 'w', encoding='utf-8')
+        self.operacii_v_zhurnale = 0
+    
+    def zakryt(self):
+        """Закрыть журнал"""
+        if self.zhurnal is not None:
+            self.zhurnal.close()
+            self.zhurnal = None
@@ -0,0 +1,579 @@
+# -*- coding: utf-8 -*-
+"""
+Магазины и реестр магазинов
+"""
+
+from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from operator import itemgetter
+import math
+
+from .sobytiia import Nabliudaemyi
+from .tovary import KolonochnyeTovary
+from .metriki import tochka_zamera
+
+# ============================================
+# КЛАСС ДЛЯ МАГАЗИНА
+# ============================================
+
+# Порядки товаров кроме цены: поле -> ключ сортировки (товар, цена, количество)
+KLUCHI_PORIADKA = {
+    'nazvanie': lambda tovar, cena, kolichestvo: tovar,
+    'kolichestvo': lambda tovar, cena, kolichestvo: kolichestvo,
+    'summa': lambda tovar, cena, kolichestvo: cena * kolichestvo,
+}
+
+
+class Magazin(Nabliudaemyi):
+    """Класс для управления магазинами
+    
+    События: 'dobavlen', 'udalen', 'cena', 'kolichestvo'
+    (данные - магазин и название товара), а после пакетных изменений
+    'ceny' и 'kolichestva' (данные - магазин и список товаров).
+    После массовой загрузки - 'zagruzheny' (данные - магазин и None).
+    
+    tovary - хранилище с интерфейсом словаря (KolonochnyeTovary по
+    умолчанию, обычный dict или SqliteTovary).
+    
+    Итоги (стоимость, число товаров, штук) ведутся на ходу при каждом
+    изменении, стоимость - в Decimal без ошибок округления. При
+    PROVERIAT_ITOGI = True после каждого изменения итоги сверяются
+    с полным пересчётом.
+    
+    po_cene - отсортированный список пар (цена, товар): из него без
+    сортировки берутся самые дорогие/дешёвые товары и диапазоны цен.
+    Такие же списки по названию, количеству и сумме (poriadki)
+    строятся при первом запросе poriadok() и дальше ведутся так же.
+    """
+    PROVERIAT_ITOGI = False
+    MNOGO_IZMENENII = 64    # с такого пакета индексы пересобираются, а не правятся
+    
+    def __init__(self, nazvanie, adres, tip, tovary=None):
+        super().__init__()
+        self.nomer = None
+        self.nazvanie = nazvanie
+        self.adres = adres
+        self.tip = tip
+        self.tovary = KolonochnyeTovary() if tovary is None else tovary
+        self.data_sozdania = datetime.now().strftime("%d.%m.%Y")
+        self.pereschitat_itogi()
+    
+    @tochka_zamera('magazin.dobavit_tovar')
+    def dobavit_tovar(self, tovar, cena, kolichestvo=1, data_dobavlenia=None):
+        """Добавить товар в ассортимент (ValueError при неверной цене или количестве)"""
+        novyi = {
+            'cena': self.privesti(tovar, cena, float),
+            'kolichestvo': self.privesti(tovar, kolichestvo, int),
+            'data_dobavlenia': data_dobavlenia or datetime.now().strftime("%d.%m.%Y")
+        }
+        staryi = self.tovary.get(tovar)
+        self.tovary[tovar] = novyi
+        if staryi is not None:
+            self.uchest(tovar, staryi, -1)
+        self.uchest(tovar, novyi, 1)
+        self.soobshchit('dobavlen', tovar)
+        return True
+    
+    @tochka_zamera('magazin.zagruzit_tovary')
+    def zagruzit_tovary(self, tovary, proveriat=True, pereschitat=True):
+        """Загрузить сохранённые товары (название, цена, количество, дата)
+        
+        Без событий и с одним пересчётом итогов в конце - для загрузки
+        больших каталогов из хранилища и импорта. proveriat=False -
+        значения уже нужных типов, float()/int() для каждой строки
+        не нужны. pereschitat=False - итоги пересчитает вызывающий
+        (когда товары приходят несколькими пакетами).
+        Возвращает число загруженных строк.
+        """
+        chislo = 0
+        zapisat_mnogo = getattr(self.tovary, 'zapisat_mnogo', None)
+        try:
+            if zapisat_mnogo is not None:
+                # Хранилище в базе: весь пакет - один executemany в одной транзакции
+                if proveriat:
+                    tovary = ((tovar, float(cena), int(kolichestvo), data)
+                              for tovar, cena, kolichestvo, data in tovary)
+                chislo = zapisat_mnogo(tovary)
+            elif not proveriat and isinstance(self.tovary, KolonochnyeTovary):
+                # Быстрый путь: прямо в колонки
+                zapisat, den = self.tovary.zapisat, self.tovary.den
+                for tovar, cena, kolichestvo, data in tovary:
+                    zapisat(tovar, cena, kolichestvo, den(data))
+                    chislo += 1
+            else:
+                for tovar, cena, kolichestvo, data in tovary:
+                    if proveriat:
+                        cena, kolichestvo = float(cena), int(kolichestvo)
+                    self.tovary[tovar] = {'cena': cena,
+                                          'kolichestvo': kolichestvo,
+                                          'data_dobavlenia': data}
+                    chislo += 1
+        finally:
+            # Даже если источник оборвался ошибкой, итоги должны
+            # соответствовать уже загруженным строкам
+            if pereschitat:
+                self.pereschitat_itogi()
+        return chislo
+    
+    @tochka_zamera('magazin.udalit_tovar')
+    def udalit_tovar(self, tovar):
+        """Удалить товар из ассортимента"""
+        staryi = self.tovary.get(tovar)
+        if staryi is not None:
+            del self.tovary[tovar]
+            self.uchest(tovar, staryi, -1)
+            self.soobshchit('udalen', tovar)
+            return True
+        return False
+    
+    def uznat_cenu(self, tovar):
+        """Узнать цену товара"""
+        if tovar in self.tovary:
+            return self.tovary[tovar]['cena']
+        return None
+    
+    @tochka_zamera('magazin.obnovit_cenu')
+    def obnovit_cenu(self, tovar, novaia_cena):
+        """Обновить цену товара"""
+        if tovar not in self.tovary:
+            return False
+        self.izmenit_pole(dict(self.proverit_pozicii([(tovar, novaia_cena)], float)), 'cena')
+        self.soobshchit('cena', tovar)
+        return True
+    
+    @tochka_zamera('magazin.obnovit_kolichestvo')
+    def obnovit_kolichestvo(self, tovar, novoe_kolichestvo):
+        """Обновить количество товара"""
+        if tovar not in self.tovary:
+            return False
+        self.izmenit_pole(dict(self.proverit_pozicii([(tovar, novoe_kolichestvo)], int)), 'kolichestvo')
+        self.soobshchit('kolichestvo', tovar)
+        return True
+    
+    # --- пакетные изменения ---
+    
+    @tochka_zamera('magazin.primenit_prais')
+    def primenit_prais(self, prais):
+        """Установить цены по прайс-листу ({товар: цена} или пары)
+        
+        Все позиции проверяются до изменений: если хоть одна неверна
+        (нет товара, цена не число или отрицательная), ValueError
+        и ничего не меняется. Возвращает число изменённых позиций.
+        """
+        # Повтор товара в прайсе: действует последняя цена
+        pozicii = dict(self.proverit_pozicii(prais, float))
+        self.izmenit_pole(pozicii, 'cena')
+        self.soobshchit('ceny', list(pozicii))
+        return len(pozicii)
+    
+    @tochka_zamera('magazin.nacenka')
+    def nacenka(self, procent, tovary=None):
+        """Поднять (или при procent < 0 снизить) цены на procent процентов
+        
+        tovary - список товаров, по умолчанию весь ассортимент.
+        Новые цены округляются до копеек.
+        """
+        procent = float(procent)
+        if not procent > -100:
+            raise ValueError(f"Наценка должна быть больше -100%: {procent}")
+        mnozhitel = 1 + procent / 100
+        if tovary is None:
+            tovary = list(self.tovary)
+        else:
+            self.proverit_tovary(tovary)
+        ceny = [(tovar, round(cena * mnozhitel, 2)) for tovar, cena in zip(tovary, self.znacheniia_polia(tovary, 'cena'))]
+        return self.primenit_prais(ceny)
+    
+    @tochka_zamera('magazin.popolnit')
+    def popolnit(self, postavka):
+        """Добавить к остаткам количества из накладной ({товар: штук} или пары)
+        
+        Проверка как в primenit_prais: всё или ничего.
+        """
+        dobavka = {}
+        for tovar, shtuk in self.proverit_pozicii(postavka, int):
+            dobavka[tovar] = dobavka.get(tovar, 0) + shtuk
+        pozicii = {tovar: kolichestvo + shtuk for (tovar, shtuk), kolichestvo
+                   in zip(dobavka.items(), self.znacheniia_polia(dobavka, 'kolichestvo'))}
+        self.izmenit_pole(pozicii, 'kolichestvo')
+        self.soobshchit('kolichestva', list(dobavka))
+        return len(pozicii)
+    
+    def znacheniia_polia(self, tovary, pole):
+        """Значения поля ('cena' или 'kolichestvo') товаров списком (все они должны быть в магазине)"""
+        if isinstance(self.tovary, KolonochnyeTovary):
+            stroki = self.tovary.stroki
+            kolonka = self.tovary.ceny if pole == 'cena' else self.tovary.kolichestva
+            return [kolonka[stroki[tovar]] for tovar in tovary]
+        return [self.tovary[tovar][pole] for tovar in tovary]
+    
+    def proverit_tovary(self, tovary):
+        """Убедиться, что все товары есть в магазине (иначе ValueError)"""
+        net = [tovar for tovar in tovary if tovar not in self.tovary]
+        if net:
+            raise ValueError(f"В магазине '{self.nazvanie}' нет товаров ({len(net)}): "
+                             + ", ".join(map(str, net[:5])))
+        return tovary
+    
+    def proverit_pozicii(self, pozicii, tip):
+        """Проверить пары (товар, значение) и привести значения к tip
+        
+        Возвращает список пар или бросает ValueError со списком ошибок.
+        """
+        if hasattr(pozicii, 'items'):
+            pozicii = pozicii.items()
+        rezultat = []
+        oshibki = []
+        for tovar, znachenie in pozicii:
+            if tovar not in self.tovary:
+                oshibki.append(f"нет товара '{tovar}'")
+                continue
+            try:
+                rezultat.append((tovar, self.privesti(tovar, znachenie, tip)))
+            except ValueError as oshibka:
+                oshibki.append(str(oshibka))
+        if oshibki:
+            raise ValueError(f"Изменения не применены, ошибок: {len(oshibki)}: "
+                             + "; ".join(oshibki[:5]))
+        return rezultat
+    
+    @staticmethod
+    def privesti(tovar, znachenie, tip):
+        """znachenie, приведённое к tip; ValueError, если это не число, оно отрицательно или бесконечно"""
+        try:
+            chislo = tip(znachenie)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"'{tovar}': не число {znachenie!r}") from None
+        # NaN не проходит ни одно сравнение
+        if not 0 <= chislo < math.inf:
+            raise ValueError(f"'{tovar}': недопустимое значение {chislo}")
+        return chislo
+    
+    def izmenit_pole(self, pozicii, pole):
+        """Записать проверенные значения поля ('cena' или 'kolichestvo')
+        
+        pozicii - словарь {товар: значение} после proverit_pozicii.
+        Сначала пишется колонка, затем итоги поправляются одним
+        проходом: изменение числа штук копится по ценам, и Decimal
+        считается по разу на каждую разную цену. Малый пакет сдвигает
+        пары в индексах на месте; большой (от MNOGO_IZMENENII) собирает
+        индекс цен слиянием нетронутых пар с новыми, а порядки по
+        количеству и сумме сбрасывает до следующего запроса.
+        """
+        tovary = self.tovary
+        ceny = pole == 'cena'
+        nazvaniia = list(pozicii)
+        znacheniia = list(pozicii.values())
+        if isinstance(tovary, KolonochnyeTovary):
+            # Быстрый путь: сразу в колонки, без промежуточных словарей
+            nomera = [tovary.stroki[tovar] for tovar in nazvaniia]
+            starye_ceny = [tovary.ceny[i] for i in nomera]
+            kolichestva = [tovary.kolichestva[i] for i in nomera]
+            kolonka = tovary.ceny if ceny else tovary.kolichestva
+            for i, znachenie in zip(nomera, znacheniia):
+                kolonka[i] = znachenie
+        else:
+            starye = [tovary[tovar] for tovar in nazvaniia]
+            starye_ceny = [info['cena'] for info in starye]
+            kolichestva = [info['kolichestvo'] for info in starye]
+            obnovit_pole = getattr(tovary, 'obnovit_pole', None)
+            if obnovit_pole is not None:
+                # Хранилище в базе пишет пакет одной транзакцией
+                obnovit_pole(pozicii, pole)
+            else:
+                for tovar, info, znachenie in zip(nazvaniia, starye, znacheniia):
+                    tovary[tovar] = dict(info, **{pole: znachenie})
+        
+        shtuk_po_cene = {}      # цена -> изменение числа штук по этой цене
+        skolko = shtuk_po_cene.get
+        if ceny:
+            for staraia, novaia, kol in zip(starye_ceny, znacheniia, kolichestva):
+                shtuk_po_cene[staraia] = skolko(staraia, 0) - kol
+                shtuk_po_cene[novaia] = skolko(novaia, 0) + kol
+            novye_ceny, novye_kolichestva = znacheniia, kolichestva
+        else:
+            for cena, staroe, novoe in zip(starye_ceny, kolichestva, znacheniia):
+                shtuk_po_cene[cena] = skolko(cena, 0) + novoe - staroe
+            self.vsego_shtuk += sum(znacheniia) - sum(kolichestva)
+            novye_ceny, novye_kolichestva = starye_ceny, znacheniia
+        self.stoimost += sum((Decimal(repr(cena)) * shtuk for cena, shtuk in shtuk_po_cene.items()
+                              if shtuk), Decimal(0))
+        
+        if len(pozicii) >= self.MNOGO_IZMENENII:
+            if ceny and 2 * len(pozicii) > len(self.po_cene):
+                # Меняется почти всё: новые цены в прежнем порядке, после
+                # наценки он не нарушен, и sort() лишь проверяет его
+                poriadok = list(map(itemgetter(1), self.po_cene))
+                self.po_cene = list(zip(map(pozicii.get, poriadok, map(itemgetter(0), self.po_cene)),
+                                        poriadok))
+                self.po_cene.sort()
+            elif ceny:
+                izmeneny = set(nazvaniia)
+                po_cene = [para for para in self.po_cene if para[1] not in izmeneny]
+                # Два отсортированных куска: sort() сливает их за линейное время
+                po_cene += sorted(zip(znacheniia, nazvaniia))
+                po_cene.sort()
+                self.po_cene = po_cene
+            for imia in ('kolichestvo', 'summa'):
+                self.poriadki.pop(imia, None)
+            return
+        
+        if ceny:
+            for tovar, staraia, novaia in zip(nazvaniia, starye_ceny, znacheniia):
+                del self.po_cene[bisect_left(self.po_cene, (staraia, tovar))]
+                insort(self.po_cene, (novaia, tovar))
+        for imia, indeks in self.poriadki.items():
+            if imia == 'nazvanie':
+                continue
+            kluch = KLUCHI_PORIADKA[imia]
+            for tovar, cena, kol, novaia_cena, novoe_kol in zip(nazvaniia, starye_ceny, kolichestva,
+                                                               novye_ceny, novye_kolichestva):
+                staryi_kluch = kluch(tovar, cena, kol)
+                novyi_kluch = kluch(tovar, novaia_cena, novoe_kol)
+                if novyi_kluch != staryi_kluch:
+                    del indeks[bisect_left(indeks, (staryi_kluch, tovar))]
+                    insort(indeks, (novyi_kluch, tovar))
+    
+    # --- итоги ---
+    
+    def pereschitat_itogi(self):
+        """Посчитать итоги и индекс цен заново по всем товарам"""
+        self.stoimost = Decimal(0)
+        self.chislo_tovarov = 0
+        self.vsego_shtuk = 0
+        self.po_cene = []
+        self.poriadki = {}
+        for tovar, info in self.tovary.items():
+            self.stoimost += Decimal(repr(info['cena'])) * info['kolichestvo']
+            self.chislo_tovarov += 1
+            self.vsego_shtuk += info['kolichestvo']
+            self.po_cene.append((info['cena'], tovar))
+        self.po_cene.sort()
+    
+    def soobshchit(self, sobytie, tovar):
+        """Сверить итоги (в режиме проверки) и оповестить подписчиков"""
+        if self.PROVERIAT_ITOGI:
+            self.proverit_itogi()
+        self.uvedomit(sobytie, self, tovar)
+    
+    def uchest(self, tovar, info, znak):
+        """Прибавить (znak=1) или вычесть (znak=-1) товар из итогов"""
+        cena, kolichestvo = info['cena'], info['kolichestvo']
+        self.stoimost += znak * Decimal(repr(cena)) * kolichestvo
+        self.chislo_tovarov += znak
+        self.vsego_shtuk += znak * kolichestvo
+        if znak > 0:
+            insort(self.po_cene, (cena, tovar))
+        else:
+            del self.po_cene[bisect_left(self.po_cene, (cena, tovar))]
+        for imia, indeks in self.poriadki.items():
+            zapis = (KLUCHI_PORIADKA[imia](tovar, cena, kolichestvo), tovar)
+            if znak > 0:
+                insort(indeks, zapis)
+            else:
+                del indeks[bisect_left(indeks, zapis)]
+    
+    def poriadok(self, pole):
+        """Отсортированный список пар (ключ, товар) по полю
+        
+        pole - 'cena', 'nazvanie', 'kolichestvo' или 'summa' (цена ×
+        количество). Список по цене - это po_cene; остальные строятся
+        при первом запросе.
+        """
+        if pole == 'cena':
+            return self.po_cene
+        indeks = self.poriadki.get(pole)
+        if indeks is None:
+            kluch = KLUCHI_PORIADKA[pole]
+            tovary = self.tovary
+            if isinstance(tovary, KolonochnyeTovary):
+                indeks = sorted(zip(map(kluch, tovary.nazvaniia, tovary.ceny, tovary.kolichestva),
+                                    tovary.nazvaniia))
+            else:
+                indeks = sorted((kluch(tovar, info['cena'], info['kolichestvo']), tovar)
+                                for tovar, info in tovary.items())
+            self.poriadki[pole] = indeks
+        return indeks
+    
+    def tovary_po(self, pole, nachalo, skolko, ubyvanie=False):
+        """skolko товаров [(товар, цена, количество)] в порядке pole, пропустив первые nachalo
+        
+        Срез готового порядка: стоимость зависит только от skolko.
+        """
+        indeks = self.poriadok(pole)
+        if ubyvanie:
+            konec = len(indeks) - nachalo
+            srez = reversed(indeks[max(0, konec - skolko):max(0, konec)])
+        else:
+            srez = indeks[nachalo:nachalo + skolko]
+        rezultat = []
+        for _, tovar in srez:
+            info = self.tovary[tovar]
+            rezultat.append((tovar, info['cena'], info['kolichestvo']))
+        return rezultat
+    
+    def min_cena(self):
+        """Самая низкая цена (None, если товаров нет)"""
+        return self.po_cene[0][0] if self.po_cene else None
+    
+    def max_cena(self):
+        """Самая высокая цена (None, если товаров нет)"""
+        return self.po_cene[-1][0] if self.po_cene else None
+    
+    def samye_dorogie(self, n, nachalo=0):
+        """n самых дорогих товаров [(товар, цена)], пропустив первые nachalo"""
+        konec = len(self.po_cene) - nachalo
+        return [(tovar, cena) for cena, tovar in reversed(self.po_cene[max(0, konec - n):max(0, konec)])]
+    
+    def samye_deshevye(self, n, nachalo=0):
+        """n самых дешёвых товаров [(товар, цена)], пропустив первые nachalo"""
+        return [(tovar, cena) for cena, tovar in self.po_cene[nachalo:nachalo + n]]
+    
+    def v_diapazone(self, ot, do):
+        """Товары с ценой от ot до do включительно [(товар, цена)], по возрастанию цены"""
+        nachalo = bisect_left(self.po_cene, ot, key=itemgetter(0))
+        konec = bisect_right(self.po_cene, do, key=itemgetter(0))
+        return [(tovar, cena) for cena, tovar in self.po_cene[nachalo:konec]]
+    
+    def proverit_itogi(self):
+        """Сверить итоги с полным пересчётом (RuntimeError при расхождении)"""
+        tovary = list(self.tovary.values())
+        ozhidaetsia = (
+            sum((Decimal(repr(i['cena'])) * i['kolichestvo'] for i in tovary), Decimal(0)),
+            len(tovary),
+            sum(i['kolichestvo'] for i in tovary),
+            sorted((info['cena'], tovar) for tovar, info in self.tovary.items()),
+        )
+        fakt = (self.stoimost, self.chislo_tovarov, self.vsego_shtuk, self.po_cene)
+        if fakt != ozhidaetsia:
+            raise RuntimeError(f"Итоги магазина '{self.nazvanie}' расходятся с пересчётом: "
+                               f"{fakt} != {ozhidaetsia}")
+        for imia, indeks in self.poriadki.items():
+            kluch = KLUCHI_PORIADKA[imia]
+            if indeks != sorted((kluch(tovar, info['cena'], info['kolichestvo']), tovar)
+                                for tovar, info in self.tovary.items()):
+                raise RuntimeError(f"Порядок '{imia}' магазина '{self.nazvanie}' "
+                                   f"расходится с пересчётом")
+    
+    def obshchaia_stoimost(self):
+        """Общая стоимость всех товаров (Decimal)"""
+        return self.stoimost
+    
+    def zagolovok_otcheta(self):
+        """Строки отчёта до списка товаров"""
+        stroki = [
+            f"🏪 {self.nazvanie}",
+            f"📍 {self.adres}",
+            f"📊 Тип: {self.tip}",
+            f"📅 Создан: {self.data_sozdania}",
+            "─" * 40,
+        ]
+        if self.chislo_tovarov:
+            stroki += [
+                f"📦 Товаров: {self.chislo_tovarov} (всего штук: {self.vsego_shtuk})",
+                f"🏷 Цены: от {self.min_cena():.2f} до {self.max_cena():.2f} руб.",
+                f"💰 Общая стоимость: {self.obshchaia_stoimost():.2f} руб.",
+                "─" * 40,
+            ]
+        else:
+            stroki.append("📭 В магазине нет товаров")
+        return stroki
+    
+    def chislo_strok_otcheta(self):
+        """Сколько строк в полном отчёте"""
+        return len(self.zagolovok_otcheta()) + self.chislo_tovarov
+    
+    def stroki_otcheta(self, nachalo=0, konec=None):
+        """Строки отчёта с номера nachalo до konec (не включая), по одной
+        
+        Товары идут от дорогих к дешёвым и берутся срезом из индекса цен,
+        так что стоимость зависит только от числа запрошенных строк.
+        """
+        zagolovok = self.zagolovok_otcheta()
+        if konec is None:
+            konec = len(zagolovok) + self.chislo_tovarov
+        yield from zagolovok[nachalo:konec]
+        
+        pervyi = max(0, nachalo - len(zagolovok))
+        skolko = konec - len(zagolovok) - pervyi
+        if skolko <= 0:
+            return
+        for i, (tovar, cena) in enumerate(self.samye_dorogie(skolko, pervyi), pervyi + 1):
+            kol = self.tovary[tovar]['kolichestvo']
+            stoimost = cena * kol
+            yield f"{i:2}. {tovar[:20]:20} | {cena:8.2f} руб. × {kol:3} = {stoimost:8.2f} руб."
+    
+    def info_podrobno(self):
+        """Подробная информация о магазине"""
+        return "".join(stroka + "\n" for stroka in self.stroki_otcheta())
+
+
+class ReestrMagazinov(Nabliudaemyi):
+    """Реестр магазинов с поиском по номеру и по названию за O(1)
+    
+    Названия могут совпадать, поэтому каждый магазин получает
+    уникальный номер. Переименовывать магазин нужно через реестр,
+    чтобы индекс по названию оставался верным.
+    События: 'dobavlen', 'udalen', 'pereimenovan' (данные - магазин).
+    """
+    def __init__(self, magaziny=()):
+        super().__init__()
+        self.po_nomeru = {}
+        self.po_nazvaniiu = {}      # название -> {номер: магазин}
+        self.sleduiushchii_nomer = 1
+        for magazin in magaziny:
+            self.dobavit(magazin)
+    
+    @tochka_zamera('reestr.dobavit')
+    def dobavit(self, magazin, nomer=None):
+        """Добавить магазин (nomer - при восстановлении сохранённого)"""
+        if nomer is None:
+            nomer = self.sleduiushchii_nomer
+        if nomer in self.po_nomeru:
+            raise ValueError(f"Магазин с номером {nomer} уже есть")
+        magazin.nomer = nomer
+        self.sleduiushchii_nomer = max(self.sleduiushchii_nomer, nomer + 1)
+        self.po_nomeru[nomer] = magazin
+        self.po_nazvaniiu.setdefault(magazin.nazvanie, {})[nomer] = magazin
+        self.uvedomit('dobavlen', magazin)
+        return magazin
+    
+    @tochka_zamera('reestr.udalit')
+    def udalit(self, magazin):
+        """Удалить магазин из реестра"""
+        del self.po_nomeru[magazin.nomer]
+        self.ubrat_nazvanie(magazin)
+        self.uvedomit('udalen', magazin)
+    
+    @tochka_zamera('reestr.pereimenovat')
+    def pereimenovat(self, magazin, novoe_nazvanie):
+        """Переименовать магазин"""
+        self.ubrat_nazvanie(magazin)
+        magazin.nazvanie = novoe_nazvanie
+        self.po_nazvaniiu.setdefault(novoe_nazvanie, {})[magazin.nomer] = magazin
+        self.uvedomit('pereimenovan', magazin)
+    
+    def ubrat_nazvanie(self, magazin):
+        """Убрать магазин из индекса по названию"""
+        odnoimennye = self.po_nazvaniiu[magazin.nazvanie]
+        del odnoimennye[magazin.nomer]
+        if not odnoimennye:
+            del self.po_nazvaniiu[magazin.nazvanie]
+    
+    def naiti(self, nazvanie):
+        """Первый магазин с таким названием (None, если нет)"""
+        odnoimennye = self.po_nazvaniiu.get(nazvanie)
+        return next(iter(odnoimennye.values())) if odnoimennye else None
+    
+    def metka(self, magazin):
+        """Подпись для списка выбора; при совпадении названий добавляется номер"""
+        if len(self.po_nazvaniiu[magazin.nazvanie]) > 1:
+            return f"{magazin.nazvanie} (№{magazin.nomer})"
+        return magazin.nazvanie
+    
+    def __len__(self):
+        return len(self.po_nomeru)
+    
+    def __iter__(self):
+        return iter(self.po_nomeru.values())
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Замеры длительности операций и памяти процесса
+
+Методы модели и окна отмечаются декоратором tochka_zamera. Пока
+замеры выключены, в классе лежит сама функция и вызов не стоит
+ничего; vkliuchit() подменяет отмеченные методы обёртками, которые
+пишут (номер, начало, имя, длительность) в кольцевой буфер Metriki,
+vykliuchit() возвращает функции на место. Распределения по операциям
+собираются из буфера при чтении и выгружаются в текстовом формате
+Prometheus или OpenMetrics.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+from itertools import count
+import os
+import threading
+import time
+
+# ============================================
+# РАСПРЕДЕЛЕНИЕ ДЛИТЕЛЬНОСТЕЙ
+# ============================================
+
+# Верхние границы корзин: от 1 мкс до ~2 минут с шагом в 2**(1/4) (~19%)
+GRANICY = tuple(1e-6 * 2 ** (i / 4) for i in range(108))
+
+
+class Gistogramma:
+    """Распределение длительностей по логарифмическим корзинам
+    
+    Запись - один бинарный поиск по границам, память не растёт
+    с числом записей. Процентили берутся по верхней границе корзины,
+    то есть с точностью до шага корзин и с округлением вверх.
+    """
+    __slots__ = ('korziny', 'chislo', 'summa', 'maksimum')
+    
+    def __init__(self):
+        self.korziny = [0] * (len(GRANICY) + 1)   # последняя - всё, что дольше
+        self.chislo = 0
+        self.summa = 0.0
+        self.maksimum = 0.0
+    
+    def zapisat(self, sekund):
+        """Учесть одну длительность"""
+        self.korziny[bisect_left(GRANICY, sekund)] += 1
+        self.chislo += 1
+        self.summa += sekund
+        if sekund > self.maksimum:
+            self.maksimum = sekund
+    
+    def procentil(self, p):
+        """Длительность, которой не превышают p процентов записей (None, если их нет)"""
+        if not self.chislo:
+            return None
+        rang = max(1, -(-self.chislo * p // 100))
+        nakopleno = 0
+        for i, skolko in enumerate(self.korziny):
+            nakopleno += skolko
+            if nakopleno >= rang:
+                return min(GRANICY[i], self.maksimum) if i < len(GRANICY) else self.maksimum
+        return self.maksimum
+    
+    def nakoplennye(self, shag=4):
+        """[(граница, записей не дольше неё)] по каждой shag-й границе"""
+        nakopleno = 0
+        rezultat = []
+        for i, granica in enumerate(GRANICY):
+            nakopleno += self.korziny[i]
+            if i % shag == 0:
+                rezultat.append((granica, nakopleno))
+        return rezultat
+
+# ============================================
+# КОЛЬЦЕВОЙ БУФЕР ЗАМЕРОВ
+# ============================================
+
+# Привязка perf_counter к календарному времени (для поиска зависаний)
+PERF_NACHALA = time.perf_counter()
+VREMIA_NACHALA = time.time()
+
+
+class Metriki:
+    """Кольцевой буфер замеров и распределения по операциям
+    
+    zapisat() только добавляет кортеж в deque ограниченной длины -
+    без блокировок, из любого потока. Распределения пополняются из
+    буфера при чтении (svodka, выгрузка): новые записи узнаются по
+    сквозному номеру, а пропуски в номерах - это записи, вытесненные
+    из буфера до сбора. Последние emkost записей остаются в буфере,
+    и по ним можно найти, какие операции шли во время зависания.
+    """
+    def __init__(self, emkost=65536):
+        self.bufer = deque(maxlen=emkost)
+        self.nomera = count(1)
+        self.sobrano_do = 0          # номер последней учтённой записи
+        self.poteriano = 0
+        self.gistogrammy = {}
+        self.blokirovka = threading.Lock()
+    
+    def zapisat(self, imia, sekund, nachalo=None):
+        """Учесть длительность операции imia (nachalo - perf_counter() её начала)"""
+        if nachalo is None:
+            nachalo = time.perf_counter() - sekund
+        self.bufer.append((next(self.nomera), nachalo, imia, sekund))
+    
+    def sobrat(self):
+        """Перенести новые записи буфера в распределения"""
+        with self.blokirovka:
+            # Копия deque делается целиком в C, без переключения потоков
+            for nomer, _, imia, sekund in self.bufer.copy():
+                if nomer <= self.sobrano_do:
+                    continue
+                self.poteriano += nomer - self.sobrano_do - 1
+                self.sobrano_do = nomer
+                gistogramma = self.gistogrammy.get(imia)
+                if gistogramma is None:
+                    gistogramma = self.gistogrammy[imia] = Gistogramma()
+                gistogramma.zapisat(sekund)
+    
+    def svodka(self, procentili=(50, 95, 99)):
+        """[(имя, число, [процентили...], максимум)] по всем операциям"""
+        self.sobrat()
+        with self.blokirovka:
+            return [(imia, g.chislo, [g.procentil(p) for p in procentili], g.maksimum)
+                    for imia, g in self.gistogrammy.items()]
+    
+    def medlennye(self, n=5):
+        """n самых долгих операций из буфера: [(время начала, имя, длительность)]"""
+        zapisi = sorted(self.bufer.copy(), key=lambda z: z[3], reverse=True)[:n]
+        return [(VREMIA_NACHALA + nachalo - PERF_NACHALA, imia, sekund)
+                for _, nachalo, imia, sekund in zapisi]
+    
+    def sbrosit(self):
+        """Забыть все замеры"""
+        with self.blokirovka:
+            self.sobrano_do = next(self.nomera)
+            self.bufer.clear()
+            self.gistogrammy.clear()
+            self.poteriano = 0
+
+
+def format_dlitelnosti(sekund):
+    """Длительность в подходящих единицах"""
+    if sekund is None:
+        return "—"
+    if sekund >= 1:
+        return f"{sekund:.2f} с"
+    if sekund >= 1e-3:
+        return f"{sekund * 1e3:.1f} мс"
+    return f"{sekund * 1e6:.0f} мкс"
+
+# ============================================
+# ТОЧКИ ЗАМЕРА
+# ============================================
+
+# [(класс, имя метода, функция, имя замера)] - заполняется при создании классов
+TOCHKI = []
+
+# Metriki, в которые сейчас пишут отмеченные методы (None - замеры выключены)
+aktivnye = None
+
+
+class OtmetkaZamera:
+    """Метод, отмеченный tochka_zamera, до конца создания класса
+    
+    При создании класса (__set_name__) отметка записывается в TOCHKI
+    и уступает место самой функции.
+    """
+    def __init__(self, func, imia):
+        self.func = func
+        self.imia = imia
+    
+    def __set_name__(self, klass, imia_metoda):
+        TOCHKI.append((klass, imia_metoda, self.func, self.imia))
+        setattr(klass, imia_metoda, self.func)
+
+
+def tochka_zamera(imia):
+    """Декоратор метода: замерять его вызовы под именем imia, когда замеры включены"""
+    def otmetit(func):
+        return OtmetkaZamera(func, imia)
+    return otmetit
+
+
+def obernut(func, imia, metriki):
+    """Обёртка, записывающая длительность каждого вызова func"""
+    zapisat = metriki.zapisat
+    perf_counter = time.perf_counter
+    
+    @wraps(func)
+    def obertka(*args, **kwargs):
+        nachalo = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            zapisat(imia, perf_counter() - nachalo, nachalo)
+    return obertka
+
+
+def vkliuchit(metriki=None):
+    """Включить замеры отмеченных методов; возвращает Metriki, куда они пишут"""
+    global aktivnye
+    if aktivnye is not None:
+        vykliuchit()
+    aktivnye = metriki if metriki is not None else Metriki()
+    for klass, imia_metoda, func, imia in TOCHKI:
+        setattr(klass, imia_metoda, obernut(func, imia, aktivnye))
+    return aktivnye
+
+
+def vykliuchit():
+    """Вернуть отмеченным методам исходные функции"""
+    global aktivnye
+    for klass, imia_metoda, func, _ in TOCHKI:
+        setattr(klass, imia_metoda, func)
+    aktivnye = None
+
+# ============================================
+# ВЫГРУЗКА: PROMETHEUS И OPENMETRICS
+# ============================================
+
+PREFIKS = 'todoshop'
+
+
+def ekranirovat(znachenie):
+    """Значение метки в кавычках текстового формата"""
+    return znachenie.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def stroki_metrik(metriki, openmetrics):
+    """Строки выгрузки: распределения операций и число потерянных записей"""
+    metriki.sobrat()
+    imia = f'{PREFIKS}_operacia_sekund'
+    stroki = [f'# HELP {imia} Длительность операций TodoShop в секундах.',
+              f'# TYPE {imia} histogram']
+    with metriki.blokirovka:
+        for operacia, g in sorted(metriki.gistogrammy.items()):
+            metka = f'operacia="{ekranirovat(operacia)}"'
+            for granica, nakopleno in g.nakoplennye():
+                stroki.append(f'{imia}_bucket{{{metka},le="{granica:.6g}"}} {nakopleno}')
+            stroki.append(f'{imia}_bucket{{{metka},le="+Inf"}} {g.chislo}')
+            stroki.append(f'{imia}_count{{{metka}}} {g.chislo}')
+            stroki.append(f'{imia}_sum{{{metka}}} {g.summa!r}')
+        poteriano = metriki.poteriano
+    
+    # В OpenMetrics имя семейства счётчика - без _total, в Prometheus - с ним
+    imia = f'{PREFIKS}_poteriano_zamerov'
+    semeistvo = imia if openmetrics else f'{imia}_total'
+    stroki += [f'# HELP {semeistvo} Замеры, вытесненные из кольцевого буфера до сбора.',
+               f'# TYPE {semeistvo} counter',
+               f'{imia}_total {poteriano}']
+    if openmetrics:
+        stroki.append('# EOF')
+    return stroki
+
+
+def tekst_prometheus(metriki):
+    """Замеры в текстовом формате Prometheus (0.0.4)"""
+    return '\n'.join(stroki_metrik(metriki, openmetrics=False)) + '\n'
+
+
+def tekst_openmetrics(metriki):
+    """Замеры в формате OpenMetrics 1.0"""
+    return '\n'.join(stroki_metrik(metriki, openmetrics=True)) + '\n'
+
+
+def eksportirovat(metriki, put, openmetrics=False):
+    """Записать замеры в файл (целиком, через временный файл)
+    
+    Файл подходит для textfile-коллектора node_exporter: он никогда
+    не бывает записан наполовину.
+    """
+    tekst = tekst_openmetrics(metriki) if openmetrics else tekst_prometheus(metriki)
+    vremennyi = put + '.tmp'
+    with open(vremennyi, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(tekst)
+    os.replace(vremennyi, put)
+
+# ============================================
+# ПАМЯТЬ ПРОЦЕССА
+# ============================================
+
+def pamiat_processa():
+    """Резидентная память процесса в байтах (None, если узнать нельзя)
+    
+    Текущая - из /proc в Linux; в других системах с модулем resource -
+    пиковая за всё время работы.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pik = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В macOS ru_maxrss в байтах, в остальных системах - в килобайтах
+    return pik if os.uname().sysname == 'Darwin' else pik * 1024
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Напоминания об истечении сроков задач
+"""
+
+from heapq import heapify, heappop, heappush
+import time
+
+# ============================================
+# НАПОМИНАНИЯ
+# ============================================
+
+class Napominaniia:
+    """Напоминания об истечении сроков по таймеру root.after
+    
+    Сроки, которые ещё не истекли, лежат в куче (момент, номер).
+    Таймер один - на ближайший срок, так что задачи не опрашиваются:
+    добавление задачи стоит O(log n), срабатывание - O(log n) на
+    каждую истёкшую. Выполненные и удалённые задачи из кучи не
+    убираются - при срабатывании их записи сверяются с индексом
+    сроков списка и отбрасываются.
+    
+    root - всё, у чего есть after/after_cancel (окно Tk);
+    napomnit(задачи) вызывается в потоке Tk со списком задач,
+    срок которых только что истёк.
+    """
+    CHAS = 3600     # не ждать дольше часа: часы могли перевести, компьютер - усыпить
+    
+    def __init__(self, root, napomnit):
+        self.root = root
+        self.napomnit = napomnit
+        self.spisok = None
+        self.ochered = []
+        self.taimer = None
+        self.srok_taimera = None
+    
+    def podkliuchit(self, spisok):
+        """Следить за сроками задач списка"""
+        if self.spisok is not None:
+            self.spisok.otpisat(self.pri_izmenenii_zadach)
+        self.spisok = spisok
+        spisok.podpisat(self.pri_izmenenii_zadach)
+        self.zapolnit()
+    
+    def zapolnit(self):
+        """Собрать кучу заново из ещё не истёкших сроков списка"""
+        seichas = time.time()
+        self.ochered = [(moment, nomer) for nomer, moment in self.spisok.indeks_srokov().items()
+                        if moment > seichas]
+        heapify(self.ochered)
+        self.zavesti()
+    
+    def pri_izmenenii_zadach(self, sobytie, zadacha):
+        """Поставить в очередь срок новой, возвращённой задачи или следующего повтора"""
+        if sobytie == 'zagruzheny':
+            self.zapolnit()
+            return
+        if sobytie not in ('dobavlena', 'izmenena', 'povtor'):
+            return
+        sroki = self.spisok.indeks_srokov()
+        moment = sroki.get(zadacha.nomer)
+        if moment is None or moment <= time.time():
+            return
+        if len(self.ochered) > 2 * len(sroki) + 64:
+            # Устаревших записей больше живых
+            self.zapolnit()
+            return
+        heappush(self.ochered, (moment, zadacha.nomer))
+        if self.srok_taimera is None or moment < self.srok_taimera:
+            self.zavesti()
+    
+    def zavesti(self):
+        """Поставить таймер на ближайший срок"""
+        if self.taimer is not None:
+            self.root.after_cancel(self.taimer)
+            self.taimer = None
+        if not self.ochered:
+            self.srok_taimera = None
+            return
+        self.srok_taimera = self.ochered[0][0]
+        zhdat = min(self.CHAS, max(0.0, self.srok_taimera - time.time()))
+        self.taimer = self.root.after(int(zhdat * 1000) + 1, self.srabotat)
+    
+    def srabotat(self):
+        """Напомнить о задачах с истёкшим сроком и завести таймер на следующий"""
+        self.taimer = None
+        seichas = time.time()
+        sroki = self.spisok.indeks_srokov()
+        istekli = []
+        predydushchaia = None
+        while self.ochered and self.ochered[0][0] <= seichas:
+            zapis = heappop(self.ochered)
+            # Одинаковые записи (удалённая и возвращённая задача) идут подряд
+            if zapis != predydushchaia and sroki.get(zapis[1]) == zapis[0]:
+                istekli.append(self.spisok.po_nomeru(zapis[1]))
+            predydushchaia = zapis
+        self.zavesti()
+        if istekli:
+            self.napomnit(istekli)
+    
+    def ostanovit(self):
+        """Снять таймер и перестать следить за списком"""
+        if self.taimer is not None:
+            self.root.after_cancel(self.taimer)
+            self.taimer = None
+        if self.spisok is not None:
+            self.spisok.otpisat(self.pri_izmenenii_zadach)
+            self.spisok = None
+        self.ochered = []
+        self.srok_taimera = None
+    
+    def __len__(self):
+        return len(self.ochered)
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Импорт и экспорт товаров и задач (CSV и JSON Lines)
+"""
+
+from datetime import datetime
+from itertools import islice
+import csv
+import json
+import math
+import os
+
+from .zadachi import Zadacha
+from .tovary import KolonochnyeTovary
+
+# ============================================
+# ИМПОРТ И ЭКСПОРТ (CSV И JSON LINES)
+# ============================================
+
+# Колонки файлов: в CSV - строка заголовка, в JSONL - ключи объекта
+KOLONKI_TOVAROV = ('tovar', 'cena', 'kolichestvo', 'data_dobavlenia')
+KOLONKI_ZADACH = ('opisanie', 'srok', 'vremia_sozdania', 'vremia_vypolnenia')
+
+# Файлы читаются кусками примерно по мегабайту
+RAZMER_KUSKA = 1 << 20
+
+
+def format_faila(put):
+    """'jsonl' для файлов .jsonl/.ndjson, иначе 'csv'"""
+    return 'jsonl' if put.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def pakety(zapisi, razmer):
+    """Разбить поток записей на списки по razmer штук"""
+    zapisi = iter(zapisi)
+    while True:
+        paket = list(islice(zapisi, razmer))
+        if not paket:
+            return
+        yield paket
+
+
+def chitat_kuskami(f, progress=None, razmer_kuska=RAZMER_KUSKA):
+    """Строки открытого файла, прочитанные кусками по razmer_kuska байт
+    
+    В памяти только текущий кусок, так что размер файла не важен.
+    После каждого куска вызывается progress(прочитано_байт, всего_байт).
+    """
+    vsego = os.fstat(f.fileno()).st_size
+    while True:
+        kusok = f.readlines(razmer_kuska)
+        if not kusok:
+            return
+        yield from kusok
+        if progress is not None:
+            progress(f.buffer.tell(), vsego)
+
+
+def chitat_zapisi(f, kolonki, format, progress=None):
+    """Записи файла: пары (номер строки, значения в порядке kolonki)
+    
+    В CSV порядок колонок берётся из заголовка, лишние колонки
+    пропускаются; в JSONL каждая строка - объект. Отсутствующие
+    и пустые значения - None.
+    """
+    stroki = chitat_kuskami(f, progress)
+    if format == 'csv':
+        chtenie = csv.reader(stroki)
+        zagolovok = next(chtenie, None)
+        if zagolovok is None:
+            return
+        nomera = [zagolovok.index(k) if k in zagolovok else None for k in kolonki]
+        for zapis in chtenie:
+            if not zapis:
+                continue
+            yield chtenie.line_num, [zapis[i] if i is not None and i < len(zapis) and zapis[i] != ''
+                                     else None for i in nomera]
+    else:
+        for nomer, stroka in enumerate(stroki, 1):
+            if not stroka.strip():
+                continue
+            try:
+                obekt = json.loads(stroka)
+            except ValueError as oshibka:
+                raise ValueError(f"{f.name}, строка {nomer}: неверный JSON ({oshibka})") from None
+            if not isinstance(obekt, dict):
+                raise ValueError(f"{f.name}, строка {nomer}: ожидался объект JSON")
+            yield nomer, [obekt.get(k) for k in kolonki]
+
+
+def chitat_tovary(put, format=None, shema_izvestna=False, progress=None):
+    """Товары из файла CSV/JSONL: (название, цена, количество, дата)
+    
+    Каждая запись проверяется (название не пустое, цена - число
+    не меньше нуля, количество - целое, дата 'дд.мм.гггг'); ошибка -
+    ValueError с номером строки. shema_izvestna=True - файл записан
+    eksportirovat_tovary: колонки ровно KOLONKI_TOVAROV и значения
+    уже верные, поэтому они только приводятся к типам без проверок.
+    """
+    format = format or format_faila(put)
+    segodnia = datetime.now().strftime("%d.%m.%Y")
+    with open(put, encoding='utf-8', newline='') as f:
+        if shema_izvestna:
+            stroki = chitat_kuskami(f, progress)
+            if format == 'csv':
+                chtenie = csv.reader(stroki)
+                next(chtenie, None)
+                for tovar, cena, kolichestvo, data in chtenie:
+                    yield tovar, float(cena), int(kolichestvo), data
+            else:
+                for stroka in stroki:
+                    obekt = json.loads(stroka)
+                    yield (obekt['tovar'], obekt['cena'], obekt['kolichestvo'],
+                           obekt['data_dobavlenia'])
+            return
+        
+        for nomer, (tovar, cena, kolichestvo, data) in chitat_zapisi(f, KOLONKI_TOVAROV,
+                                                                      format, progress):
+            try:
+                if not tovar or not str(tovar).strip():
+                    raise ValueError("нет названия товара")
+                cena = float(cena)
+                if not 0 <= cena < math.inf:
+                    raise ValueError(f"недопустимая цена {cena}")
+                kolichestvo = 1 if kolichestvo is None else int(kolichestvo)
+                if kolichestvo < 0:
+                    raise ValueError(f"отрицательное количество {kolichestvo}")
+                data = data or segodnia
+                KolonochnyeTovary.den(data)
+            except (TypeError, ValueError) as oshibka:
+                raise ValueError(f"{put}, строка {nomer}: {oshibka}") from None
+            yield str(tovar).strip(), cena, kolichestvo, data
+
+
+def chitat_zadachi(put, format=None, progress=None):
+    """Задачи из файла CSV/JSONL (новые объекты Zadacha без номеров)
+    
+    Время создания и выполнения - секунды от 01.01.1970; без времени
+    создания задача считается созданной сейчас, с временем выполнения -
+    выполненной.
+    """
+    format = format or format_faila(put)
+    with open(put, encoding='utf-8', newline='') as f:
+        for nomer, (opisanie, srok, sozdana, vypolnena) in chitat_zapisi(f, KOLONKI_ZADACH,
+                                                                          format, progress):
+            try:
+                if not opisanie or not str(opisanie).strip():
+                    raise ValueError("нет описания задачи")
+                zadacha = Zadacha(str(opisanie).strip(), '' if srok is None else str(srok))
+                if sozdana is not None:
+                    zadacha.vremia_sozdania = float(sozdana)
+                if vypolnena is not None:
+                    zadacha.otmetit_gotovoi(float(vypolnena))
+            except (TypeError, ValueError) as oshibka:
+                raise ValueError(f"{put}, строка {nomer}: {oshibka}") from None
+            yield zadacha
+
+
+def chitat_prais(put, format=None, progress=None):
+    """Прайс-лист из файла CSV/JSONL: пары (название, цена) как в файле
+    
+    Значения не проверяются - это делает Magazin.primenit_prais
+    сразу для всего списка.
+    """
+    format = format or format_faila(put)
+    with open(put, encoding='utf-8', newline='') as f:
+        for _, (tovar, cena) in chitat_zapisi(f, ('tovar', 'cena'), format, progress):
+            yield tovar, cena
+
+
+def importirovat_tovary(magazin, put, format=None, shema_izvestna=False, progress=None):
+    """Загрузить товары из файла в магазин, вернуть число строк
+    
+    Строки читаются потоком; при ошибке в файле загруженное до неё
+    остаётся в магазине. Подписчики получают одно событие 'zagruzheny'.
+    """
+    try:
+        return magazin.zagruzit_tovary(chitat_tovary(put, format, shema_izvestna, progress),
+                                       proveriat=False)
+    finally:
+        magazin.soobshchit('zagruzheny', None)
+
+
+def importirovat_zadachi(spisok_zadach, put, format=None, progress=None):
+    """Добавить задачи из файла в список, вернуть их число"""
+    return spisok_zadach.zagruzit(chitat_zadachi(put, format, progress))
+
+
+def zapisat_zapisi(put, kolonki, zapisi, vsego, format=None, progress=None):
+    """Записать поток записей (кортежи в порядке kolonki) в CSV/JSONL
+    
+    progress(записано, всего) вызывается после каждых 10000 записей.
+    Файл пишется во временный и заменяется целиком в конце.
+    """
+    format = format or format_faila(put)
+    vremennyi = put + '.tmp'
+    zapisano = 0
+    try:
+        with open(vremennyi, 'w', encoding='utf-8', newline='') as f:
+            if format == 'csv':
+                pisatel = csv.writer(f)
+                pisatel.writerow(kolonki)
+                zapisat = pisatel.writerows
+            else:
+                def zapisat(paket):
+                    f.writelines(json.dumps(dict(zip(kolonki, zapis)), ensure_ascii=False,
+                                            separators=(',', ':')) + '\n' for zapis in paket)
+            for paket in pakety(zapisi, 10000):
+                zapisat(paket)
+                zapisano += len(paket)
+                if progress is not None:
+                    progress(zapisano, vsego)
+    except BaseException:
+        # Прерванная выгрузка (ошибка или отмена) не оставляет мусора
+        os.remove(vremennyi)
+        raise
+    os.replace(vremennyi, put)
+    return zapisano
+
+
+def stroki_tovarov(magazin):
+    """Поток строк товаров магазина в порядке KOLONKI_TOVAROV"""
+    return ((tovar, info['cena'], info['kolichestvo'], info['data_dobavlenia'])
+            for tovar, info in magazin.tovary.items())
+
+
+def eksportirovat_tovary(magazin, put, format=None, progress=None):
+    """Выгрузить товары магазина в файл CSV/JSONL, вернуть число строк"""
+    return zapisat_zapisi(put, KOLONKI_TOVAROV, stroki_tovarov(magazin), len(magazin.tovary),
+                          format, progress)
+
+
+def eksportirovat_zadachi(spisok_zadach, put, format=None, progress=None):
+    """Выгрузить задачи в файл CSV/JSONL, вернуть число строк"""
+    zapisi = ((z.opisanie, z.srok, z.vremia_sozdania, z.vremia_vypolnenia)
+              for z in spisok_zadach)
+    return zapisat_zapisi(put, KOLONKI_ZADACH, zapisi, len(spisok_zadach), format, progress)
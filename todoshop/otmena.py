@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Журнал изменений с отменой и повтором
+"""
+
+from collections import deque
+
+from .sobytiia import Nabliudaemyi
+from .zadachi import StatusZadachi
+
+# ============================================
+# ЖУРНАЛ ИЗМЕНЕНИЙ
+# ============================================
+
+class ZhurnalIzmenenii(Nabliudaemyi):
+    """Отмена и повтор изменений задач и товаров
+    
+    Изменения, которые можно отменить, делаются через методы журнала.
+    Для каждого запоминается запись (описание, объект, вперёд, назад),
+    где вперёд и назад - кортежи (имя метода объекта, аргументы...)
+    со значениями до и после изменения. Запись не зависит от размера
+    магазина или списка, поэтому отмена и повтор стоят O(1) памяти,
+    а хранится не больше glubina последних записей.
+    
+    События (данные - запись): 'sdelano', 'otmeneno', 'povtoreno' -
+    по ним окно обновляет только затронутое, и 'sbros', когда история
+    забыта (данные - None).
+    
+    Пакетные изменения товаров (загрузка, импорт, прайс-лист, поставка)
+    и удаление магазина не отменяются: после них старые записи могли
+    бы вернуть состояние, которого не было, поэтому история стирается.
+    """
+    def __init__(self, glubina=100):
+        super().__init__()
+        self.sdelano = deque(maxlen=glubina)
+        self.otmeneno = []
+    
+    def podkliuchit(self, reestr):
+        """Следить за пакетными изменениями магазинов реестра"""
+        self.sbrosit()
+        reestr.podpisat(self.pri_izmenenii_reestra)
+        for magazin in reestr:
+            magazin.podpisat(self.pri_izmenenii_magazina)
+    
+    # --- запись изменений ---
+    
+    def zapomnit(self, opisanie, obiekt, vpered, nazad):
+        """Добавить запись о сделанном изменении; повторять больше нечего"""
+        zapis = (opisanie, obiekt, vpered, nazad)
+        self.sdelano.append(zapis)
+        self.otmeneno.clear()
+        self.uvedomit('sdelano', zapis)
+    
+    def dobavit_zadachu(self, spisok, zadacha):
+        """Добавить задачу в список"""
+        spisok.dobavit(zadacha)
+        self.zapomnit(f"добавление задачи «{zadacha.opisanie[:20]}»", spisok,
+                      ('vosstanovit', zadacha, zadacha.nomer), ('udalit', zadacha))
+        return zadacha
+    
+    def otmetit_zadachu(self, spisok, zadacha):
+        """Отметить задачу как выполненную (у повторяющейся - текущий повтор)
+        
+        False, если разовая задача уже выполнена: менять нечего, и отмена
+        не должна вернуть её в работу.
+        """
+        if zadacha.povtor is None:
+            if zadacha.status is StatusZadachi.VYPOLNENO:
+                return False
+            spisok.otmetit(zadacha)
+            self.zapomnit(f"отметка задачи «{zadacha.opisanie[:20]}»", spisok,
+                          ('otmetit', zadacha), ('sniat_otmetku', zadacha))
+            return True
+        # Отметка повтора может перескочить пропущенные: запоминаем
+        # состояние отметок целиком, чтобы отмена вернула его точно
+        staroe = [0] if zadacha.povtory is None else zadacha.povtory.sostoianie()
+        spisok.otmetit(zadacha)
+        self.zapomnit(f"отметка повтора «{zadacha.opisanie[:20]}»", spisok,
+                      ('ustanovit_povtory', zadacha, zadacha.povtory.sostoianie()),
+                      ('ustanovit_povtory', zadacha, staroe))
+        return True
+    
+    def vernut_zadachu(self, spisok, zadacha):
+        """Вернуть выполненную задачу в работу; отмена вернёт и время выполнения"""
+        vypolnena = zadacha.vremia_vypolnenia
+        spisok.sniat_otmetku(zadacha)
+        self.zapomnit(f"возврат задачи «{zadacha.opisanie[:20]}»", spisok,
+                      ('sniat_otmetku', zadacha), ('otmetit', zadacha, vypolnena))
+    
+    def udalit_zadachu(self, spisok, zadacha):
+        """Удалить задачу; отмена вернёт её на прежнее место"""
+        spisok.udalit(zadacha)
+        self.zapomnit(f"удаление задачи «{zadacha.opisanie[:20]}»", spisok,
+                      ('udalit', zadacha), ('vosstanovit', zadacha, zadacha.nomer))
+    
+    def dobavit_tovar(self, magazin, tovar, cena, kolichestvo=1):
+        """Добавить товар (или заменить товар с тем же названием)"""
+        staryi = magazin.tovary.get(tovar)
+        magazin.dobavit_tovar(tovar, cena, kolichestvo)
+        novyi = magazin.tovary[tovar]
+        if staryi is None:
+            nazad = ('udalit_tovar', tovar)
+        else:
+            nazad = ('dobavit_tovar', tovar, staryi['cena'], staryi['kolichestvo'],
+                     staryi['data_dobavlenia'])
+        self.zapomnit(f"добавление товара «{tovar}»", magazin,
+                      ('dobavit_tovar', tovar, novyi['cena'], novyi['kolichestvo'],
+                       novyi['data_dobavlenia']), nazad)
+        return True
+    
+    def udalit_tovar(self, magazin, tovar):
+        """Удалить товар; False, если его нет"""
+        staryi = magazin.tovary.get(tovar)
+        if not magazin.udalit_tovar(tovar):
+            return False
+        self.zapomnit(f"удаление товара «{tovar}»", magazin, ('udalit_tovar', tovar),
+                      ('dobavit_tovar', tovar, staryi['cena'], staryi['kolichestvo'],
+                       staryi['data_dobavlenia']))
+        return True
+    
+    def obnovit_cenu(self, magazin, tovar, novaia_cena):
+        """Изменить цену товара; False, если его нет"""
+        staryi = magazin.tovary.get(tovar)
+        if not magazin.obnovit_cenu(tovar, novaia_cena):
+            return False
+        self.zapomnit(f"цена товара «{tovar}»", magazin,
+                      ('obnovit_cenu', tovar, magazin.tovary[tovar]['cena']),
+                      ('obnovit_cenu', tovar, staryi['cena']))
+        return True
+    
+    def obnovit_kolichestvo(self, magazin, tovar, novoe_kolichestvo):
+        """Изменить количество товара; False, если его нет"""
+        staryi = magazin.tovary.get(tovar)
+        if not magazin.obnovit_kolichestvo(tovar, novoe_kolichestvo):
+            return False
+        self.zapomnit(f"количество товара «{tovar}»", magazin,
+                      ('obnovit_kolichestvo', tovar, magazin.tovary[tovar]['kolichestvo']),
+                      ('obnovit_kolichestvo', tovar, staryi['kolichestvo']))
+        return True
+    
+    # --- отмена и повтор ---
+    
+    def mozhno_otmenit(self):
+        """Описание изменения, которое отменит otmenit() (None, если нечего)"""
+        return self.sdelano[-1][0] if self.sdelano else None
+    
+    def mozhno_povtorit(self):
+        """Описание изменения, которое повторит povtorit() (None, если нечего)"""
+        return self.otmeneno[-1][0] if self.otmeneno else None
+    
+    def otmenit(self):
+        """Отменить последнее изменение; возвращает его запись (None, если нечего)"""
+        if not self.sdelano:
+            return None
+        zapis = self.sdelano.pop()
+        self.primenit(zapis[1], zapis[3])
+        self.otmeneno.append(zapis)
+        self.uvedomit('otmeneno', zapis)
+        return zapis
+    
+    def povtorit(self):
+        """Повторить последнее отменённое изменение (None, если нечего)"""
+        if not self.otmeneno:
+            return None
+        zapis = self.otmeneno.pop()
+        self.primenit(zapis[1], zapis[2])
+        self.sdelano.append(zapis)
+        self.uvedomit('povtoreno', zapis)
+        return zapis
+    
+    def primenit(self, obiekt, deistvie):
+        """Вызвать метод объекта по записи; при ошибке история забывается"""
+        try:
+            getattr(obiekt, deistvie[0])(*deistvie[1:])
+        except Exception:
+            # Состояние уже не то, под которое писались записи
+            self.sbrosit()
+            raise
+    
+    def sbrosit(self):
+        """Забыть всю историю"""
+        self.sdelano.clear()
+        self.otmeneno.clear()
+        self.uvedomit('sbros', None)
+    
+    # --- пакетные изменения ---
+    
+    def pri_izmenenii_reestra(self, sobytie, magazin):
+        """Следить за новыми магазинами, забыть историю при удалении магазина"""
+        if sobytie == 'dobavlen':
+            magazin.podpisat(self.pri_izmenenii_magazina)
+        elif sobytie == 'udalen':
+            magazin.otpisat(self.pri_izmenenii_magazina)
+            self.sbrosit()
+    
+    def pri_izmenenii_magazina(self, sobytie, magazin, tovar):
+        """Пакетные изменения ассортимента не отменяются"""
+        if sobytie in ('zagruzheny', 'ceny', 'kolichestva'):
+            self.sbrosit()
+    
+    def __len__(self):
+        return len(self.sdelano)
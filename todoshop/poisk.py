@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Поиск товаров по всем магазинам
+"""
+
+from bisect import bisect_left, insort
+import math
+import threading
+
+from .metriki import tochka_zamera
+
+# ============================================
+# ПОИСК ТОВАРОВ ПО ВСЕМ МАГАЗИНАМ
+# ============================================
+
+def trigrammy(kluch):
+    """Множество триграмм строки (с пробелами по краям для коротких слов)"""
+    stroka = f"  {kluch} "
+    return {stroka[i:i + 3] for i in range(len(stroka) - 2)}
+
+
+class IndeksTovarov:
+    """Общий индекс товаров всех магазинов реестра
+    
+    Ключ товара - название в нижнем регистре. Для каждого ключа
+    хранятся предложения {номер магазина: (название, цена)},
+    отсортированный список ключей для поиска по началу названия
+    и триграммы для нечёткого поиска. Индекс подписан на события
+    реестра и магазинов, поэтому сам следит за изменениями.
+    
+    Индекс меняется в потоке Tk, а ищут в нём и из пула, поэтому
+    изменения и запрос naiti_s_cenami идут под замком zamok.
+    """
+    PREDEL_KANDIDATOV = 5000
+    
+    def __init__(self, reestr):
+        self.reestr = reestr
+        self.predlozheniia = {}     # ключ -> {номер магазина: (название, цена)}
+        self.kluchi = []            # отсортированные ключи
+        self.trigrammy = {}         # триграмма -> множество ключей
+        self.zamok = threading.RLock()
+        reestr.podpisat(self.pri_izmenenii_reestra)
+        for magazin in reestr:
+            self.pri_izmenenii_reestra('dobavlen', magazin)
+    
+    # --- поддержание индекса ---
+    
+    def pri_izmenenii_reestra(self, sobytie, magazin):
+        """Добавить или убрать товары магазина"""
+        with self.zamok:
+            if sobytie == 'dobavlen':
+                self.dobavit_vse(magazin)
+                magazin.podpisat(self.pri_izmenenii_magazina)
+            elif sobytie == 'udalen':
+                magazin.otpisat(self.pri_izmenenii_magazina)
+                for tovar in magazin.tovary:
+                    self.ubrat(magazin, tovar)
+    
+    def pri_izmenenii_magazina(self, sobytie, magazin, tovar):
+        """Учесть изменение ассортимента или цены"""
+        with self.zamok:
+            if sobytie in ('dobavlen', 'cena'):
+                self.dobavit(magazin, tovar, magazin.tovary[tovar]['cena'])
+            elif sobytie == 'udalen':
+                self.ubrat(magazin, tovar)
+            elif sobytie == 'ceny':
+                for t in tovar:
+                    self.dobavit(magazin, t, magazin.tovary[t]['cena'])
+            elif sobytie == 'zagruzheny':
+                self.dobavit_vse(magazin)
+    
+    def dobavit_vse(self, magazin):
+        """Записать все товары магазина"""
+        # Новые ключи сортируем один раз, а не вставкой по одному
+        novye = []
+        for tovar, info in magazin.tovary.items():
+            if self.dobavit(magazin, tovar, info['cena'], sortirovat=False):
+                novye.append(tovar.lower())
+        if novye:
+            self.kluchi = sorted(self.kluchi + novye)
+    
+    def dobavit(self, magazin, tovar, cena, sortirovat=True):
+        """Записать (или обновить) предложение магазина
+        
+        Возвращает True, если такого товара раньше не было ни в одном
+        магазине. При sortirovat=False новый ключ не попадает в список
+        kluchi - его должен добавить вызывающий.
+        """
+        kluch = tovar.lower()
+        predlozheniia = self.predlozheniia.get(kluch)
+        novyi = predlozheniia is None
+        if novyi:
+            predlozheniia = self.predlozheniia[kluch] = {}
+            if sortirovat:
+                insort(self.kluchi, kluch)
+            for trigramma in trigrammy(kluch):
+                self.trigrammy.setdefault(trigramma, set()).add(kluch)
+        predlozheniia[magazin.nomer] = (tovar, cena)
+        return novyi
+    
+    def ubrat(self, magazin, tovar):
+        """Убрать предложение магазина"""
+        kluch = tovar.lower()
+        predlozheniia = self.predlozheniia.get(kluch)
+        if predlozheniia is None or predlozheniia.pop(magazin.nomer, None) is None:
+            return
+        if not predlozheniia:
+            del self.predlozheniia[kluch]
+            del self.kluchi[bisect_left(self.kluchi, kluch)]
+            for trigramma in trigrammy(kluch):
+                kluchi = self.trigrammy[trigramma]
+                kluchi.discard(kluch)
+                if not kluchi:
+                    del self.trigrammy[trigramma]
+    
+    # --- запросы ---
+    
+    def nazvanie(self, kluch):
+        """Название товара для показа (как его записал любой из магазинов)"""
+        return next(iter(self.predlozheniia[kluch].values()))[0]
+    
+    def po_prefiksu(self, prefiks, limit=20):
+        """Ключи товаров, название которых начинается с prefiks (без учёта регистра)"""
+        prefiks = prefiks.lower()
+        rezultat = []
+        i = bisect_left(self.kluchi, prefiks)
+        while i < len(self.kluchi) and len(rezultat) < limit and self.kluchi[i].startswith(prefiks):
+            rezultat.append(self.kluchi[i])
+            i += 1
+        return rezultat
+    
+    def pohozhie(self, zapros, limit=10, porog=0.3):
+        """Ключи товаров, похожих на запрос по триграммам (с опечатками)
+        
+        Похожий ключ должен разделять с запросом не меньше
+        porog * (число триграмм запроса) триграмм, значит хотя бы одну
+        из (число - нужно + 1) самых редких. Кандидатов берём только
+        из них (не больше PREDEL_KANDIDATOV - дальше поиск приближённый),
+        а совпадения с остальными триграммами лишь проверяем.
+        """
+        zapros = zapros.lower()
+        vse_trigrammy = trigrammy(zapros)
+        trigrammy_zaprosa = sorted((t for t in vse_trigrammy if t in self.trigrammy),
+                                   key=lambda t: len(self.trigrammy[t]))
+        nuzhno = max(1, math.ceil(porog * len(vse_trigrammy)))
+        
+        kandidaty = set()
+        for trigramma in trigrammy_zaprosa[:len(trigrammy_zaprosa) - nuzhno + 1]:
+            kandidaty.update(self.trigrammy[trigramma])
+            if len(kandidaty) > self.PREDEL_KANDIDATOV:
+                break
+        mnozhestva = [self.trigrammy[t] for t in trigrammy_zaprosa]
+        
+        ocenki = []
+        for kluch in kandidaty:
+            obshchih = sum(1 for kluchi in mnozhestva if kluch in kluchi)
+            # Коэффициент Жаккара; у ключа длины n (n + 1) триграмм
+            ocenka = obshchih / (len(vse_trigrammy) + len(kluch) + 1 - obshchih)
+            if ocenka >= porog:
+                ocenki.append((ocenka, kluch))
+        ocenki.sort(reverse=True)
+        return [kluch for _, kluch in ocenki[:limit]]
+    
+    @tochka_zamera('poisk.naiti')
+    def naiti(self, zapros, limit=20):
+        """Поиск для строки поиска: сначала по началу названия, затем похожие"""
+        zapros = zapros.strip()
+        if not zapros:
+            return []
+        rezultat = self.po_prefiksu(zapros, limit)
+        if len(rezultat) < limit:
+            naidennye = set(rezultat)
+            rezultat += [kluch for kluch in self.pohozhie(zapros, limit)
+                         if kluch not in naidennye][:limit - len(rezultat)]
+        return rezultat
+    
+    def gde_prodaetsia(self, tovar):
+        """Список (магазин, цена) для товара, от дешёвого к дорогому"""
+        predlozheniia = self.predlozheniia.get(tovar.lower(), {})
+        return sorted(((self.reestr.po_nomeru[nomer], cena)
+                       for nomer, (_, cena) in predlozheniia.items()),
+                      key=lambda para: para[1])
+    
+    def samyi_deshevyi(self, tovar):
+        """(магазин, цена) с самой низкой ценой на товар или None"""
+        predlozheniia = self.predlozheniia.get(tovar.lower())
+        if not predlozheniia:
+            return None
+        nomer, (_, cena) = min(predlozheniia.items(), key=lambda para: para[1][1])
+        return self.reestr.po_nomeru[nomer], cena
+    
+    def naiti_s_cenami(self, zapros, limit=20):
+        """naiti с лучшим предложением: список (ключ, название, магазин, цена, магазинов)
+        
+        Можно звать из другого потока: весь запрос идёт под замком,
+        и результат уже не ссылается на изменяемые части индекса.
+        """
+        with self.zamok:
+            rezultaty = []
+            for kluch in self.naiti(zapros, limit):
+                predlozheniia = self.predlozheniia[kluch]
+                nomer, (nazvanie, cena) = min(predlozheniia.items(), key=lambda para: para[1][1])
+                # Магазин уже убран из реестра, но событие об этом ещё не дошло
+                magazin = self.reestr.po_nomeru.get(nomer)
+                if magazin is not None:
+                    rezultaty.append((kluch, nazvanie, magazin, cena, len(predlozheniia)))
+            return rezultaty
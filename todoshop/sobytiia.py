@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Оповещение об изменениях объектов модели
+"""
+
+# ============================================
+# ОПОВЕЩЕНИЕ ОБ ИЗМЕНЕНИЯХ
+# ============================================
+
+class Nabliudaemyi:
+    """Базовый класс для объектов, которые сообщают о своих изменениях"""
+    def __init__(self):
+        self.nabludateli = []
+    
+    def podpisat(self, nabludatel):
+        """Подписать функцию nabludatel(sobytie, *dannye) на изменения"""
+        self.nabludateli.append(nabludatel)
+    
+    def otpisat(self, nabludatel):
+        """Отписать наблюдателя"""
+        self.nabludateli.remove(nabludatel)
+    
+    def uvedomit(self, sobytie, *dannye):
+        """Сообщить всем наблюдателям о событии"""
+        for nabludatel in self.nabludateli:
+            nabludatel(sobytie, *dannye)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Сроки задач: разбор строки срока в момент и правило повтора, повторы
+"""
+
+from array import array
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+# ============================================
+# РАЗБОР СРОКОВ
+# ============================================
+
+# Правила повтора: слова срока -> правило
+POVTORY = {
+    'каждый день': 'den',
+    'ежедневно': 'den',
+    'каждую неделю': 'nedelia',
+    'еженедельно': 'nedelia',
+    'каждый месяц': 'mesiac',
+    'ежемесячно': 'mesiac',
+}
+
+
+def konec_dnia(den):
+    """Момент (секунды от 01.01.1970), когда кончается день den по местному времени"""
+    return int(datetime.combine(den + timedelta(days=1), time()).timestamp())
+
+
+def konec_mesiaca(den):
+    """Последний день месяца, в котором лежит den"""
+    sleduiushchii = den.replace(day=28) + timedelta(days=4)
+    return sleduiushchii - timedelta(days=sleduiushchii.day)
+
+
+def razobrat_srok(srok, sozdana):
+    """Срок задачи как (момент, правило повтора)
+    
+    srok - строка из поля срока, sozdana - время создания задачи
+    (секунды от 01.01.1970): «Сегодня» и «На этой неделе» отсчитываются
+    от него. Момент - конец последнего дня срока (секунды от 01.01.1970),
+    у повторяющейся задачи - конец дня её первого повтора. Правило -
+    'den', 'nedelia', 'mesiac' или None. Срок, который не удалось
+    разобрать, и пустой срок дают (None, None).
+    """
+    return razobrat_srok_dnia(srok, date.fromtimestamp(sozdana))
+
+
+@lru_cache(maxsize=1024)
+def razobrat_srok_dnia(srok, den):
+    """razobrat_srok для дня создания den; строк сроков немного, и разбор запоминается"""
+    tekst = ' '.join(srok.casefold().split())
+    pravilo = POVTORY.get(tekst)
+    if pravilo is not None:
+        return konec_dnia(den), pravilo
+    if tekst == 'сегодня':
+        posledni = den
+    elif tekst == 'завтра':
+        posledni = den + timedelta(days=1)
+    elif tekst == 'на этой неделе':
+        posledni = den + timedelta(days=6 - den.weekday())
+    elif tekst == 'на следующей неделе':
+        posledni = den + timedelta(days=13 - den.weekday())
+    elif tekst == 'в этом месяце':
+        posledni = konec_mesiaca(den)
+    else:
+        try:
+            posledni = datetime.strptime(tekst, '%d.%m.%Y').date()
+        except ValueError:
+            return None, None
+    return konec_dnia(posledni), None
+
+
+# ============================================
+# ПОВТОРЫ
+# ============================================
+
+def den_povtora(pravilo, den_nachala, nomer):
+    """День повтора с номером nomer (0 - день создания задачи)"""
+    if pravilo == 'den':
+        return den_nachala + timedelta(days=nomer)
+    if pravilo == 'nedelia':
+        return den_nachala + timedelta(weeks=nomer)
+    # Тот же день месяца, в коротком месяце - последний: считаем от начала, без сдвига
+    mesiac = den_nachala.month - 1 + nomer
+    god, mesiac = den_nachala.year + mesiac // 12, mesiac % 12 + 1
+    return date(god, mesiac, min(den_nachala.day, monthrange(god, mesiac)[1]))
+
+
+def nomer_povtora(pravilo, den_nachala, den):
+    """Номер первого повтора, который приходится на день den или позже"""
+    dnei = (den - den_nachala).days
+    if dnei <= 0:
+        return 0
+    if pravilo == 'den':
+        return dnei
+    if pravilo == 'nedelia':
+        return -(-dnei // 7)
+    nomer = (den.year - den_nachala.year) * 12 + den.month - den_nachala.month
+    return nomer if den_povtora(pravilo, den_nachala, nomer) >= den else nomer + 1
+
+
+def dni_povtorov(pravilo, den_nachala, ot=0):
+    """Бесконечный генератор (номер, день) повторов, начиная с номера ot"""
+    nomer = ot
+    while True:
+        yield nomer, den_povtora(pravilo, den_nachala, nomer)
+        nomer += 1
+
+
+class Povtory:
+    """Выполненные повторы задачи
+    
+    tekushchii - номер повтора, который ждёт выполнения; выполненные
+    хранятся отрезками номеров подряд: otrezki = [начало, конец,
+    начало, конец...] (конец не входит). Повторы отмечаются по порядку,
+    поэтому ежедневная задача, выполняемая без пропусков хоть десять
+    лет, занимает один отрезок - два числа.
+    """
+    __slots__ = ('tekushchii', 'otrezki')
+    
+    def __init__(self, tekushchii=0, otrezki=()):
+        self.tekushchii = tekushchii
+        self.otrezki = array('I', otrezki)
+    
+    @classmethod
+    def iz_sostoianiia(cls, sostoianie):
+        """Восстановить из списка [текущий, начало, конец, ...]"""
+        return cls(sostoianie[0], sostoianie[1:])
+    
+    def sostoianie(self):
+        """Список [текущий, начало, конец, ...] для снимка и журнала"""
+        return [self.tekushchii, *self.otrezki]
+    
+    def otmetit(self, nomer):
+        """Отметить повтор выполненным (номера растут)"""
+        if self.otrezki and self.otrezki[-1] == nomer:
+            self.otrezki[-1] = nomer + 1
+        else:
+            self.otrezki.extend((nomer, nomer + 1))
+    
+    def sniat(self):
+        """Снять отметку с последнего выполненного повтора и вернуть его номер"""
+        nomer = self.otrezki[-1] - 1
+        if self.otrezki[-2] == nomer:
+            del self.otrezki[-2:]
+        else:
+            self.otrezki[-1] = nomer
+        return nomer
+    
+    def vypolnen(self, nomer):
+        """Выполнен ли повтор с номером nomer"""
+        return bisect_right(self.otrezki, nomer) % 2 == 1
+    
+    def __len__(self):
+        """Число выполненных повторов"""
+        otrezki = self.otrezki
+        return sum(otrezki[i + 1] - otrezki[i] for i in range(0, len(otrezki), 2))
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Компактное хранение товаров магазина
+"""
+
+from array import array
+from datetime import date, datetime
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from types import MappingProxyType
+
+# ============================================
+# КОМПАКТНОЕ ХРАНЕНИЕ ТОВАРОВ
+# ============================================
+
+# Даты храним числом дней от 01.01.1970
+EPOHA = date(1970, 1, 1).toordinal()
+
+
+class KolonochnyeTovary(MutableMapping):
+    """Товары магазина в виде колонок-массивов
+    
+    Вместо словаря на каждый товар - общие массивы цен ('d'),
+    количеств ('q') и дат добавления ('i', дни от 01.01.1970),
+    а номер строки по названию - в одном словаре stroki. Снаружи
+    это прежний словарь {название: {'cena', 'kolichestvo',
+    'data_dobavlenia'}}, и обходится он, как dict, в порядке
+    добавления. При удалении на место товара переносится последняя
+    строка, поэтому массивы всегда плотные; порядок обхода от этого
+    не меняется - его задаёт stroki.
+    
+    Сведения о товаре собираются из колонок при каждом чтении, поэтому
+    отдаются только для чтения (MappingProxyType): tovary[t]['cena'] = x
+    падает с TypeError, а не теряется молча. Менять товар - записью
+    tovary[t] = {...} или через методы Magazin.
+    """
+    # Строки дат и номера дней общие для всех магазинов
+    dni_po_date = {}
+    daty_po_dniu = {}
+    
+    def __init__(self):
+        self.stroki = {}            # название -> номер строки
+        self.nazvaniia = []         # номер строки -> название
+        self.ceny = array('d')
+        self.kolichestva = array('q')
+        self.dni = array('i')
+    
+    @classmethod
+    def den(cls, data):
+        """Номер дня для строки даты 'дд.мм.гггг'"""
+        den = cls.dni_po_date.get(data)
+        if den is None:
+            den = datetime.strptime(data, "%d.%m.%Y").toordinal() - EPOHA
+            cls.dni_po_date[data] = den
+            cls.daty_po_dniu[den] = data
+        return den
+    
+    @classmethod
+    def data(cls, den):
+        """Строка даты 'дд.мм.гггг' для номера дня"""
+        data = cls.daty_po_dniu.get(den)
+        if data is None:
+            data = date.fromordinal(den + EPOHA).strftime("%d.%m.%Y")
+            cls.dni_po_date[data] = den
+            cls.daty_po_dniu[den] = data
+        return data
+    
+    def stroka(self, tovar):
+        """Номер строки товара (KeyError, если его нет)"""
+        return self.stroki[tovar]
+    
+    # --- интерфейс словаря ---
+    
+    def __getitem__(self, tovar):
+        i = self.stroki[tovar]
+        return MappingProxyType({'cena': self.ceny[i],
+                                 'kolichestvo': self.kolichestva[i],
+                                 'data_dobavlenia': self.data(self.dni[i])})
+    
+    def __setitem__(self, tovar, info):
+        self.zapisat(tovar, info['cena'], info['kolichestvo'], self.den(info['data_dobavlenia']))
+    
+    def zapisat(self, tovar, cena, kolichestvo, den):
+        """Записать строку товара без промежуточного словаря"""
+        stroka = self.stroki.get(tovar)
+        if stroka is not None:
+            self.ceny[stroka] = cena
+            self.kolichestva[stroka] = kolichestvo
+            self.dni[stroka] = den
+            return
+        
+        self.stroki[tovar] = len(self.nazvaniia)
+        self.nazvaniia.append(tovar)
+        self.ceny.append(cena)
+        self.kolichestva.append(kolichestvo)
+        self.dni.append(den)
+    
+    def __delitem__(self, tovar):
+        i = self.stroki.pop(tovar)
+        posledniaia = len(self.nazvaniia) - 1
+        if i != posledniaia:
+            # Переносим последнюю строку на освободившееся место
+            perenosimyi = self.nazvaniia[posledniaia]
+            self.stroki[perenosimyi] = i
+            self.nazvaniia[i] = perenosimyi
+            self.ceny[i] = self.ceny[posledniaia]
+            self.kolichestva[i] = self.kolichestva[posledniaia]
+            self.dni[i] = self.dni[posledniaia]
+        self.nazvaniia.pop()
+        self.ceny.pop()
+        self.kolichestva.pop()
+        self.dni.pop()
+    
+    def __contains__(self, tovar):
+        return tovar in self.stroki
+    
+    def __len__(self):
+        return len(self.nazvaniia)
+    
+    def __iter__(self):
+        return iter(self.stroki)
+    
+    def items(self):
+        """Все товары (название, сведения) в порядке добавления"""
+        return StrokiTovarov(self)
+    
+    def values(self):
+        """Сведения обо всех товарах"""
+        return SvedeniiaTovarov(self)
+
+
+class StrokiTovarov(ItemsView):
+    """items() колонок: как у dict, но обход идёт прямо по массивам"""
+    __slots__ = ()
+    
+    def __iter__(self):
+        tovary = self._mapping
+        data, ceny, kolichestva, dni = tovary.data, tovary.ceny, tovary.kolichestva, tovary.dni
+        for tovar, i in tovary.stroki.items():
+            yield tovar, MappingProxyType({'cena': ceny[i], 'kolichestvo': kolichestva[i],
+                                           'data_dobavlenia': data(dni[i])})
+
+
+class SvedeniiaTovarov(ValuesView):
+    """values() колонок: сведения в порядке добавления"""
+    __slots__ = ()
+    
+    def __iter__(self):
+        for _, info in StrokiTovarov(self._mapping):
+            yield info
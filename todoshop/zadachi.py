@@ -0,0 +1,556 @@
+# -*- coding: utf-8 -*-
+"""
+Задачи и список задач
+"""
+
+from datetime import date, datetime, timedelta
+from enum import Enum
+from bisect import bisect_left, insort
+from heapq import heapify, heappush
+from itertools import chain
+from operator import attrgetter
+import time
+
+from .sobytiia import Nabliudaemyi
+from .arhiv import ArhivZadach
+from .sroki import Povtory, den_povtora, dni_povtorov, konec_dnia, nomer_povtora, razobrat_srok
+from .metriki import tochka_zamera
+
+# ============================================
+# КЛАСС ДЛЯ ЗАДАЧ
+# ============================================
+
+class StatusZadachi(Enum):
+    """Статус задачи"""
+    NE_VYPOLNENO = "не выполнено"
+    VYPOLNENO = "выполнено"
+    
+    def __str__(self):
+        return self.value
+
+
+def formatirovat_vremia(vremia):
+    """Время (секунды от 01.01.1970) в виде 'дд.мм.гггг чч:мм'"""
+    return datetime.fromtimestamp(vremia).strftime("%d.%m.%Y %H:%M")
+
+
+# Привязка монотонных часов к календарному времени на этот сеанс
+TAKT_NACHALA = time.monotonic_ns()
+VREMIA_NACHALA = time.time_ns()
+
+
+def takt_iz_vremeni(vremia):
+    """Показание монотонных часов (нс) для календарного времени в секундах"""
+    return TAKT_NACHALA + int(vremia * 1_000_000_000) - VREMIA_NACHALA
+
+
+def vremia_iz_takta(takt):
+    """Календарное время в секундах для показания монотонных часов"""
+    return (VREMIA_NACHALA + takt - TAKT_NACHALA) // 1_000_000_000
+
+
+class Zadacha:
+    """Класс для управления задачами
+    
+    Моменты создания и выполнения хранятся одним целым числом -
+    показанием монотонных часов в наносекундах; календарное время
+    получается через привязку часов к началу сеанса. Строки дат
+    строятся только при показе.
+    
+    Повторяющаяся задача («Каждый день») - одна задача на все повторы:
+    правило берётся из срока, дни повторов считаются от дня создания,
+    а отметки хранит povtory (None, пока ни один повтор не отмечен).
+    Задача представляет ближайший невыполненный повтор; остальные
+    перечисляются генератором povtory_v_okne только по запросу.
+    """
+    __slots__ = ('nomer', 'opisanie', 'srok', 'status', 'takt_sozdania', 'takt_vypolnenia',
+                 'povtory')
+    
+    def __init__(self, opisanie, srok):
+        self.nomer = None
+        self.opisanie = opisanie
+        self.srok = srok
+        self.status = StatusZadachi.NE_VYPOLNENO
+        self.takt_sozdania = time.monotonic_ns()
+        self.takt_vypolnenia = None
+        self.povtory = None
+    
+    @property
+    def vremia_sozdania(self):
+        """Время создания в секундах от 01.01.1970"""
+        return vremia_iz_takta(self.takt_sozdania)
+    
+    @vremia_sozdania.setter
+    def vremia_sozdania(self, vremia):
+        self.takt_sozdania = takt_iz_vremeni(vremia)
+    
+    @property
+    def vremia_vypolnenia(self):
+        """Время выполнения в секундах от 01.01.1970 (None, если не выполнена)"""
+        if self.takt_vypolnenia is None:
+            return None
+        return vremia_iz_takta(self.takt_vypolnenia)
+    
+    @property
+    def data_sozdania(self):
+        """Дата создания в виде строки"""
+        return formatirovat_vremia(self.vremia_sozdania)
+    
+    @property
+    def data_vypolnenia(self):
+        """Дата выполнения в виде строки (None, если не выполнена)"""
+        if self.takt_vypolnenia is None:
+            return None
+        return formatirovat_vremia(self.vremia_vypolnenia)
+    
+    @property
+    def srok_do(self):
+        """Момент окончания срока (ближайшего невыполненного повтора),
+        секунды от 01.01.1970 (None, если срок не задан)"""
+        moment, pravilo = razobrat_srok(self.srok, self.vremia_sozdania)
+        if pravilo is None or self.povtory is None:
+            return moment
+        return konec_dnia(den_povtora(pravilo, self.den_sozdania, self.povtory.tekushchii))
+    
+    @property
+    def povtor(self):
+        """Правило повтора: 'den', 'nedelia', 'mesiac' или None"""
+        return razobrat_srok(self.srok, self.vremia_sozdania)[1]
+    
+    @property
+    def den_sozdania(self):
+        """День создания - от него считаются повторы"""
+        return date.fromtimestamp(self.vremia_sozdania)
+    
+    def povtory_v_okne(self, nachalo, konec):
+        """Повторы с днём от nachalo до konec (не включая): генератор (номер, день, выполнен)
+        
+        Номер первого повтора в окне вычисляется сразу, без перебора
+        предыдущих. У неповторяющейся задачи повторов нет.
+        """
+        pravilo = self.povtor
+        if pravilo is None:
+            return
+        den_nachala = self.den_sozdania
+        povtory = self.povtory
+        for nomer, den in dni_povtorov(pravilo, den_nachala, nomer_povtora(pravilo, den_nachala, nachalo)):
+            if den >= konec:
+                return
+            yield nomer, den, povtory is not None and povtory.vypolnen(nomer)
+    
+    def otmetit_povtor(self, vremia=None):
+        """Отметить выполненным повтор на день vremia и перейти к следующему
+        
+        Отмечается сегодняшний повтор (у еженедельной и ежемесячной задачи -
+        ближайший, срок которого ещё не прошёл), а не давний ожидающий:
+        пропущенные повторы остаются невыполненными. Если ожидающий повтор
+        ещё впереди, отмечается он - задачу можно выполнить заранее.
+        """
+        if self.povtory is None:
+            self.povtory = Povtory()
+        segodnia = date.fromtimestamp(time.time() if vremia is None else vremia)
+        nomer = max(self.povtory.tekushchii, nomer_povtora(self.povtor, self.den_sozdania, segodnia))
+        self.povtory.otmetit(nomer)
+        self.povtory.tekushchii = nomer + 1
+    
+    def sniat_otmetku_povtora(self):
+        """Снять отметку с последнего выполненного повтора - он снова ожидает
+        
+        Пропущенные до него повторы ожидающими не становятся; точное
+        прежнее состояние возвращает ustanovit_povtory списка.
+        """
+        if self.povtory is None or not self.povtory.otrezki:
+            raise ValueError(f"У задачи нет выполненных повторов: {self.opisanie[:20]}")
+        self.povtory.tekushchii = self.povtory.sniat()
+    
+    @classmethod
+    def iz_snimka(cls, nomer, opisanie, srok, sozdana, vypolnena, povtory=None):
+        """Восстановить сохранённую задачу (времена - секунды от 01.01.1970)
+        
+        Без __init__ и свойств: при загрузке больших списков это
+        главная статья расходов.
+        """
+        zadacha = cls.__new__(cls)
+        zadacha.nomer = nomer
+        zadacha.opisanie = opisanie
+        zadacha.srok = srok
+        zadacha.takt_sozdania = takt_iz_vremeni(sozdana)
+        if vypolnena is None:
+            zadacha.status = StatusZadachi.NE_VYPOLNENO
+            zadacha.takt_vypolnenia = None
+        else:
+            zadacha.status = StatusZadachi.VYPOLNENO
+            zadacha.takt_vypolnenia = takt_iz_vremeni(vypolnena)
+        zadacha.povtory = None if povtory is None else Povtory.iz_sostoianiia(povtory)
+        return zadacha
+    
+    def otmetit_gotovoi(self, vremia=None):
+        """Отметить задачу как выполненную (vremia - при восстановлении)"""
+        self.status = StatusZadachi.VYPOLNENO
+        self.takt_vypolnenia = time.monotonic_ns() if vremia is None else takt_iz_vremeni(vremia)
+    
+    def info_kratko(self):
+        """Краткая информация о задаче"""
+        status_icon = "✓" if self.status is StatusZadachi.VYPOLNENO else "◯"
+        return f"{status_icon} {self.opisanie[:30]}..."
+    
+    def __str__(self):
+        return f"[{self.status}] {self.opisanie} | Срок: {self.srok}"
+
+
+class SpisokZadach(Nabliudaemyi):
+    """Список задач с оповещением о добавлении, изменении и удалении
+    
+    События: 'dobavlena', 'izmenena', 'udalena', 'povtor' (отмечен или
+    снят повтор повторяющейся задачи; данные - сама задача) и 'zagruzheny'
+    после массовой загрузки (данные - None).
+    
+    Рабочий список zadachi содержит только невыполненные задачи,
+    упорядоченные по возрастающему номеру (поиск - бинарный).
+    Выполненная задача переезжает в упакованный архив (ArhivZadach),
+    поэтому работа со списком не замедляется, сколько бы задач ни
+    накопилось за годы. len() и обход - по всем задачам, с архивом.
+    
+    Число невыполненных задач по срокам (otkrytye_po_sroku: срок -> число)
+    ведётся при каждом изменении, так что статистика не требует обхода
+    списка. Задачи меняются только через методы списка.
+    
+    Индекс сроков (номер -> момент окончания срока) и куча (момент, номер)
+    строятся при первом запросе о сроках и дальше ведутся вместе
+    со счётчиками. Выполненные и удалённые задачи уходят только из
+    словаря, их записи в куче отсеиваются при обходе; когда устаревших
+    записей становится больше живых, куча собирается заново.
+    Вместе с индексом ведётся число задач на каждый момент срока
+    (chislo_po_momentu) и число просроченных до начала текущего дня:
+    сроки кончаются в конце дня, поэтому для статистики
+    (chislo_prosrochennyh, chislo_na_segodnia) списки задач не нужны.
+    """
+    def __init__(self):
+        super().__init__()
+        self.zadachi = []
+        self.arhiv = ArhivZadach()
+        self.sleduiushchii_nomer = 1
+        self.otkrytye_po_sroku = {}
+        self.sroki_zadach = None        # номер -> момент срока (строится по запросу)
+        self.ochered_srokov = []        # куча (момент, номер) с устаревшими записями
+        self.ustarelo = 0
+        self.chislo_po_momentu = {}     # момент срока -> число задач
+        self.granica_prosrochki = None  # конец вчерашнего дня, на который считано prosrocheno
+        self.prosrocheno = 0
+    
+    # --- счётчики ---
+    
+    def uchest(self, zadacha, znak):
+        """Прибавить (znak=1) или вычесть (znak=-1) невыполненную задачу из счётчиков"""
+        srok = zadacha.srok
+        ostalos = self.otkrytye_po_sroku.get(srok, 0) + znak
+        if ostalos:
+            self.otkrytye_po_sroku[srok] = ostalos
+        else:
+            del self.otkrytye_po_sroku[srok]
+        
+        if self.sroki_zadach is None:
+            return
+        if znak > 0:
+            moment = zadacha.srok_do
+            if moment is not None:
+                self.sroki_zadach[zadacha.nomer] = moment
+                heappush(self.ochered_srokov, (moment, zadacha.nomer))
+                self.uchest_srok(moment, 1)
+            return
+        moment = self.sroki_zadach.pop(zadacha.nomer, None)
+        if moment is not None:
+            self.uchest_srok(moment, -1)
+            self.ustarelo += 1
+            if self.ustarelo > len(self.sroki_zadach):
+                self.sobrat_ochered_srokov()
+    
+    def uchest_srok(self, moment, znak):
+        """Прибавить (znak=1) или вычесть (znak=-1) задачу со сроком moment"""
+        ostalos = self.chislo_po_momentu.get(moment, 0) + znak
+        if ostalos:
+            self.chislo_po_momentu[moment] = ostalos
+        else:
+            del self.chislo_po_momentu[moment]
+        if self.granica_prosrochki is not None and moment <= self.granica_prosrochki:
+            self.prosrocheno += znak
+    
+    def pereschitat_schetchiki(self):
+        """Посчитать счётчики заново по рабочему списку (после правки в обход методов)"""
+        self.otkrytye_po_sroku = {}
+        self.sroki_zadach = None
+        for zadacha in self.zadachi:
+            self.uchest(zadacha, 1)
+    
+    @property
+    def vypolneno(self):
+        """Число выполненных задач"""
+        return len(self.arhiv)
+    
+    @property
+    def otkryto(self):
+        """Число невыполненных задач"""
+        return len(self.zadachi)
+    
+    def po_srokam(self, n=None):
+        """n самых частых сроков невыполненных задач [(срок, число)]"""
+        sroki = sorted(self.otkrytye_po_sroku.items(), key=lambda para: para[1], reverse=True)
+        return sroki if n is None else sroki[:n]
+    
+    # --- сроки ---
+    
+    def indeks_srokov(self):
+        """Номер -> момент окончания срока для невыполненных задач со сроком"""
+        if self.sroki_zadach is None:
+            self.sroki_zadach = {}
+            self.chislo_po_momentu = {}
+            self.granica_prosrochki = None
+            for zadacha in self.zadachi:
+                moment = zadacha.srok_do
+                if moment is not None:
+                    self.sroki_zadach[zadacha.nomer] = moment
+                    self.chislo_po_momentu[moment] = self.chislo_po_momentu.get(moment, 0) + 1
+            self.sobrat_ochered_srokov()
+        return self.sroki_zadach
+    
+    def sobrat_ochered_srokov(self):
+        """Собрать кучу сроков заново по индексу, без устаревших записей"""
+        self.ochered_srokov = [(moment, nomer) for nomer, moment in self.sroki_zadach.items()]
+        heapify(self.ochered_srokov)
+        self.ustarelo = 0
+    
+    def do_sroka(self, granica):
+        """Невыполненные задачи, срок которых кончается не позже granica, по сроку
+        
+        Обход кучи не спускается ниже записей позже granica, поэтому
+        стоит O(k log k) для k найденных, а не просмотра всего списка.
+        """
+        sroki = self.indeks_srokov()
+        ochered = self.ochered_srokov
+        naideno = []
+        stek = [0] if ochered else []
+        while stek:
+            i = stek.pop()
+            moment, nomer = ochered[i]
+            if moment > granica:
+                continue
+            if sroki.get(nomer) == moment:
+                naideno.append(ochered[i])
+            for j in (2 * i + 1, 2 * i + 2):
+                if j < len(ochered):
+                    stek.append(j)
+        # Удалённая и возвращённая задача может лежать в куче дважды
+        naideno = sorted(set(naideno))
+        return [self.po_nomeru(nomer) for _, nomer in naideno]
+    
+    def prosrocheny(self, seichas=None):
+        """Невыполненные задачи с истёкшим сроком, от самых давних"""
+        return self.do_sroka(time.time() if seichas is None else seichas)
+    
+    def na_segodnia(self, seichas=None):
+        """Невыполненные задачи, срок которых истекает в конце сегодняшнего дня"""
+        seichas = time.time() if seichas is None else seichas
+        do_konca_dnia = self.do_sroka(konec_dnia(date.fromtimestamp(seichas)))
+        return [zadacha for zadacha in do_konca_dnia if self.sroki_zadach[zadacha.nomer] > seichas]
+    
+    def chislo_prosrochennyh(self, seichas=None):
+        """Сколько невыполненных задач просрочено (len(prosrocheny()) без списка)
+        
+        Срок кончается в конце дня, так что просрочены задачи со сроком
+        до начала сегодняшнего дня. Граница сдвигается раз в день -
+        тогда число пересчитывается по разным моментам сроков.
+        """
+        self.indeks_srokov()
+        seichas = time.time() if seichas is None else seichas
+        granica = konec_dnia(date.fromtimestamp(seichas) - timedelta(days=1))
+        if granica != self.granica_prosrochki:
+            self.granica_prosrochki = granica
+            self.prosrocheno = sum(chislo for moment, chislo in self.chislo_po_momentu.items()
+                                   if moment <= granica)
+        return self.prosrocheno
+    
+    def chislo_na_segodnia(self, seichas=None):
+        """Сколько невыполненных задач со сроком на сегодня (len(na_segodnia()) без списка)"""
+        self.indeks_srokov()
+        seichas = time.time() if seichas is None else seichas
+        return self.chislo_po_momentu.get(konec_dnia(date.fromtimestamp(seichas)), 0)
+    
+    # --- изменения ---
+    
+    def v_arhiv(self, zadacha):
+        """Упаковать выполненную задачу в архив"""
+        self.arhiv.dobavit(zadacha.nomer, zadacha.opisanie, zadacha.srok,
+                           zadacha.vremia_sozdania, zadacha.vremia_vypolnenia)
+    
+    @tochka_zamera('zadachi.dobavit')
+    def dobavit(self, zadacha):
+        """Добавить задачу в конец списка"""
+        zadacha.nomer = self.sleduiushchii_nomer
+        self.sleduiushchii_nomer += 1
+        if zadacha.status is StatusZadachi.VYPOLNENO:
+            self.v_arhiv(zadacha)
+        else:
+            self.zadachi.append(zadacha)
+            self.uchest(zadacha, 1)
+        self.uvedomit('dobavlena', zadacha)
+        return zadacha
+    
+    @tochka_zamera('zadachi.zagruzit')
+    def zagruzit(self, zadachi, soobshchit=True):
+        """Добавить много задач сразу с одним событием 'zagruzheny'
+        
+        zadachi читаются потоком. soobshchit=False - без события: его
+        пошлёт вызывающий, когда придёт последний из нескольких пакетов.
+        Возвращает число добавленных задач.
+        """
+        chislo = 0
+        for zadacha in zadachi:
+            chislo += 1
+            zadacha.nomer = self.sleduiushchii_nomer
+            self.sleduiushchii_nomer += 1
+            if zadacha.status is StatusZadachi.VYPOLNENO:
+                self.v_arhiv(zadacha)
+            else:
+                self.zadachi.append(zadacha)
+                self.uchest(zadacha, 1)
+        if soobshchit:
+            self.uvedomit('zagruzheny', None)
+        return chislo
+    
+    def dopisat_sohranennye(self, stroki):
+        """Дописать задачи из снимка без событий
+        
+        stroki - [номер, описание, срок, создана, выполнена, (повторы)];
+        невыполненные идут по возрастанию номера. Выполненные сразу ложатся в архив,
+        объекты Zadacha для них не создаются.
+        """
+        iz_snimka = Zadacha.iz_snimka
+        dobavit_v_arhiv = self.arhiv.dobavit
+        for stroka in stroki:
+            if stroka[4] is None:
+                zadacha = iz_snimka(*stroka)
+                self.zadachi.append(zadacha)
+                self.uchest(zadacha, 1)
+            else:
+                dobavit_v_arhiv(*stroka)
+    
+    def vosstanovit(self, zadacha, nomer):
+        """Вернуть в список сохранённую или удалённую задачу с её прежним номером"""
+        zadacha.nomer = nomer
+        self.sleduiushchii_nomer = max(self.sleduiushchii_nomer, nomer + 1)
+        if zadacha.status is StatusZadachi.VYPOLNENO:
+            self.v_arhiv(zadacha)
+        else:
+            # При загрузке номера растут, и вставка идёт в конец; удалённая
+            # задача возвращается на своё место по номеру
+            insort(self.zadachi, zadacha, key=attrgetter('nomer'))
+            self.uchest(zadacha, 1)
+        self.uvedomit('dobavlena', zadacha)
+        return zadacha
+    
+    @tochka_zamera('zadachi.otmetit')
+    def otmetit(self, zadacha, vremia=None):
+        """Отметить задачу как выполненную и убрать в архив (vremia - при восстановлении)
+        
+        У повторяющейся задачи отмечается ожидающий повтор, а задача
+        остаётся в списке со сроком следующего.
+        """
+        if zadacha.status is StatusZadachi.VYPOLNENO:
+            return
+        if zadacha.povtor is not None:
+            self.izmenit_povtory(zadacha, zadacha.otmetit_povtor, vremia)
+            return
+        del self.zadachi[self.pozicia(zadacha)]
+        self.uchest(zadacha, -1)
+        zadacha.otmetit_gotovoi(vremia)
+        self.v_arhiv(zadacha)
+        self.uvedomit('izmenena', zadacha)
+    
+    def sniat_otmetku(self, zadacha):
+        """Вернуть выполненную задачу из архива в невыполненные
+        
+        У повторяющейся задачи снимается отметка последнего выполненного повтора.
+        """
+        if zadacha.status is not StatusZadachi.VYPOLNENO and zadacha.povtor is not None:
+            self.izmenit_povtory(zadacha, zadacha.sniat_otmetku_povtora)
+            return
+        if self.arhiv.izvlech(zadacha.nomer) is None:
+            raise ValueError(f"Задача не найдена в архиве: {zadacha.opisanie[:20]}")
+        zadacha.status = StatusZadachi.NE_VYPOLNENO
+        zadacha.takt_vypolnenia = None
+        insort(self.zadachi, zadacha, key=attrgetter('nomer'))
+        self.uchest(zadacha, 1)
+        self.uvedomit('izmenena', zadacha)
+    
+    def izmenit_povtory(self, zadacha, izmenit, *argumenty):
+        """Изменить отметки повторов задачи, переставив её срок в индексе"""
+        self.uchest(zadacha, -1)
+        izmenit(*argumenty)
+        self.uchest(zadacha, 1)
+        self.uvedomit('povtor', zadacha)
+    
+    def ustanovit_povtory(self, zadacha, sostoianie):
+        """Задать отметки повторов из сохранённого состояния [текущий, отрезки...]"""
+        def ustanovit():
+            zadacha.povtory = Povtory.iz_sostoianiia(sostoianie)
+        self.izmenit_povtory(zadacha, ustanovit)
+    
+    @tochka_zamera('zadachi.udalit')
+    def udalit(self, zadacha):
+        """Удалить задачу из списка или из архива"""
+        if zadacha.status is StatusZadachi.VYPOLNENO:
+            if self.arhiv.izvlech(zadacha.nomer) is None:
+                raise ValueError(f"Задача не найдена в архиве: {zadacha.opisanie[:20]}")
+        else:
+            del self.zadachi[self.pozicia(zadacha)]
+            self.uchest(zadacha, -1)
+        self.uvedomit('udalena', zadacha)
+    
+    # --- поиск ---
+    
+    def pozicia(self, zadacha):
+        """Позиция невыполненной задачи в рабочем списке (ValueError, если её нет)"""
+        i = bisect_left(self.zadachi, zadacha.nomer, key=attrgetter('nomer'))
+        if i < len(self.zadachi) and self.zadachi[i] is zadacha:
+            return i
+        raise ValueError(f"Задача не найдена: {zadacha.opisanie[:20]}")
+    
+    def po_nomeru(self, nomer):
+        """Найти задачу по номеру (None, если её нет)
+        
+        Выполненная задача собирается из архива - каждый раз новым объектом.
+        """
+        i = bisect_left(self.zadachi, nomer, key=attrgetter('nomer'))
+        if i < len(self.zadachi) and self.zadachi[i].nomer == nomer:
+            return self.zadachi[i]
+        i = self.arhiv.naiti(nomer)
+        return Zadacha.iz_snimka(*self.arhiv.stroka(i)) if i >= 0 else None
+    
+    def stranica_arhiva(self, nachalo, skolko):
+        """skolko выполненных задач от недавних с позиции nachalo: (задачи, откуда продолжить)"""
+        stroki, dalshe = self.arhiv.stranica(nachalo, skolko)
+        return [Zadacha.iz_snimka(*stroka) for stroka in stroki], dalshe
+    
+    def iskat_v_arhive(self, tekst, nachalo=0, skolko=50):
+        """Выполненные задачи с tekst в описании или сроке: (задачи, откуда продолжить)"""
+        naideno, dalshe = self.arhiv.poisk(tekst, nachalo, skolko)
+        return [Zadacha.iz_snimka(*stroka) for stroka in naideno], dalshe
+    
+    def stroki_snimka(self):
+        """Все задачи кортежами снимка: невыполненные по номеру, затем архив
+        
+        У повторяющейся задачи с отметками шестой элемент - состояние повторов.
+        """
+        for z in self.zadachi:
+            if z.povtory is None:
+                yield z.nomer, z.opisanie, z.srok, z.vremia_sozdania, None
+            else:
+                yield z.nomer, z.opisanie, z.srok, z.vremia_sozdania, None, z.povtory.sostoianie()
+        yield from self.arhiv
+    
+    def __len__(self):
+        return len(self.zadachi) + len(self.arhiv)
+    
+    def __iter__(self):
+        """Все задачи: невыполненные по номеру, затем выполненные (собранные из архива) в порядке выполнения"""
+        return chain(self.zadachi, (Zadacha.iz_snimka(*stroka) for stroka in self.arhiv))